@@ -0,0 +1,137 @@
+"""
+Compare the widget slide editor and the QGraphicsScene canvas by object count.
+
+For each object count, a slide is filled with small SVG fragments in both
+editors. The benchmark then drags one object across the slide (move plus
+the repaint it triggers) and hit-tests random points, as a click does. It
+reports the median frame time and the median hit-test time.
+
+Usage:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_slide_canvas.py
+        [--counts 10,100,500] [--frames 60]
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+# Ajouter le chemin du répertoire parent au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QPoint, QPointF, QRect
+
+from src.gui.slide_editor import SlideEditor
+from src.gui.slide_canvas import SlideCanvas
+
+SLIDE_WIDTH, SLIDE_HEIGHT = 1280, 720
+FRAGMENT_SIZE = 60
+
+
+def write_fragments(directory, count, seed=0):
+    """Write count small SVG files with a few random curves each, like extracted glyphs."""
+    rng = random.Random(seed)
+    paths = []
+    for index in range(count):
+        curves = " ".join(
+            f"M{rng.uniform(0, 60):.1f},{rng.uniform(0, 60):.1f} "
+            f"C{rng.uniform(0, 60):.1f},{rng.uniform(0, 60):.1f} "
+            f"{rng.uniform(0, 60):.1f},{rng.uniform(0, 60):.1f} "
+            f"{rng.uniform(0, 60):.1f},{rng.uniform(0, 60):.1f}"
+            for _ in range(8))
+        path = os.path.join(directory, f"fragment_{index:04d}.svg")
+        with open(path, "w") as file:
+            file.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="60" height="60" viewBox="0 0 60 60">'
+                       f'<path d="{curves}" fill="none" stroke="black" stroke-width="1.5"/></svg>')
+        paths.append(path)
+    return paths
+
+
+def slide_content(paths, seed=1):
+    rng = random.Random(seed)
+    return [{'path': path,
+             'geometry': QRect(rng.randrange(SLIDE_WIDTH - FRAGMENT_SIZE), rng.randrange(SLIDE_HEIGHT - FRAGMENT_SIZE),
+                               FRAGMENT_SIZE, FRAGMENT_SIZE)}
+            for path in paths]
+
+
+def drag_frames(app, move, frames):
+    """Median seconds of one drag frame: move the object and let Qt repaint."""
+    timings = []
+    for frame in range(frames):
+        start = time.perf_counter()
+        move(frame)
+        app.processEvents()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def hit_tests(hit, points):
+    timings = []
+    for point in points:
+        start = time.perf_counter()
+        hit(point)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def bench_widgets(app, content, frames, points):
+    editor = SlideEditor(None)
+    editor.resize(SLIDE_WIDTH + 10, SLIDE_HEIGHT + 60)
+    editor.show()
+    editor.load_slide_content(content)
+    app.processEvents()
+    widget = editor.svg_widgets[0]
+    frame_time = drag_frames(app, lambda frame: widget.move(10 + frame * 5 % 1000, 300), frames)
+    hit_time = hit_tests(editor.slide_area.childAt, points)
+    editor.load_slide_content([])
+    editor.close()
+    return frame_time, hit_time
+
+
+def bench_canvas(app, content, frames, points):
+    canvas = SlideCanvas()
+    canvas.resize(SLIDE_WIDTH + 10, SLIDE_HEIGHT + 10)
+    canvas.show()
+    app.processEvents()
+    canvas.resetTransform()  # Même échelle que l'éditeur à widgets
+    canvas.load_slide_content(content)
+    app.processEvents()
+    item = canvas.svg_items[0]
+    frame_time = drag_frames(app, lambda frame: item.setPos(QPointF(10 + frame * 5 % 1000, 300)), frames)
+    hit_time = hit_tests(canvas.itemAt, [canvas.mapFromScene(QPointF(point)) for point in points])
+    canvas.load_slide_content([])
+    canvas.close()
+    return frame_time, hit_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the slide editors by object count")
+    parser.add_argument("--counts", default="10,50,100,250,500", help="Object counts, comma separated")
+    parser.add_argument("--frames", type=int, default=60, help="Drag frames per measure")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    counts = [int(count) for count in args.counts.split(",")]
+    rng = random.Random(2)
+    points = [QPoint(rng.randrange(SLIDE_WIDTH), rng.randrange(SLIDE_HEIGHT)) for _ in range(200)]
+    directory = tempfile.mkdtemp(prefix="slide_canvas_")
+    try:
+        paths = write_fragments(directory, max(counts))
+        print(f"{'objects':>7} {'widgets frame ms':>17} {'canvas frame ms':>16} "
+              f"{'widgets hit us':>15} {'canvas hit us':>14}")
+        for count in counts:
+            content = slide_content(paths[:count])
+            widget_frame, widget_hit = bench_widgets(app, content, args.frames, points)
+            canvas_frame, canvas_hit = bench_canvas(app, content, args.frames, points)
+            print(f"{count:>7} {widget_frame * 1000:>17.2f} {canvas_frame * 1000:>16.2f} "
+                  f"{widget_hit * 1e6:>15.1f} {canvas_hit * 1e6:>14.1f}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Compare the PDF to SVG backends page by page.
+
+For every page of the given PDFs, each backend converts the page several
+times (without cache) and the median latency and the output size are
+reported, followed by a summary per backend.
+
+Usage:
+    python benchmarks/bench_svg_backends.py deck.pdf [other.pdf ...]
+        [--pages 1-10] [--repeat 3] [--simplified] [--inkscape PATH]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+# Ajouter le chemin du répertoire parent au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.inkscape_interface import InkscapeInterface
+from src.core.pdf_document import PdfDocument
+from src.core.svg_backends import PyMuPdfBackend
+
+
+def parse_pages(text, page_count):
+    """Turn "1-3,7" into [1, 2, 3, 7], keeping the pages of the document."""
+    if not text:
+        return list(range(1, page_count + 1))
+    pages = []
+    for part in text.split(","):
+        first, _, last = part.partition("-")
+        pages.extend(range(int(first), int(last or first) + 1))
+    return [page for page in pages if 1 <= page <= page_count]
+
+
+def measure(interface, backend, pdf_path, page_number, output_path, simplified, repeat):
+    """Return (median seconds, output bytes) or None if the conversion failed."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if simplified:
+            ok = interface.pdf_page_to_simplified_svg(
+                pdf_path, page_number, output_svg_path=output_path, backend=backend)
+        else:
+            ok = interface.pdf_to_svg(pdf_path, page_number, output_path, backend=backend)
+        timings.append(time.perf_counter() - start)
+        if not ok:
+            return None
+    return statistics.median(timings), os.path.getsize(output_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the PDF to SVG backends")
+    parser.add_argument("pdfs", nargs="+", help="PDF files to convert")
+    parser.add_argument("--pages", help="Pages to convert, e.g. 1-5,9 (all by default)")
+    parser.add_argument("--repeat", type=int, default=3, help="Conversions per page and backend")
+    parser.add_argument("--simplified", action="store_true",
+                        help="Benchmark pdf_page_to_simplified_svg instead of pdf_to_svg")
+    parser.add_argument("--inkscape", default="inkscape", help="Path to the Inkscape executable")
+    parser.add_argument("--shell", action="store_true", help="Run Inkscape in shell mode")
+    args = parser.parse_args()
+
+    interface = InkscapeInterface(args.inkscape, use_shell=args.shell)
+    backends = {
+        "pymupdf": PyMuPdfBackend(text_as_path=True),
+        "pymupdf-text": PyMuPdfBackend(text_as_path=False),
+    }
+    if shutil.which(args.inkscape):
+        backends["inkscape"] = "inkscape"
+    else:
+        print(f"{args.inkscape} not found, skipping the Inkscape backend")
+
+    totals = {name: [] for name in backends}
+    output_dir = tempfile.mkdtemp(prefix="svg_backends_")
+    try:
+        print(f"{'file':<24} {'page':>4} {'backend':<14} {'ms':>9} {'bytes':>10}")
+        for pdf_path in args.pdfs:
+            document = PdfDocument.acquire(pdf_path)
+            page_count = len(document)
+            document.release()
+            for page_number in parse_pages(args.pages, page_count):
+                for name, backend in backends.items():
+                    output_path = os.path.join(output_dir, f"{name}_{page_number}.svg")
+                    result = measure(interface, backend, pdf_path, page_number, output_path,
+                                     args.simplified, args.repeat)
+                    if result is None:
+                        print(f"{os.path.basename(pdf_path):<24} {page_number:>4} {name:<14} failed")
+                        continue
+                    seconds, size = result
+                    totals[name].append(result)
+                    print(f"{os.path.basename(pdf_path):<24} {page_number:>4} {name:<14} "
+                          f"{seconds * 1000:>9.1f} {size:>10}")
+    finally:
+        interface.close()
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    print()
+    print(f"{'backend':<14} {'pages':>5} {'median ms':>10} {'total s':>8} {'mean bytes':>11}")
+    for name, results in totals.items():
+        if not results:
+            continue
+        seconds = [result[0] for result in results]
+        sizes = [result[1] for result in results]
+        print(f"{name:<14} {len(results):>5} {statistics.median(seconds) * 1000:>10.1f} "
+              f"{sum(seconds):>8.2f} {statistics.mean(sizes):>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
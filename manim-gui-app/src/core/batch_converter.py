@@ -0,0 +1,48 @@
+import atexit
+import os
+from src.core.inkscape_interface import InkscapeInterface
+from src.core.svg_cache import SvgCache
+
+# InkscapeInterface of the current worker process, created by init_worker
+_worker_interface = None
+
+
+def init_worker(inkscape_path, use_shell, use_cache):
+    """Create the InkscapeInterface reused by every page a worker process converts."""
+    global _worker_interface
+    _worker_interface = InkscapeInterface(inkscape_path, use_shell=use_shell,
+                                          svg_cache=SvgCache() if use_cache else None)
+    # Quit the Inkscape shells when the pool shuts the worker down (workers are spawned, so atexit runs)
+    atexit.register(_worker_interface.close)
+
+
+def convert_page(pdf_path, page_number, output_svg_path, backend=None, simplify=True):
+    """
+    Convert one PDF page to a simplified SVG in a worker process.
+
+    Args:
+        backend (str, optional): Name of the SvgBackend, Inkscape by default
+        simplify (bool): Convert objects to paths; False gives the plain
+            pdf_to_svg output
+
+    Returns:
+        tuple: (page_number, success)
+    """
+    interface = _worker_interface or InkscapeInterface()
+    if simplify:
+        success = interface.pdf_page_to_simplified_svg(
+            pdf_path, page_number, output_svg_path=output_svg_path, backend=backend)
+    else:
+        success = interface.pdf_to_svg(pdf_path, page_number, output_svg_path, backend=backend)
+    return page_number, success
+
+
+def output_directory_for(pdf_path):
+    """Default output directory of a deck: "<pdf name>_svg" next to the PDF."""
+    stem = os.path.splitext(os.path.basename(pdf_path))[0]
+    return os.path.join(os.path.dirname(os.path.abspath(pdf_path)), f"{stem}_svg")
+
+
+def output_path(output_dir, page_number):
+    """Path of the SVG of a page (1-based) in an output directory."""
+    return os.path.join(output_dir, f"page_{page_number:03d}.svg")
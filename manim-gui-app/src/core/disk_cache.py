@@ -0,0 +1,142 @@
+import os
+import tempfile
+
+
+class DiskCache:
+    """
+    Size-capped directory of files addressed by string keys.
+
+    Entries are written atomically (temporary file + rename), so several
+    processes can share the same cache directory. The modification time of
+    a file is refreshed on every hit and the least recently used files are
+    removed once the directory grows beyond max_bytes.
+    """
+
+    def __init__(self, directory, max_bytes, suffix=""):
+        """
+        Args:
+            directory (str): Directory holding the cached files
+            max_bytes (int): Maximum total size of the cached files
+            suffix (str): Extension given to the cached files (e.g. ".png")
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._total_bytes = None  # Computed on the first write
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, key):
+        """Return the file path of an entry (whether it exists or not)."""
+        # Two-level layout keeps directories small with thousands of entries
+        return os.path.join(self.directory, key[:2], key + self.suffix)
+
+    def get_path(self, key):
+        """Return the path of a cached entry, or None on a miss."""
+        path = self.path_for(key)
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def get_bytes(self, key):
+        """Return the content of a cached entry, or None on a miss."""
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def put_bytes(self, key, data):
+        """Store data under key and return the path of the entry."""
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            replaced_size = os.path.getsize(path)  # Overwriting an entry only adds the difference
+        except OSError:
+            replaced_size = 0
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self._added(len(data) - replaced_size)
+        return path
+
+    def put_file(self, key, source_path):
+        """Copy an existing file into the cache and return the path of the entry."""
+        with open(source_path, 'rb') as file:
+            return self.put_bytes(key, file.read())
+
+    def _added(self, size):
+        if self._total_bytes is None:
+            self._total_bytes = self.total_bytes()
+        else:
+            self._total_bytes += size
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        """Return (mtime, size, path) for every cached file."""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def total_bytes(self):
+        """Size of all the cached files."""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self, target_bytes=None):
+        """Remove the least recently used files until the cache fits target_bytes."""
+        if target_bytes is None:
+            # Leave some headroom so that the next writes do not evict again
+            target_bytes = int(self.max_bytes * 0.9)
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= target_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+        self._total_bytes = total
+
+    def clear(self):
+        """Remove every cached file."""
+        self.evict(target_bytes=0)
+
+    def stats(self):
+        """Return a dictionary describing the cache usage."""
+        lookups = self.hits + self.misses
+        return {
+            "directory": self.directory,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -1,15 +1,161 @@
 import subprocess
 import os
+import warnings
+import fitz
+from src.core.inkscape_shell import InkscapeShellPool, InkscapeShellError
+from src.core.pdf_document import PdfDocument
+from src.core.svg_backends import SvgBackend, InkscapeBackend, PyMuPdfBackend
+from src.utils.file_utils import make_temp_file
 
 class InkscapeInterface:
-    def __init__(self, inkscape_path="inkscape"):
+    # Inkscape version of each executable, queried once per process
+    versions = {}
+
+    def __init__(self, inkscape_path="inkscape", use_shell=False, shell_workers=1, job_timeout=120,
+                 svg_cache=None, backend="inkscape"):
         """
         Initialize the InkscapeInterface with path to Inkscape executable.
         Default is 'inkscape' (assumes it's in PATH)
+
+        With use_shell=True, conversions are sent to long-lived
+        `inkscape --shell` processes instead of starting Inkscape for each
+        call, which saves its startup time on every page. A job failing in
+        shell mode is run again with a regular Inkscape process.
+
+        With an SvgCache, converting the same page or SVG again (same
+        content, options and Inkscape version) copies the previous result
+        instead of running Inkscape.
+
+        PDF pages can also be converted in-process by PyMuPDF: pass
+        backend="pymupdf" (or an SvgBackend instance) to the constructor
+        to change the default, or to pdf_to_svg and
+        pdf_page_to_simplified_svg to choose per job.
+
+        Args:
+            inkscape_path (str): Path to the Inkscape executable
+            use_shell (bool): Keep Inkscape processes alive between conversions
+            shell_workers (int): Number of shell processes
+            job_timeout (float): Seconds allowed per conversion in shell mode
+            svg_cache (SvgCache, optional): Cache of the conversion results
+            backend (str or SvgBackend): Default backend for PDF pages (None for Inkscape)
         """
         self.inkscape_path = inkscape_path
+        self.svg_cache = svg_cache
+        self.backends = {
+            InkscapeBackend.name: InkscapeBackend(self),
+            PyMuPdfBackend.name: PyMuPdfBackend(),
+        }
+        self.default_backend = self.get_backend(backend or InkscapeBackend.name)
+        self.shell_pool = None
+        if use_shell:
+            self.shell_pool = InkscapeShellPool(inkscape_path, shell_workers, job_timeout)
+
+    def close(self):
+        """Stop the Inkscape shell processes, if any"""
+        if self.shell_pool is not None:
+            self.shell_pool.close()
+
+    def get_backend(self, backend=None):
+        """Return the SvgBackend for a name, an instance or None (the default one)"""
+        if backend is None:
+            return self.default_backend
+        if isinstance(backend, SvgBackend):
+            return backend
+        if backend not in self.backends:
+            raise ValueError(f"Unknown SVG backend: {backend}")
+        return self.backends[backend]
+
+    def run_backend(self, backend, pdf_path, page_number, output_svg_path, simplify):
+        """Convert a page with a non-Inkscape backend, through the cache"""
+        operation = "pdf_page_to_simplified_svg" if simplify else "pdf_to_svg"
+        hit, cache_key = self.lookup_cache(pdf_path, operation, output_svg_path, page_number, backend)
+        if hit:
+            return True
+        if not backend.pdf_to_svg(pdf_path, page_number, output_svg_path, simplify):
+            return False
+        self.cache_result(cache_key, output_svg_path)
+        return True
+
+    @property
+    def inkscape_version(self):
+        """Version string printed by `inkscape --version`, or unknown (queried once per executable)"""
+        if self.inkscape_path not in self.versions:
+            try:
+                result = subprocess.run([self.inkscape_path, "--version"], check=True,
+                                        capture_output=True, text=True, timeout=60)
+                self.versions[self.inkscape_path] = result.stdout.strip() or "unknown"
+            except Exception as e:
+                print(f"Warning: Could not get the Inkscape version: {e}")
+                # Remembered too: a missing executable is not started again for every page
+                self.versions[self.inkscape_path] = "unknown"
+        return self.versions[self.inkscape_path]
+
+    def lookup_cache(self, input_path, operation, output_path, page_number=None, backend=None):
+        """
+        Deliver a cached conversion result to output_path if there is one
+
+        Returns:
+            tuple: (hit, key) where key is passed to cache_result after a
+            successful conversion (None without a cache)
+        """
+        if self.svg_cache is None:
+            return False, None
+        backend = backend or self.backends[InkscapeBackend.name]
+        try:
+            key = self.svg_cache.conversion_key(input_path, operation, backend.version, page_number,
+                                                backend=backend.name, **backend.options())
+        except OSError as e:
+            print(f"Warning: Could not hash {input_path}: {e}")
+            return False, None
+        return self.svg_cache.fetch(key, output_path), key
+
+    def cache_result(self, key, output_path):
+        """Store a conversion result found by lookup_cache's key"""
+        if key is not None:
+            self.svg_cache.store(key, output_path)
+
+    def cache_stats(self):
+        """Return the hit/miss statistics of the SVG cache, or None without a cache"""
+        return self.svg_cache.stats() if self.svg_cache is not None else None
+
+    def run_shell_job(self, actions, output_path):
+        """
+        Run an action line in shell mode and check that it produced output_path
+
+        Returns:
+            bool: True if the file was written, False otherwise
+        """
+        # Actions are separated by ';', a path containing one cannot be passed
+        if self.shell_pool is None or any(";" in action for action in actions):
+            return False
+        try:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            self.shell_pool.run(actions)
+        except (InkscapeShellError, OSError) as e:
+            print(f"Inkscape shell job failed: {e}")
+            return False
+        return os.path.exists(output_path)
 
-    def pdf_to_svg(self, pdf_path, page_number, output_svg_path):
+    def extract_pdf_page(self, pdf_path, page_number, output_pdf_path):
+        """
+        Copy one page of a PDF into a single-page PDF
+
+        Inkscape's shell actions cannot choose which PDF page to import,
+        so the page is extracted first and the one-page file is opened.
+        """
+        document = PdfDocument.acquire(pdf_path)
+        try:
+            with document.lock:
+                single_page = fitz.open()
+                single_page.insert_pdf(document.document, from_page=page_number - 1,
+                                       to_page=page_number - 1)
+            single_page.save(output_pdf_path)
+            single_page.close()
+        finally:
+            document.release()
+
+    def pdf_to_svg(self, pdf_path, page_number, output_svg_path, backend=None):
         """
         Convert a specific page of a PDF to SVG using Inkscape
         
@@ -17,10 +163,23 @@ class InkscapeInterface:
             pdf_path (str): Path to the PDF file
             page_number (int): Page number to convert (1-based)
             output_svg_path (str): Path where to save the SVG file
+            backend (str or SvgBackend, optional): Converter to use instead
+                of the default one
         
         Returns:
             bool: True if conversion was successful, False otherwise
         """
+        backend = self.get_backend(backend)
+        if backend.name != InkscapeBackend.name:
+            return self.run_backend(backend, pdf_path, page_number, output_svg_path, simplify=False)
+        hit, cache_key = self.lookup_cache(pdf_path, "pdf_to_svg", output_svg_path, page_number)
+        if hit:
+            return True
+        if self.shell_pool is not None:
+            if self.shell_pdf_to_svg(pdf_path, page_number, output_svg_path):
+                self.cache_result(cache_key, output_svg_path)
+                return True
+            print("Falling back to a separate Inkscape process")
         try:
             command = [
                 self.inkscape_path,
@@ -31,10 +190,33 @@ class InkscapeInterface:
                 pdf_path
             ]
             result = subprocess.run(command, check=True, capture_output=True, text=True)
+            self.cache_result(cache_key, output_svg_path)
             return True
         except Exception as e:
             print(f"Error converting PDF to SVG: {e}")
             return False
+
+    def shell_pdf_to_svg(self, pdf_path, page_number, output_svg_path, simplify=False):
+        """Shell mode version of pdf_to_svg, converting objects to paths if simplify"""
+        # The one-page PDF is unavoidable in shell mode, keep it in memory
+        page_pdf_path = make_temp_file(".pdf")
+        try:
+            self.extract_pdf_page(pdf_path, page_number, page_pdf_path)
+            simplify_actions = ["select-all", "object-to-path"] if simplify else []
+            return self.run_shell_job([
+                f"file-open:{page_pdf_path}",
+                *simplify_actions,
+                "export-type:svg",
+                "export-plain-svg",
+                f"export-filename:{output_svg_path}",
+                "export-do",
+                "file-close",
+            ], output_svg_path)
+        except Exception as e:
+            print(f"Error preparing page {page_number} for Inkscape: {e}")
+            return False
+        finally:
+            os.remove(page_pdf_path)
     
     def simplify_svg(self, input_svg_path, output_svg_path):
         """
@@ -47,6 +229,23 @@ class InkscapeInterface:
         Returns:
             bool: True if simplification was successful, False otherwise
         """
+        hit, cache_key = self.lookup_cache(input_svg_path, "simplify_svg", output_svg_path)
+        if hit:
+            return True
+        if self.shell_pool is not None:
+            if self.run_shell_job([
+                    f"file-open:{input_svg_path}",
+                    "select-all",
+                    "object-to-path",
+                    "export-type:svg",
+                    "export-plain-svg",
+                    f"export-filename:{output_svg_path}",
+                    "export-do",
+                    "file-close",
+            ], output_svg_path):
+                self.cache_result(cache_key, output_svg_path)
+                return True
+            print("Falling back to a separate Inkscape process")
         try:
             command = [
                 self.inkscape_path,
@@ -55,42 +254,68 @@ class InkscapeInterface:
                 "--actions=select-all;object-to-path"
             ]
             result = subprocess.run(command, check=True, capture_output=True, text=True)
+            self.cache_result(cache_key, output_svg_path)
             return True
         except Exception as e:
             print(f"Error simplifying SVG: {e}")
             return False
             
-    def pdf_page_to_simplified_svg(self, pdf_path, page_number, temp_svg_path=None, output_svg_path=None):
+    def pdf_page_to_simplified_svg(self, pdf_path, page_number, temp_svg_path=None, output_svg_path=None,
+                                   backend=None):
         """
         Convert a PDF page to a simplified SVG in one go
         
+        Inkscape imports the page, converts every object to a path and
+        exports in a single pass, without an intermediate SVG file, so
+        concurrent calls never share a file.
+        
         Args:
             pdf_path (str): Path to the PDF file
             page_number (int): Page number to convert
-            temp_svg_path (str, optional): Path for temporary SVG. If None, uses "temp_output.svg"
+            temp_svg_path (str, optional): Deprecated and ignored, no
+                temporary SVG is written anymore
             output_svg_path (str, optional): Path for final SVG. If None, uses "simplified_page_{page_number}.svg"
+            backend (str or SvgBackend, optional): Converter to use instead
+                of the default one
             
         Returns:
-            bool: True if both operations were successful, False otherwise
+            bool: True if conversion was successful, False otherwise
         """
-        # Set default paths if not provided
-        if temp_svg_path is None:
-            temp_svg_path = f"temp_output.svg"
+        if temp_svg_path is not None:
+            warnings.warn("temp_svg_path is deprecated and ignored: pdf_page_to_simplified_svg "
+                          "no longer writes an intermediate SVG", DeprecationWarning, stacklevel=2)
+        # Set default path if not provided
         if output_svg_path is None:
             output_svg_path = f"simplified_page_{page_number}.svg"
             
-        # Step 1: Convert PDF page to SVG
-        if not self.pdf_to_svg(pdf_path, page_number, temp_svg_path):
-            return False
+        backend = self.get_backend(backend)
+        if backend.name != InkscapeBackend.name:
+            return self.run_backend(backend, pdf_path, page_number, output_svg_path, simplify=True)
             
-        # Step 2: Simplify SVG
-        result = self.simplify_svg(temp_svg_path, output_svg_path)
-        
-        # Clean up temporary file
+        hit, cache_key = self.lookup_cache(pdf_path, "pdf_page_to_simplified_svg",
+                                           output_svg_path, page_number)
+        if hit:
+            return True
+            
+        if self.shell_pool is not None:
+            if self.shell_pdf_to_svg(pdf_path, page_number, output_svg_path, simplify=True):
+                self.cache_result(cache_key, output_svg_path)
+                return True
+            print("Falling back to a separate Inkscape process")
         try:
-            if os.path.exists(temp_svg_path):
-                os.remove(temp_svg_path)
+            # The actions run between the import of the page and the export
+            command = [
+                self.inkscape_path,
+                f"--pdf-page={page_number}",
+                "--actions=select-all;object-to-path",
+                "--export-type=svg",
+                "--export-plain-svg",
+                f"--export-filename={output_svg_path}",
+                pdf_path
+            ]
+            result = subprocess.run(command, check=True, capture_output=True, text=True)
+            self.cache_result(cache_key, output_svg_path)
+            return True
         except Exception as e:
-            print(f"Warning: Could not remove temporary file {temp_svg_path}: {e}")
-            
-        return result
\ No newline at end of file
+            print(f"Error converting PDF page to simplified SVG: {e}")
+            return False
\ No newline at end of file
@@ -0,0 +1,191 @@
+import os
+import queue
+import subprocess
+import threading
+import time
+from collections import deque
+
+
+class InkscapeShellError(Exception):
+    """Raised when an Inkscape shell process fails, dies or times out."""
+
+
+class InkscapeShellTimeout(InkscapeShellError):
+    """Raised when a job runs longer than its timeout (the process is killed)."""
+
+
+class InkscapeShell:
+    """
+    One long-lived `inkscape --shell` process fed with action lines.
+
+    Inkscape prints a "> " prompt each time it is ready for a new line, so a
+    job is done when the prompt comes back. Starting Inkscape costs seconds,
+    running an action line on an already started process only costs the
+    conversion itself.
+    """
+
+    PROMPT = b"> "
+
+    def __init__(self, inkscape_path="inkscape", startup_timeout=60):
+        self.inkscape_path = inkscape_path
+        self.startup_timeout = startup_timeout
+        self.process = None
+        self.output = None
+        self.stderr_tail = deque(maxlen=50)
+        # Set by InkscapeShellPool when a job failed: the process is checked before its next job
+        self.failed = False
+
+    def start(self):
+        """Launch the process and wait for its first prompt."""
+        self.stop()
+        self.process = subprocess.Popen(
+            [self.inkscape_path, "--shell"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        self.output = queue.Queue()
+        self.stderr_tail.clear()
+        # Blocking reads happen in threads so that waits can time out
+        threading.Thread(target=self._read_stdout, args=(self.process, self.output),
+                         daemon=True).start()
+        threading.Thread(target=self._read_stderr, args=(self.process,), daemon=True).start()
+        self._wait_for_prompt(self.startup_timeout)
+
+    def _read_stdout(self, process, output):
+        while True:
+            try:
+                chunk = os.read(process.stdout.fileno(), 4096)
+            except (OSError, ValueError):  # Pipe closed by stop()
+                chunk = b""
+            output.put(chunk)
+            if not chunk:  # EOF: the process exited
+                return
+
+    def _read_stderr(self, process):
+        try:
+            for line in process.stderr:
+                self.stderr_tail.append(line.decode(errors="replace").rstrip())
+        except (OSError, ValueError):
+            pass
+
+    def _wait_for_prompt(self, timeout):
+        """Consume the output until the next prompt, return it without the prompt."""
+        deadline = time.monotonic() + timeout
+        received = b""
+        while not received.endswith(self.PROMPT):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.kill()
+                raise InkscapeShellTimeout(f"Inkscape did not answer within {timeout} s")
+            try:
+                chunk = self.output.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if not chunk:
+                raise InkscapeShellError("Inkscape exited: " + " | ".join(self.stderr_tail))
+            received += chunk
+        return received[:-len(self.PROMPT)].decode(errors="replace")
+
+    def is_alive(self):
+        """Whether the process is running."""
+        return self.process is not None and self.process.poll() is None
+
+    def run(self, actions, timeout=120):
+        """
+        Run a list of actions ("action" or "action:argument") as one line.
+
+        Returns:
+            str: What Inkscape printed before its next prompt
+
+        Raises:
+            InkscapeShellError: If the process is dead or dies
+            InkscapeShellTimeout: If the job takes longer than timeout
+        """
+        if not self.is_alive():
+            raise InkscapeShellError("Inkscape shell is not running")
+        line = "; ".join(actions) + "\n"
+        try:
+            self.process.stdin.write(line.encode())
+            self.process.stdin.flush()
+        except OSError as e:
+            raise InkscapeShellError(f"Cannot write to Inkscape: {e}")
+        return self._wait_for_prompt(timeout)
+
+    def health_check(self, timeout=10):
+        """Return True if the process answers an empty line in time."""
+        try:
+            self.run([], timeout)
+            return True
+        except InkscapeShellError:
+            return False
+
+    def kill(self):
+        """Terminate the process immediately."""
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+
+    def stop(self):
+        """Ask the process to quit, killing it if it does not."""
+        if self.process is None:
+            return
+        if self.process.poll() is None:
+            try:
+                self.process.stdin.write(b"quit\n")
+                self.process.stdin.flush()
+                self.process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self.kill()
+        for pipe in (self.process.stdin, self.process.stdout, self.process.stderr):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+        self.process = None
+
+
+class InkscapeShellPool:
+    """
+    Fixed set of InkscapeShell processes shared by concurrent callers.
+
+    Processes are started on first use. A process which died or timed out is
+    restarted automatically, and a job interrupted by a crash is retried
+    once on a fresh process. Only a process whose last job failed is
+    health-checked before its next job; a healthy one runs jobs back to back.
+    """
+
+    def __init__(self, inkscape_path="inkscape", size=1, job_timeout=120):
+        self.job_timeout = job_timeout
+        self.idle = queue.Queue()
+        for _ in range(size):
+            self.idle.put(InkscapeShell(inkscape_path))
+
+    def run(self, actions, timeout=None):
+        """Run an action line on the first available process (see InkscapeShell.run)."""
+        timeout = timeout or self.job_timeout
+        shell = self.idle.get()
+        try:
+            for attempt in range(2):
+                if not shell.is_alive() or (shell.failed and not shell.health_check()):
+                    shell.start()
+                shell.failed = False
+                try:
+                    return shell.run(actions, timeout)
+                except InkscapeShellTimeout:
+                    # The job itself is too slow, running it again would not help
+                    shell.failed = True
+                    raise
+                except InkscapeShellError:
+                    # A crash deserves a second chance on a fresh process
+                    shell.failed = True
+                    if attempt == 1:
+                        raise
+        finally:
+            self.idle.put(shell)
+
+    def close(self):
+        """Stop every process of the pool."""
+        shells = []
+        while not self.idle.empty():
+            shells.append(self.idle.get())
+        for shell in shells:
+            shell.stop()
+            self.idle.put(shell)
@@ -0,0 +1,123 @@
+import hashlib
+import os
+import threading
+import fitz  # PyMuPDF
+from src.core.render_cache import LRUCache
+
+
+class PdfDocument:
+    """
+    Single open handle on a PDF file, shared by every viewer and handler.
+
+    Use PdfDocument.acquire() instead of the constructor: it returns the
+    already opened instance for a file and counts the users, the handle is
+    closed when the last one calls release(). MuPDF documents are not
+    thread-safe, so every access goes through the document lock.
+    """
+
+    CACHE_SIZE_BYTES = 512 * 1024 * 1024  # Memory budget for rendered pages
+
+    _registry = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.document = fitz.open(file_path)
+        self.page_count = len(self.document)
+        self.page_sizes = [None] * self.page_count
+        self.lock = threading.RLock()
+        self.ref_count = 0
+        stat = os.stat(file_path)
+        self._file_identity = (os.path.realpath(file_path), stat.st_size, stat.st_mtime_ns)
+        # Rendered pages (QImages) shared by all the views of this document
+        self.page_cache = LRUCache(self.CACHE_SIZE_BYTES, sizeof=lambda image: image.sizeInBytes())
+
+    @classmethod
+    def acquire(cls, file_path):
+        """Return the shared document for file_path, opening it if needed."""
+        key = os.path.realpath(file_path)
+        with cls._registry_lock:
+            document = cls._registry.get(key)
+            if document is None:
+                document = cls(file_path)
+                cls._registry[key] = document
+            document.ref_count += 1
+            return document
+
+    def release(self):
+        """Give the document back; it is closed once nobody uses it anymore."""
+        with self._registry_lock:
+            self.ref_count -= 1
+            if self.ref_count > 0:
+                return
+            key = os.path.realpath(self.file_path)
+            if self._registry.get(key) is self:
+                del self._registry[key]
+        with self.lock:
+            self.page_cache.clear()
+            self.document.close()
+
+    @property
+    def cache_key(self):
+        """
+        Key of the on-disk caches: a hash of the path, size and modification time of the file.
+
+        Unlike a hash of the content, it costs a stat when the document is
+        opened instead of reading the whole PDF on the GUI thread; a PDF
+        saved again or replaced gets a new key.
+        """
+        return hashlib.sha256(repr(self._file_identity).encode("utf-8")).hexdigest()
+
+    def __len__(self):
+        return self.page_count
+
+    def check_page(self, page_index):
+        """Raise IndexError if page_index (0-based) is out of range."""
+        if page_index < 0 or page_index >= self.page_count:
+            raise IndexError("Page number out of range.")
+
+    def load_page(self, page_index):
+        """Return a MuPDF page; callers must hold the lock while using it."""
+        self.check_page(page_index)
+        with self.lock:
+            return self.document.load_page(page_index)
+
+    def page_size(self, page_index):
+        """Return the (width, height) of a page in PDF points."""
+        self.check_page(page_index)
+        if self.page_sizes[page_index] is None:
+            with self.lock:
+                rect = self.document.load_page(page_index).rect
+            self.page_sizes[page_index] = (rect.width, rect.height)
+        return self.page_sizes[page_index]
+
+    def render_pixmap(self, page_index, scale=1.0, clip=None, alpha=False):
+        """
+        Rasterize a page and return a fitz.Pixmap.
+
+        Args:
+            page_index (int): Page to render (0-based)
+            scale (float): Pixels per PDF point
+            clip (tuple, optional): (x0, y0, x1, y1) area of the page to
+                render, in PDF points. The whole page is rendered if None.
+            alpha (bool): Render with a transparent background
+        """
+        with self.lock:
+            page = self.load_page(page_index)
+            return page.get_pixmap(matrix=fitz.Matrix(scale, scale),
+                                   clip=fitz.Rect(clip) if clip else None, alpha=alpha)
+
+    def get_text(self, page_index):
+        """Extract the text of a page."""
+        with self.lock:
+            return self.load_page(page_index).get_text()
+
+    def get_svg(self, page_index, text_as_path=True):
+        """Return a page as an SVG string, with glyphs as paths or as <text>."""
+        with self.lock:
+            return self.load_page(page_index).get_svg_image(text_as_path=text_as_path)
+
+    def save_page_image(self, page_index, output_path, scale=1.0):
+        """Save a page as an image file (format deduced from the extension)."""
+        pix = self.render_pixmap(page_index, scale)
+        pix.save(output_path)
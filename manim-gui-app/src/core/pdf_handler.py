@@ -1,3 +1,5 @@
+from src.core.pdf_document import PdfDocument
+
 class PdfHandler:
     def __init__(self, file_path):
         self.file_path = file_path
@@ -5,32 +7,40 @@ class PdfHandler:
 
     def load_pdf(self):
         """Load the PDF document from the specified file path."""
-        from PyPDF2 import PdfReader
-        self.document = PdfReader(self.file_path)
+        if self.document is None:
+            self.document = PdfDocument.acquire(self.file_path)
+
+    def close(self):
+        """Release the shared PDF document."""
+        if self.document is not None:
+            self.document.release()
+            self.document = None
 
     def get_page_count(self):
         """Return the number of pages in the PDF document."""
         if self.document is None:
             raise ValueError("PDF document not loaded.")
-        return len(self.document.pages)
+        return len(self.document)
 
     def get_page(self, page_number):
         """Return the specified page from the PDF document."""
         if self.document is None:
             raise ValueError("PDF document not loaded.")
-        if page_number < 0 or page_number >= self.get_page_count():
-            raise IndexError("Page number out of range.")
-        return self.document.pages[page_number]
+        return self.document.load_page(page_number)
 
     def extract_text(self, page_number):
         """Extract text from the specified page."""
-        page = self.get_page(page_number)
-        return page.extract_text()
+        if self.document is None:
+            raise ValueError("PDF document not loaded.")
+        return self.document.get_text(page_number)
 
     def save_page_as_image(self, page_number, output_path):
-        """Save the specified page as an image."""
-        import fitz  # PyMuPDF
-        pdf_document = fitz.open(self.file_path)
-        page = pdf_document.load_page(page_number)
-        pix = page.get_pixmap()
-        pix.save(output_path)
\ No newline at end of file
+        """Save the specified page as an image (the document is opened for the call if it is not loaded)."""
+        if self.document is not None:
+            self.document.save_page_image(page_number, output_path)
+            return
+        document = PdfDocument.acquire(self.file_path)
+        try:
+            document.save_page_image(page_number, output_path)
+        finally:
+            document.release()
\ No newline at end of file
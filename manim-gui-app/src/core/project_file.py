@@ -0,0 +1,149 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from src.utils.file_utils import get_cache_directory, hash_file
+
+PROJECT_FORMAT = "manim-gui-project"
+PROJECT_FORMAT_VERSION = 1
+PROJECT_EXTENSION = ".mgp"
+MANIFEST_NAME = "manifest.json"
+ASSET_DIR = "assets/"
+DIGEST_PATTERN = re.compile(r"[0-9a-f]{64}")  # SHA-256 naming an asset, in the zip and in the cache
+# Coordinate system of the slides, in which geometries and fragments are stored: 16:9, one unit per
+# pixel of a 720p slide
+SLIDE_SIZE = (1280, 720)
+
+
+def asset_member(digest):
+    return f"{ASSET_DIR}{digest}.svg"
+
+
+def write_project(file_path, slides, previous=None):
+    """
+    Write a project file: a zip holding manifest.json and the SVG assets.
+
+    The manifest lists the slides in order with, for each object, its
+    geometry in slide units (see SLIDE_SIZE, recorded as slide_size),
+    its crop stack and the SHA-256 of its SVG. Each asset is
+    stored once under assets/<sha256>.svg, however many objects show it;
+    SVG is text, so it is deflated. The manifest is the first member, so
+    readers get the structure of the project without touching the assets.
+    The zip is written next to file_path and moved over it once complete.
+
+    Args:
+        file_path (str): Project file to write
+        slides (list): {"name", "objects"} dicts; an object has "geometry"
+            ([x, y, width, height]), "crop" (list of [x, y, width, height])
+            and either "path" (SVG file) or "asset" (digest of an asset of previous)
+        previous (ProjectFile, optional): Project the unresolved assets come from
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(suffix=PROJECT_EXTENSION, dir=directory)
+    os.close(fd)
+    try:
+        manifest_slides = []
+        sources = {}  # digest -> path of the SVG, or None to copy it from previous
+        for slide in slides:
+            objects = []
+            for svg_object in slide["objects"]:
+                if svg_object.get("path"):
+                    digest = previous.digest_of(svg_object["path"]) if previous else None
+                    digest = digest or hash_file(svg_object["path"])
+                    sources.setdefault(digest, svg_object["path"])
+                else:
+                    digest = svg_object["asset"]
+                    sources.setdefault(digest, None)
+                objects.append({"asset": digest,
+                                "geometry": [round(value, 3) for value in svg_object["geometry"]],
+                                "crop": [[round(value, 3) for value in view_box]
+                                         for view_box in svg_object.get("crop", [])]})
+            manifest_slides.append({"name": slide["name"], "objects": objects})
+        manifest = {"format": PROJECT_FORMAT, "version": PROJECT_FORMAT_VERSION, "slide_size": list(SLIDE_SIZE),
+                    "slides": manifest_slides, "assets": sorted(sources)}
+
+        with zipfile.ZipFile(temp_path, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr(MANIFEST_NAME, json.dumps(manifest, separators=(",", ":")))
+            for digest, path in sources.items():
+                if path is not None:
+                    archive.write(path, asset_member(digest))
+                else:
+                    with previous.open_asset(digest) as source, archive.open(asset_member(digest), "w") as target:
+                        shutil.copyfileobj(source, target, 1024 * 1024)
+        os.replace(temp_path, file_path)
+        return True
+    except (OSError, KeyError, zipfile.BadZipFile) as e:
+        print(f"Error saving project {file_path}: {e}")
+        os.remove(temp_path)
+        return False
+
+
+class ProjectFile:
+    """
+    A project file opened for reading.
+
+    Only the manifest is read when the project opens; an asset is
+    extracted from the zip the first time asset_path asks for it, into
+    the "project-assets" cache directory where it is named by its digest
+    and so shared by every project and every later opening. The zip is
+    reopened for each extraction instead of being held open, so the
+    project can be saved over while it is in use.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        with zipfile.ZipFile(file_path) as archive:
+            manifest = json.loads(archive.read(MANIFEST_NAME))
+        if manifest.get("format") != PROJECT_FORMAT:
+            raise ValueError(f"{file_path} is not a project file")
+        if manifest.get("version", 0) > PROJECT_FORMAT_VERSION:
+            raise ValueError(f"{file_path} was written by a newer version (format {manifest['version']})")
+        self.slides = manifest["slides"]
+        self.slide_size = tuple(manifest.get("slide_size", SLIDE_SIZE))
+        self.assets = set(manifest["assets"])
+        # Digests become file names: anything else than a SHA-256 (a path like "../x") is malformed
+        digests = self.assets.union(svg_object["asset"] for slide in self.slides for svg_object in slide["objects"])
+        for digest in digests:
+            if not isinstance(digest, str) or not DIGEST_PATTERN.fullmatch(digest):
+                raise ValueError(f"{file_path} has an invalid asset digest: {digest!r}")
+        self.extracted = {}  # path of an extracted asset -> digest, so saving does not hash it again
+
+    def open_asset(self, digest):
+        """File object reading the bytes of an asset from the zip (the caller closes it)."""
+        archive = zipfile.ZipFile(self.file_path)
+        try:
+            return archive.open(asset_member(digest))
+        finally:
+            # The member keeps its own handle on the file
+            archive.close()
+
+    def asset_path(self, digest, output_dir=None):
+        """
+        Path of an asset on disk, extracted on the first request.
+
+        Returns:
+            str: The path, or None if the asset could not be extracted
+        """
+        output_dir = output_dir or get_cache_directory("project-assets")
+        output_path = os.path.join(output_dir, f"{digest}.svg")
+        if not os.path.exists(output_path):
+            fd, temp_path = tempfile.mkstemp(suffix=".svg", dir=output_dir)
+            try:
+                with os.fdopen(fd, "wb") as target, self.open_asset(digest) as source:
+                    shutil.copyfileobj(source, target, 1024 * 1024)
+                os.replace(temp_path, output_path)
+            except (OSError, KeyError, zipfile.BadZipFile) as e:
+                print(f"Error extracting asset {digest} of {self.file_path}: {e}")
+                os.remove(temp_path)
+                return None
+        self.extracted[output_path] = digest
+        return output_path
+
+    def digest_of(self, path):
+        """Digest of a file extracted by asset_path, None for other files."""
+        return self.extracted.get(path)
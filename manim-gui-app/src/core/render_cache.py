@@ -0,0 +1,92 @@
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Memory-bounded least-recently-used cache.
+
+    Entries are weighed with the ``sizeof`` callable and the least recently
+    used ones are evicted as soon as the total weight exceeds ``max_bytes``.
+    Hit and miss counters are kept so the cache can be sized from real usage.
+    """
+
+    def __init__(self, max_bytes, sizeof=None):
+        """
+        Args:
+            max_bytes (int): Maximum total size of the cached values
+            sizeof (callable, optional): Returns the size in bytes of a value.
+                If None, every entry counts as 1.
+        """
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda value: 1)
+        self._entries = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        """Membership test; does not touch the counters nor the LRU order."""
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """Return the cached value for key and mark it as recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def peek(self, key, default=None):
+        """Return the cached value without touching the counters nor the LRU order."""
+        entry = self._entries.get(key)
+        return default if entry is None else entry[0]
+
+    def put(self, key, value):
+        """Insert or replace a value, evicting old entries if needed."""
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            # Never let a single oversized value flush the whole cache
+            self.discard(key)
+            return
+        if key in self._entries:
+            self.current_bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (value, size)
+        self.current_bytes += size
+        while self.current_bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+            self.evictions += 1
+
+    def discard(self, key):
+        """Remove key from the cache if present."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
+
+    def clear(self):
+        """Drop every entry (the counters are kept)."""
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def keys(self):
+        """Return the cached keys, least recently used first."""
+        return list(self._entries.keys())
+
+    def stats(self):
+        """Return a dictionary describing the cache usage."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
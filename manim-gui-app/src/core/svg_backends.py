@@ -0,0 +1,105 @@
+import abc
+import os
+import tempfile
+import fitz  # PyMuPDF
+from src.core.pdf_document import PdfDocument
+
+
+class SvgBackend(abc.ABC):
+    """
+    Converter of PDF pages to SVG files.
+
+    Backends are selected per job through InkscapeInterface (backend="name"
+    or an instance). Their name, version and options are part of the SVG
+    cache key, so results of different backends never mix.
+    """
+
+    name = None
+
+    @property
+    @abc.abstractmethod
+    def version(self):
+        """Version of the underlying converter."""
+
+    def options(self):
+        """Settings which change the output, as a dictionary."""
+        return {}
+
+    @abc.abstractmethod
+    def pdf_to_svg(self, pdf_path, page_number, output_svg_path, simplify=False):
+        """
+        Convert a page (1-based) of a PDF to an SVG file.
+
+        With simplify=True, the SVG only contains paths (no text or other
+        objects), as produced by pdf_page_to_simplified_svg.
+
+        Returns:
+            bool: True if conversion was successful, False otherwise
+        """
+
+
+class InkscapeBackend(SvgBackend):
+    """The external Inkscape program, driven by an InkscapeInterface."""
+
+    name = "inkscape"
+
+    def __init__(self, interface):
+        self.interface = interface
+
+    @property
+    def version(self):
+        return self.interface.inkscape_version
+
+    def options(self):
+        return {"plain_svg": True}
+
+    def pdf_to_svg(self, pdf_path, page_number, output_svg_path, simplify=False):
+        if simplify:
+            return self.interface.pdf_page_to_simplified_svg(
+                pdf_path, page_number, output_svg_path=output_svg_path, backend=self)
+        return self.interface.pdf_to_svg(pdf_path, page_number, output_svg_path, backend=self)
+
+
+class PyMuPdfBackend(SvgBackend):
+    """
+    In-process conversion with MuPDF's SVG device.
+
+    No process is started, so a page costs a few milliseconds. Text is
+    written as glyph paths by default; with text_as_path=False it stays
+    <text>, which is smaller but depends on the fonts of the viewer.
+    Simplified conversions always use paths.
+    """
+
+    name = "pymupdf"
+
+    def __init__(self, text_as_path=True):
+        self.text_as_path = text_as_path
+
+    @property
+    def version(self):
+        return fitz.VersionBind
+
+    def options(self):
+        return {"text_as_path": self.text_as_path}
+
+    def pdf_to_svg(self, pdf_path, page_number, output_svg_path, simplify=False):
+        try:
+            document = PdfDocument.acquire(pdf_path)
+            try:
+                svg = document.get_svg(page_number - 1, text_as_path=simplify or self.text_as_path)
+            finally:
+                document.release()
+            # Write next to the destination and rename, readers never see half a file
+            directory = os.path.dirname(os.path.abspath(output_svg_path))
+            fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                    file.write(svg)
+                os.replace(temp_path, output_svg_path)
+            except Exception:
+                os.remove(temp_path)
+                raise
+            return True
+        except Exception as e:
+            print(f"Error converting PDF to SVG with PyMuPDF: {e}")
+            return False
@@ -0,0 +1,85 @@
+import hashlib
+import os
+import shutil
+from src.core.disk_cache import DiskCache
+from src.utils.file_utils import get_cache_directory, hash_file
+
+
+class SvgCache(DiskCache):
+    """
+    On-disk cache of Inkscape conversion results.
+
+    Entries are addressed by content: the key hashes the bytes of the input
+    file together with the page number, the conversion options and the
+    Inkscape version, so editing the PDF or upgrading Inkscape never
+    returns a stale SVG. A hit is delivered as a file copy, or as a
+    hardlink when enabled.
+    """
+
+    CACHE_SIZE_BYTES = 500 * 1024 * 1024
+
+    def __init__(self, directory=None, max_bytes=CACHE_SIZE_BYTES, hardlink=False):
+        """
+        Args:
+            directory (str, optional): Cache directory, the user cache
+                directory by default
+            max_bytes (int): Maximum total size of the cached SVGs
+            hardlink (bool): Deliver hits as hardlinks instead of copies.
+                The output then shares its data with the cache entry, so
+                it must not be modified in place.
+        """
+        super().__init__(directory or get_cache_directory("svg"), max_bytes, suffix=".svg")
+        self.hardlink = hardlink
+        self.file_hashes = {}  # (path, mtime, size) -> content hash
+
+    def file_hash(self, path):
+        """Content hash of a file, memoized while the file is unchanged."""
+        stat = os.stat(path)
+        memo_key = (os.path.realpath(path), stat.st_mtime_ns, stat.st_size)
+        if memo_key not in self.file_hashes:
+            self.file_hashes[memo_key] = hash_file(path)
+        return self.file_hashes[memo_key]
+
+    def conversion_key(self, input_path, operation, inkscape_version, page_number=None, **options):
+        """
+        Cache key of the conversion of an input file.
+
+        Args:
+            input_path (str): PDF or SVG file being converted
+            operation (str): Name of the conversion (e.g. "pdf_to_svg")
+            inkscape_version (str): Version string of the Inkscape used
+            page_number (int, optional): Page of a PDF
+            **options: Any other option changing the output
+        """
+        parts = [self.file_hash(input_path), operation, str(page_number), inkscape_version]
+        parts += [f"{name}={options[name]}" for name in sorted(options)]
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+    def fetch(self, key, output_path):
+        """Write the cached result of key to output_path; return False on a miss."""
+        path = self.get_path(key)
+        if path is None:
+            return False
+        try:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            if self.hardlink:
+                try:
+                    os.link(path, output_path)
+                    return True
+                except OSError:
+                    pass  # Other file system, or links not supported
+            shutil.copyfile(path, output_path)
+            return True
+        except OSError:
+            # Evicted by another process in the meantime
+            self.hits -= 1
+            self.misses += 1
+            return False
+
+    def store(self, key, result_path):
+        """Add a conversion result to the cache; failures only cost a future miss."""
+        try:
+            self.put_file(key, result_path)
+        except OSError as e:
+            print(f"Warning: Could not cache {result_path}: {e}")
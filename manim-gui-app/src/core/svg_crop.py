@@ -0,0 +1,81 @@
+import os
+import re
+import tempfile
+import xml.etree.ElementTree as ET
+
+# Keep the usual prefixes when the document is written back
+NAMESPACES = {
+    "": "http://www.w3.org/2000/svg",
+    "xlink": "http://www.w3.org/1999/xlink",
+    "inkscape": "http://www.inkscape.org/namespaces/inkscape",
+    "sodipodi": "http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd",
+}
+LENGTH_PATTERN = re.compile(r"^\s*([-+]?[0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?)\s*([a-zA-Z]*)\s*$")
+
+
+def parse_length(value):
+    """Split an SVG length such as "612pt" into (612.0, "pt"); None for percentages or garbage."""
+    match = LENGTH_PATTERN.match(value or "")
+    if not match:
+        return None
+    return float(match.group(1)), match.group(2)
+
+
+def document_view_box(root):
+    """Return the (x, y, width, height) view box of an SVG root element."""
+    view_box = root.get("viewBox")
+    if view_box:
+        return tuple(float(part) for part in view_box.replace(",", " ").split())
+    # Without a viewBox, user units are the width and height
+    width, height = parse_length(root.get("width")), parse_length(root.get("height"))
+    if width is None or height is None:
+        raise ValueError("SVG has neither a viewBox nor an absolute width and height")
+    return (0.0, 0.0, width[0], height[0])
+
+
+def write_svg_tree(tree, output_path):
+    """Write an ElementTree next to the destination then rename it, a reader never sees a partial file."""
+    fd, temp_path = tempfile.mkstemp(suffix=".svg", dir=os.path.dirname(os.path.abspath(output_path)))
+    try:
+        with os.fdopen(fd, "wb") as file:
+            tree.write(file, encoding="utf-8", xml_declaration=True)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def write_cropped_svg(svg_path, view_box, output_path):
+    """
+    Write a copy of an SVG file showing only part of it.
+
+    The crop is done by replacing the viewBox; width and height are scaled
+    by the same ratio so the cropped drawing keeps the size it had in the
+    original document.
+
+    Args:
+        svg_path (str): Source SVG file
+        view_box (tuple): (x, y, width, height) to keep, in the user units of the document
+        output_path (str): Path of the cropped SVG
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        for prefix, uri in NAMESPACES.items():
+            ET.register_namespace(prefix, uri)
+        tree = ET.parse(svg_path)
+        root = tree.getroot()
+        _, _, full_width, full_height = document_view_box(root)
+        x, y, width, height = view_box
+
+        for attribute, ratio in (("width", width / full_width), ("height", height / full_height)):
+            length = parse_length(root.get(attribute))
+            if length is not None:
+                root.set(attribute, f"{length[0] * ratio:g}{length[1]}")
+        root.set("viewBox", f"{x:g} {y:g} {width:g} {height:g}")
+        write_svg_tree(tree, output_path)
+        return True
+    except (OSError, ET.ParseError, ValueError, ZeroDivisionError) as e:
+        print(f"Error cropping {svg_path}: {e}")
+        return False
@@ -0,0 +1,402 @@
+import math
+import os
+import re
+import statistics
+import tempfile
+import xml.etree.ElementTree as ET
+from src.core.svg_crop import NAMESPACES, document_view_box, write_svg_tree, write_cropped_svg
+from src.core.svg_simplify import COMMAND_PATTERN, NUMBER_PATTERN, IDENTITY_AFFINE, multiply_affine, parse_affine
+from src.core.svg_minify import minify_svg_file
+from src.utils.file_utils import get_cache_directory, hash_file
+
+XLINK_HREF = "{%s}href" % NAMESPACES["xlink"]
+ALGORITHM_VERSION = "1"  # Change it when fragments change, to invalidate the written files
+RESOURCE_TAGS = {"defs", "clipPath", "mask", "marker", "pattern", "symbol", "metadata", "style", "script",
+                 "title", "desc"}
+SHAPE_TAGS = {"path", "rect", "circle", "ellipse", "line", "polyline", "polygon", "use", "image", "text"}
+# Arc arguments; the two flags are single digits that may be written without separator
+ARC_PATTERN = re.compile(r"\s*,?\s*".join([f"({NUMBER_PATTERN.pattern})"] * 3 + ["([01])", "([01])"]
+                                          + [f"({NUMBER_PATTERN.pattern})"] * 2))
+FONT_SIZE_PATTERN = re.compile(r"font-size\s*:\s*([0-9.]+)")
+
+# Gaps joining shapes into one fragment, in typical glyph heights: words of a
+# line are joined, lines are not
+HORIZONTAL_GAP = 0.6
+VERTICAL_GAP = 0.1
+# Shapes covering this share of the page are backgrounds or frames, part of no fragment
+BACKGROUND_SHARE = 0.5
+FRAGMENT_MARGIN = 0.15  # In typical glyph heights, around a written fragment
+
+
+def union_boxes(boxes):
+    """Smallest (x0, y0, x1, y1) box containing all boxes."""
+    x0s, y0s, x1s, y1s = zip(*boxes)
+    return min(x0s), min(y0s), max(x1s), max(y1s)
+
+
+def transform_box(matrix, box):
+    """Box containing the four transformed corners of box."""
+    a, b, c, d, e, f = matrix
+    x0, y0, x1, y1 = box
+    xs = [a * x + c * y + e for x in (x0, x1) for y in (y0, y1)]
+    ys = [b * x + d * y + f for x in (x0, x1) for y in (y0, y1)]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def path_box(d):
+    """
+    Box of the end and control points of path data (a curve stays inside it).
+
+    Arcs count with their end points grown by their radius.
+    """
+    xs, ys = [], []
+    x = y = start_x = start_y = 0.0
+    for letter, args in COMMAND_PATTERN.findall(d):
+        command = letter.upper()
+        relative = letter != command
+        if command == "Z":
+            x, y = start_x, start_y
+            continue
+        if command == "A":
+            for match in ARC_PATTERN.finditer(args):
+                rx, ry, _, _, _, end_x, end_y = (float(value) for value in match.groups())
+                if relative:
+                    end_x, end_y = x + end_x, y + end_y
+                radius = max(abs(rx), abs(ry))
+                xs.extend((x - radius, x + radius, end_x - radius, end_x + radius))
+                ys.extend((y - radius, y + radius, end_y - radius, end_y + radius))
+                x, y = end_x, end_y
+            continue
+        numbers = [float(value) for value in NUMBER_PATTERN.findall(args)]
+        if command == "H":
+            for value in numbers:
+                x = x + value if relative else value
+                xs.append(x)
+                ys.append(y)
+        elif command == "V":
+            for value in numbers:
+                y = y + value if relative else value
+                xs.append(x)
+                ys.append(y)
+        else:
+            # M, L, T: one point per step; Q, S: two; C: three. The last one is the new position
+            step = {"C": 6, "Q": 4, "S": 4}.get(command, 2)
+            for index in range(0, len(numbers) - step + 1, step):
+                base_x, base_y = (x, y) if relative else (0.0, 0.0)
+                for offset in range(index, index + step, 2):
+                    xs.append(base_x + numbers[offset])
+                    ys.append(base_y + numbers[offset + 1])
+                x, y = xs[-1], ys[-1]
+                if command == "M" and index == 0:
+                    start_x, start_y = x, y
+    if not xs:
+        return None
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def number(element, name, default=0.0):
+    try:
+        return float(NUMBER_PATTERN.match(element.get(name, "")).group())
+    except (AttributeError, ValueError):
+        return default
+
+
+def font_size(element, inherited):
+    match = FONT_SIZE_PATTERN.search(element.get("style", ""))
+    if match:
+        return float(match.group(1))
+    return number(element, "font-size", inherited)
+
+
+class GridIndex:
+    """
+    Uniform grid over boxes, to find the ones near a point or a box
+    without comparing them all.
+
+    A box is stored in every cell it touches; queries return the items of
+    the cells they touch, callers check the boxes themselves.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def cell_range(self, box):
+        x0, y0, x1, y1 = (math.floor(value / self.cell_size) for value in box)
+        return ((i, j) for i in range(x0, x1 + 1) for j in range(y0, y1 + 1))
+
+    def insert(self, item, box):
+        for cell in self.cell_range(box):
+            self.cells.setdefault(cell, []).append(item)
+
+    def query(self, box):
+        """Items whose cells touch box, each once."""
+        found = {}
+        for cell in self.cell_range(box):
+            for item in self.cells.get(cell, ()):
+                found[item] = None
+        return list(found)
+
+
+class SvgFragment:
+    """A group of neighbouring shapes of a page: a line of text, an equation or a figure."""
+
+    def __init__(self, index, box, leaves, kind):
+        self.index = index
+        self.box = box  # (x0, y0, x1, y1) in the user units of the page
+        self.leaves = leaves  # Paths of child indices from the root, in document order
+        self.kind = kind
+
+    @property
+    def rect(self):
+        """(x, y, width, height) of the box."""
+        x0, y0, x1, y1 = self.box
+        return x0, y0, x1 - x0, y1 - y0
+
+
+class PageFragments:
+    """
+    Decompose a page SVG into fragments that can be inserted on their own.
+
+    The shapes drawn by the page (paths, uses, texts...) are measured in
+    the user units of the page, then joined when they are closer than a
+    share of the typical glyph height: HORIZONTAL_GAP along a line,
+    VERTICAL_GAP between lines. Each group is a fragment, kept in a grid
+    index for hit tests. write_fragment writes a fragment as a small SVG
+    document of its own: only its shapes, the groups around them and the
+    resources they use, with a viewBox around them.
+    """
+
+    def __init__(self, svg_path):
+        self.svg_path = svg_path
+        for prefix, uri in NAMESPACES.items():
+            ET.register_namespace(prefix, uri)
+        self.tree = ET.parse(svg_path)
+        self.root = self.tree.getroot()
+        self.view_box = document_view_box(self.root)
+        self.ids = {element.get("id"): element for element in self.root.iter() if element.get("id")}
+        self.reference_boxes = {}
+        self.leaves = []  # (path of child indices, box)
+        self.collect_leaves(self.root, (), IDENTITY_AFFINE, 16.0)
+        heights = [box[3] - box[1] for _, box in self.leaves if box[3] > box[1]]
+        self.glyph_height = statistics.median(heights) if heights else 1.0
+        self.fragments = self.group_leaves()
+        self.index = GridIndex(self.cell_size(4))
+        for fragment in self.fragments:
+            self.index.insert(fragment.index, fragment.box)
+        self.digest = None
+
+    def cell_size(self, glyph_heights):
+        """Grid cell size, at most 256 cells along the page."""
+        _, _, width, height = self.view_box
+        return max(glyph_heights * self.glyph_height, max(width, height) / 256, 1e-9)
+
+    def local_box(self, element, size):
+        """Box of a shape in its own user space, or None if it draws nothing."""
+        name = element.tag.rsplit("}", 1)[-1]
+        if name == "path":
+            return path_box(element.get("d", ""))
+        if name in ("rect", "image"):
+            x, y = number(element, "x"), number(element, "y")
+            return x, y, x + number(element, "width"), y + number(element, "height")
+        if name in ("circle", "ellipse"):
+            cx, cy = number(element, "cx"), number(element, "cy")
+            rx = number(element, "r", number(element, "rx"))
+            ry = number(element, "r", number(element, "ry"))
+            return cx - rx, cy - ry, cx + rx, cy + ry
+        if name == "line":
+            xs, ys = (number(element, "x1"), number(element, "x2")), (number(element, "y1"), number(element, "y2"))
+            return min(xs), min(ys), max(xs), max(ys)
+        if name in ("polyline", "polygon"):
+            values = [float(value) for value in NUMBER_PATTERN.findall(element.get("points", ""))]
+            if len(values) < 2:
+                return None
+            return min(values[0::2]), min(values[1::2]), max(values[0::2]), max(values[1::2])
+        if name == "text":
+            # No font metrics here: an average glyph is 0.6 em wide
+            characters = len("".join(element.itertext()).strip())
+            x, y = number(element, "x"), number(element, "y")
+            return x, y - size, x + max(characters, 1) * 0.6 * size, y + 0.25 * size
+        if name == "use":
+            href = element.get(XLINK_HREF) or element.get("href") or ""
+            box = self.reference_box(href[1:], size)
+            if box is None:
+                return None
+            x, y = number(element, "x"), number(element, "y")
+            return box[0] + x, box[1] + y, box[2] + x, box[3] + y
+        return None
+
+    def reference_box(self, element_id, size):
+        """Box of the element a <use> draws, in the user space of the <use>."""
+        if element_id not in self.reference_boxes:
+            # Guard against a <use> referring to itself
+            self.reference_boxes[element_id] = None
+            element = self.ids.get(element_id)
+            boxes = []
+            if element is not None:
+                for descendant_box in self.element_boxes(element, IDENTITY_AFFINE, size):
+                    boxes.append(descendant_box)
+            self.reference_boxes[element_id] = union_boxes(boxes) if boxes else None
+        return self.reference_boxes[element_id]
+
+    def element_boxes(self, element, matrix, size):
+        """Boxes of the shapes of an element and its descendants, transformed by matrix."""
+        if element.get("transform"):
+            matrix = multiply_affine(matrix, parse_affine(element.get("transform")))
+        size = font_size(element, size)
+        name = element.tag.rsplit("}", 1)[-1]
+        if name in SHAPE_TAGS:
+            box = self.local_box(element, size)
+            if box is not None:
+                yield transform_box(matrix, box)
+            return
+        for child in element:
+            if child.tag.rsplit("}", 1)[-1] not in RESOURCE_TAGS:
+                yield from self.element_boxes(child, matrix, size)
+
+    def collect_leaves(self, element, path, matrix, size):
+        """Fill self.leaves with the shapes drawn by the page, boxes in page user units."""
+        for position, child in enumerate(element):
+            name = child.tag.rsplit("}", 1)[-1]
+            if name in RESOURCE_TAGS:
+                continue
+            child_matrix = matrix
+            if child.get("transform"):
+                child_matrix = multiply_affine(matrix, parse_affine(child.get("transform")))
+            child_size = font_size(child, size)
+            if name in SHAPE_TAGS:
+                box = self.local_box(child, child_size)
+                if box is not None:
+                    self.leaves.append((path + (position,), transform_box(child_matrix, box)))
+            else:
+                self.collect_leaves(child, path + (position,), child_matrix, child_size)
+
+    def group_leaves(self):
+        """Join neighbouring leaves into fragments, with a union-find over a grid index."""
+        _, _, width, height = self.view_box
+        gap_x, gap_y = HORIZONTAL_GAP * self.glyph_height / 2, VERTICAL_GAP * self.glyph_height / 2
+        leaves = [(path, box) for path, box in self.leaves
+                  if (box[2] - box[0]) * (box[3] - box[1]) < BACKGROUND_SHARE * width * height]
+        grown = [(x0 - gap_x, y0 - gap_y, x1 + gap_x, y1 + gap_y) for _, (x0, y0, x1, y1) in leaves]
+        parents = list(range(len(leaves)))
+
+        def find(item):
+            while parents[item] != item:
+                parents[item] = parents[parents[item]]
+                item = parents[item]
+            return item
+
+        index = GridIndex(self.cell_size(2))
+        for item, box in enumerate(grown):
+            for other in index.query(box):
+                other_box = grown[other]
+                if box[0] <= other_box[2] and other_box[0] <= box[2] and box[1] <= other_box[3] \
+                        and other_box[1] <= box[3]:
+                    parents[find(item)] = find(other)
+            index.insert(item, box)
+
+        groups = {}
+        for item in range(len(leaves)):
+            groups.setdefault(find(item), []).append(item)
+        fragments = []
+        # Reading order: top to bottom, then left to right
+        boxes = {root: union_boxes([leaves[item][1] for item in items]) for root, items in groups.items()}
+        for root in sorted(groups, key=lambda root: (boxes[root][1], boxes[root][0])):
+            items = groups[root]
+            fragments.append(SvgFragment(len(fragments), boxes[root], [leaves[item][0] for item in items],
+                                         self.fragment_kind(boxes[root], [leaves[item][1] for item in items])))
+        return fragments
+
+    def fragment_kind(self, box, leaf_boxes):
+        """"text", "equation" or "figure", from the sizes of the shapes."""
+        glyph_like = sum(1 for x0, y0, x1, y1 in leaf_boxes
+                         if max(x1 - x0, y1 - y0) <= 2 * self.glyph_height)
+        if len(leaf_boxes) < 2 or glyph_like < 0.8 * len(leaf_boxes):
+            return "figure"
+        return "text" if box[3] - box[1] <= 1.8 * self.glyph_height else "equation"
+
+    def fragments_at(self, x, y):
+        """Fragments containing the point, smallest first."""
+        found = [self.fragments[index] for index in self.index.query((x, y, x, y))
+                 if self.fragments[index].box[0] <= x <= self.fragments[index].box[2]
+                 and self.fragments[index].box[1] <= y <= self.fragments[index].box[3]]
+        return sorted(found, key=lambda fragment: fragment.rect[2] * fragment.rect[3])
+
+    def fragments_in(self, box):
+        """Fragments intersecting box, in index order."""
+        x0, y0, x1, y1 = box
+        found = [self.fragments[index] for index in self.index.query(box)]
+        return sorted((fragment for fragment in found
+                       if fragment.box[0] <= x1 and x0 <= fragment.box[2]
+                       and fragment.box[1] <= y1 and y0 <= fragment.box[3]),
+                      key=lambda fragment: fragment.index)
+
+    def fragment_tree(self, fragment):
+        """Copy of the page with only the fragment's shapes, their groups and every resource."""
+        kept = set()
+        for leaf in fragment.leaves:
+            kept.update(leaf[:length] for length in range(1, len(leaf) + 1))
+        leaves = set(fragment.leaves)
+
+        def copy(element, path):
+            clone = ET.Element(element.tag, element.attrib)
+            clone.text = element.text
+            for position, child in enumerate(element):
+                child_path = path + (position,)
+                if child_path in leaves or child.tag.rsplit("}", 1)[-1] in RESOURCE_TAGS:
+                    clone.append(child)  # Shared with the page, the tree is only written
+                elif child_path in kept:
+                    clone.append(copy(child, child_path))
+            return clone
+
+        return ET.ElementTree(copy(self.root, ()))
+
+    def fragment_view_box(self, fragment):
+        """(x, y, width, height) shown by the document of a fragment: its box and a margin."""
+        margin = FRAGMENT_MARGIN * self.glyph_height
+        x, y, width, height = fragment.rect
+        return x - margin, y - margin, width + 2 * margin, height + 2 * margin
+
+    def write_fragment(self, fragment, output_path):
+        """
+        Write a fragment as an SVG document of its own.
+
+        Unused resources are dropped by svg_minify; the viewBox frames the
+        fragment with a small margin. The document is built in a temporary
+        file next to output_path, which only appears once every step succeeded.
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        fd, temp_path = tempfile.mkstemp(suffix=".svg", dir=os.path.dirname(os.path.abspath(output_path)))
+        os.close(fd)
+        try:
+            write_svg_tree(self.fragment_tree(fragment), temp_path)
+            if (write_cropped_svg(temp_path, self.fragment_view_box(fragment), temp_path)
+                    and minify_svg_file(temp_path, temp_path) is not None):
+                os.replace(temp_path, output_path)
+                return True
+            return False
+        except OSError as e:
+            print(f"Error writing fragment {fragment.index} of {self.svg_path}: {e}")
+            return False
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def fragment_file(self, fragment, output_dir=None):
+        """
+        Path of the SVG document of a fragment, written once in output_dir
+        (the "fragments" cache directory by default).
+
+        Returns:
+            str: The path, or None if it could not be written
+        """
+        if self.digest is None:
+            self.digest = hash_file(self.svg_path)
+        output_dir = output_dir or get_cache_directory("fragments")
+        output_path = os.path.join(output_dir,
+                                   f"{self.digest[:32]}_v{ALGORITHM_VERSION}_{fragment.index:03d}.svg")
+        if os.path.exists(output_path) or self.write_fragment(fragment, output_path):
+            return output_path
+        return None
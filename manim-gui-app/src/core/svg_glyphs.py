@@ -0,0 +1,215 @@
+import itertools
+import math
+import os
+import time
+import xml.etree.ElementTree as ET
+import numpy as np
+from src.core.svg_crop import NAMESPACES, write_svg_tree
+from src.core.svg_simplify import (SVG_NS, DEFAULT_TOLERANCE_PX, parse_path, parse_transform, max_stretch,
+                                   document_matrix, format_path, format_numbers, decimals_for)
+
+XLINK_HREF = "{%s}href" % NAMESPACES["xlink"]
+# Subtrees not drawn where they are: their paths are left alone
+RESOURCE_TAGS = {SVG_NS + tag for tag in ("defs", "clipPath", "mask", "marker", "pattern", "symbol")}
+# Width of the bins of the shape features (aspect ratio, start point) compared first
+BIN_WIDTH = 0.05
+# Distinct shapes compared per bin, beyond that new shapes are never merged
+MAX_SHAPES_PER_BIN = 64
+# Shorter paths take less room than the <use> replacing them
+MIN_PATH_LENGTH = 48
+GLYPH_ID_PREFIX = "glyph"
+# Properties whose effect a scaled <use> would scale too: stroke width, user space of clips,
+# masks, filters and userSpaceOnUse paint servers
+SCALED_PROPERTIES = ("clip-path", "mask", "filter")
+
+
+def presentation(element, name):
+    """Value of a presentation property set on the element, in its style or as an attribute."""
+    for declaration in element.get("style", "").split(";"):
+        key, _, value = declaration.partition(":")
+        if key.strip() == name:
+            return value.strip()
+    return element.get(name)
+
+
+def iter_rendered_paths(element, matrix, paint=(None, None)):
+    """
+    Yield (path element, transform to pixels, scalable) for every path drawn where it is.
+
+    scalable is False when drawing the path at another scale would also
+    change its stroke width or the user space of a paint server, clip,
+    mask or filter; fill and stroke are followed down from the ancestors.
+    """
+    matrix = matrix @ parse_transform(element.get("transform"))
+    fill, stroke = (presentation(element, "fill") or paint[0], presentation(element, "stroke") or paint[1])
+    if element.tag == SVG_NS + "path":
+        scalable = (stroke in (None, "none") and not (fill or "").startswith("url(")
+                    and not any(presentation(element, name) not in (None, "none") for name in SCALED_PROPERTIES))
+        yield element, matrix, scalable
+    for child in element:
+        if child.tag not in RESOURCE_TAGS:
+            yield from iter_rendered_paths(child, matrix, (fill, stroke))
+
+
+def normalized_shape(subpaths):
+    """
+    Return (structure, origin, size, points) of a parsed path.
+
+    points are all the coordinates of the path, with the corner of their
+    bounding box moved to the origin and divided by size, the largest side
+    of that box. Two paths equal up to a translation and a uniform scale
+    have the same structure and points.
+    """
+    structure = []
+    arrays = []
+    for subpath in subpaths:
+        structure.append((subpath.closed, tuple((kind, len(array)) for kind, array in subpath.runs)))
+        arrays.append(subpath.start.reshape(1, 2))
+        arrays.extend(array.reshape(-1, 2) for _, array in subpath.runs)
+    points = np.concatenate(arrays)
+    origin = points.min(axis=0)
+    size = float((points.max(axis=0) - origin).max())
+    if size == 0:
+        return None
+    return tuple(structure), origin, size, (points - origin) / size
+
+
+def rebuild_subpaths(subpaths, points):
+    """Put points, in the order of normalized_shape, back into the subpaths."""
+    index = 0
+    for subpath in subpaths:
+        subpath.start = points[index]
+        index += 1
+        for run in subpath.runs:
+            count = run[1].size // 2
+            run[1] = points[index:index + count].reshape(run[1].shape)
+            index += count
+    return subpaths
+
+
+def shape_bins(structure, points):
+    """Bin of a normalized shape and the neighbouring ones, where a shape within tolerance can be."""
+    extent = points.max(axis=0)
+    features = (extent[0] - extent[1], points[0, 0], points[0, 1])
+    center = tuple(math.floor(value / BIN_WIDTH) for value in features)
+    neighbours = (tuple(bin + offset for bin, offset in zip(center, offsets))
+                  for offsets in itertools.product((0, -1, 1), repeat=3))
+    return (structure, center), [(structure, bin) for bin in neighbours]
+
+
+def same_size(size, other_size, tolerance):
+    """True if drawing a shape of other_size at size moves no point by more than a tenth of tolerance."""
+    return abs(size - other_size) <= tolerance / 10
+
+
+def deduplicate_paths(root, tolerance_px=DEFAULT_TOLERANCE_PX, scale=1.0):
+    """
+    Replace repeated shapes of a parsed SVG document by <use> of one definition.
+
+    Text converted to paths repeats the outline of each glyph at every
+    occurrence. Paths equal up to a translation and a uniform scale are
+    found through a hash of their commands and of coarse features of their
+    normalized points, then compared point by point; each shape drawn at
+    least twice is written once in <defs> and its occurrences become <use>
+    elements keeping their own attributes (fill, stroke...), which the
+    definition inherits. Instances differing from the definition by more
+    than tolerance_px (pixels at the natural size times scale) are not
+    merged. Copies at another scale are drawn with a scaled <use>, which
+    would scale their stroke and the user space of their clip, mask or
+    paint server: those copies are only merged at the size of the
+    definition.
+
+    QSvgRenderer in Qt 5 ignores <symbol>, so the definitions are plain
+    paths in <defs>.
+
+    Returns:
+        dict: compared_paths, shapes (distinct shapes drawn several times), uses
+    """
+    # (structure, feature bin) -> list of [points, size, members]; the subpaths of a shape are
+    # parsed again from its first member when it is defined, rather than kept for every shape
+    bins = {}
+    compared = 0
+    for element, matrix, scalable in iter_rendered_paths(root, document_matrix(root)):
+        d = element.get("d", "")
+        if len(d) < MIN_PATH_LENGTH or element.get("id") is not None:
+            continue
+        subpaths = parse_path(d)
+        if not subpaths:
+            continue
+        shape = normalized_shape(subpaths)
+        if shape is None:
+            continue
+        compared += 1
+        structure, origin, size, points = shape
+        tolerance = tolerance_px / (scale * max_stretch(matrix))
+        member = (element, origin, size, tolerance)
+        key, neighbours = shape_bins(structure, points)
+        for group in (group for bin in neighbours for group in bins.get(bin, ())):
+            if not scalable and not same_size(size, group[1], tolerance):
+                continue
+            if np.abs(group[0] - points).max() * size <= tolerance:
+                group[2].append(member)
+                break
+        else:
+            candidates = bins.setdefault(key, [])
+            if len(candidates) < MAX_SHAPES_PER_BIN:
+                candidates.append([points, size, [member]])
+
+    defs = None
+    shapes = uses = 0
+    for candidates in bins.values():
+        for points, size, members in candidates:
+            if len(members) < 2:
+                continue
+            subpaths = parse_path(members[0][0].get("d"))
+            if defs is None:
+                defs = ET.Element(SVG_NS + "defs")
+                root.insert(0, defs)
+            shape_id = f"{GLYPH_ID_PREFIX}{shapes}"
+            shapes += 1
+            decimals = decimals_for(min(tolerance for _, _, _, tolerance in members))
+            ET.SubElement(defs, SVG_NS + "path", {
+                "id": shape_id, "d": format_path(rebuild_subpaths(subpaths, points * size), decimals)})
+            for element, origin, member_size, tolerance in members:
+                # The path becomes the <use>, at its place in the drawing order
+                element.tag = SVG_NS + "use"
+                del element.attrib["d"]
+                element.set(XLINK_HREF, "#" + shape_id)
+                ratio = member_size / size
+                decimals = decimals_for(tolerance)
+                if same_size(member_size, size, tolerance):
+                    # x and y apply after the transform of the <use>, which the path had
+                    x, y = format_numbers(origin, decimals).split()
+                    element.set("x", x)
+                    element.set("y", y)
+                else:
+                    placement = (f"matrix({ratio:.6g} 0 0 {ratio:.6g} "
+                                 f"{format_numbers(origin, decimals)})")
+                    transform = element.get("transform")
+                    element.set("transform", f"{transform} {placement}" if transform else placement)
+                uses += 1
+    return {"compared_paths": compared, "shapes": shapes, "uses": uses}
+
+
+def deduplicate_svg_file(svg_path, output_path, tolerance_px=DEFAULT_TOLERANCE_PX, scale=1.0):
+    """
+    Write a copy of an SVG file with repeated shapes defined once, see deduplicate_paths.
+
+    Returns:
+        dict: The report of deduplicate_paths plus bytes_before, bytes_after
+            and seconds, or None if the file could not be processed
+    """
+    start = time.perf_counter()
+    try:
+        bytes_before = os.path.getsize(svg_path)
+        for prefix, uri in NAMESPACES.items():
+            ET.register_namespace(prefix, uri)
+        tree = ET.parse(svg_path)
+        report = deduplicate_paths(tree.getroot(), tolerance_px, scale)
+        write_svg_tree(tree, output_path)
+        report.update(bytes_before=bytes_before, bytes_after=os.path.getsize(output_path),
+                      seconds=time.perf_counter() - start)
+        return report
+    except (OSError, ET.ParseError, ValueError) as e:
+        print(f"Error deduplicating {svg_path}: {e}")
+        return None
@@ -0,0 +1,113 @@
+import os
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from src.core.svg_crop import NAMESPACES, write_svg_tree
+from src.core.svg_simplify import DEFAULT_TOLERANCE_PX, simplify_svg_tree
+from src.core.svg_minify import minify_svg_file
+from src.core.svg_glyphs import deduplicate_paths
+from src.utils.file_utils import get_cache_directory, hash_file
+
+ALGORITHM_VERSION = "3"  # Change it when the output changes, to invalidate ingested files
+# Share of the tolerance given to the steps outside svg_simplify, which has CURVE_SHARE and
+# POLYLINE_SHARE; deduplicated shapes also carry the rounding of their definition and placement
+MINIFY_SHARE = 0.02
+DEDUPLICATE_SHARE = 0.08
+NO_GAIN_SUFFIX = ".nogain"  # Marker of the sources the ingest stage cannot reduce
+
+
+def format_report(report):
+    """One line summary of an ingest report."""
+    elements = ""
+    if "elements_before" in report:
+        elements = f"{report['elements_before']:,} -> {report['elements_after']:,} elements, "
+    shapes = ""
+    if report.get("uses"):
+        shapes = f"{report['uses']:,} paths drawn from {report['shapes']:,} shapes, "
+    return (f"{elements}{report['nodes_before']:,} -> {report['nodes_after']:,} nodes, {shapes}"
+            f"{report['bytes_before'] / 1024:,.0f} -> {report['bytes_after'] / 1024:,.0f} KB "
+            f"(tolerance {report['tolerance_px']} px, {report['seconds']:.2f} s)")
+
+
+def ingest_svg(svg_path, output_dir=None, tolerance_px=DEFAULT_TOLERANCE_PX, scale=1.0):
+    """
+    Ingest stage for SVGs inserted in a slide: return the path to use.
+
+    The document goes through three steps:
+    - svg_minify: unused resources, editor data and trivial groups are
+      removed, in a streaming pass whose memory does not grow with the file;
+    - svg_simplify: flat curves become lines and dense polylines are reduced;
+    - svg_glyphs: shapes drawn several times, like the glyphs of text
+      converted to paths, are defined once and drawn with <use>.
+    The last two steps share one parsed document, which sets the peak
+    memory: minifying first makes it smaller, and both steps add little to
+    it. On a 65 MB page, the whole ingest peaks at about 330 MB, 200 MB
+    of which is the parsed document, and takes under three minutes.
+    The result is written once to output_dir (the "ingest" cache
+    directory by default), named after the content hash of the source and
+    the tolerance, and reused afterwards. The source file is never
+    modified and is returned as is when the ingest stage gains nothing;
+    an empty marker file with the same name then records it, so the
+    pipeline is not run again on that content.
+
+    Args:
+        svg_path (str): SVG file inserted
+        output_dir (str, optional): Where ingested files are written
+        tolerance_px (float): Largest visual error, in pixels
+        scale (float): Zoom at which tolerance_px applies, relative to the natural size
+
+    Returns:
+        tuple: (path, report); report is None when an earlier copy is reused
+            or the file could not be processed
+    """
+    try:
+        digest = hash_file(svg_path)
+    except OSError as e:
+        print(f"Error reading {svg_path}: {e}")
+        return svg_path, None
+    output_dir = output_dir or get_cache_directory("ingest")
+    name = f"{digest[:32]}_v{ALGORITHM_VERSION}_{tolerance_px * scale:g}px.svg"
+    output_path = os.path.join(output_dir, name)
+    no_gain_path = output_path + NO_GAIN_SUFFIX
+    if os.path.exists(output_path):
+        return output_path, None
+    if os.path.exists(no_gain_path):
+        return svg_path, None
+
+    start = time.perf_counter()
+    # The steps run on a temporary file: output_path only ever holds a complete result
+    try:
+        fd, temp_path = tempfile.mkstemp(suffix=".svg", dir=output_dir)
+        os.close(fd)
+    except OSError as e:
+        print(f"Error ingesting {svg_path}: {e}")
+        return svg_path, None
+    try:
+        report = minify_svg_file(svg_path, temp_path, MINIFY_SHARE * tolerance_px / scale)
+        if report is None:
+            return svg_path, None
+        try:
+            for prefix, uri in NAMESPACES.items():
+                ET.register_namespace(prefix, uri)
+            tree = ET.parse(temp_path)
+            report.update(simplify_svg_tree(tree.getroot(), tolerance_px, scale))
+            report.update(deduplicate_paths(tree.getroot(), DEDUPLICATE_SHARE * tolerance_px, scale))
+            write_svg_tree(tree, temp_path)
+            report.update(bytes_after=os.path.getsize(temp_path), tolerance_px=tolerance_px,
+                          seconds=time.perf_counter() - start)
+            if report["bytes_after"] < report["bytes_before"]:
+                os.replace(temp_path, output_path)
+                return output_path, report
+        except (OSError, ET.ParseError, ValueError) as e:
+            print(f"Error ingesting {svg_path}: {e}")
+            return svg_path, None
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    # Nothing gained: keep using the original, and remember it
+    try:
+        open(no_gain_path, "w").close()
+    except OSError as e:
+        print(f"Error writing {no_gain_path}: {e}")
+    return svg_path, report
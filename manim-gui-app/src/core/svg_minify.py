@@ -0,0 +1,456 @@
+import math
+import os
+import re
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from src.core.svg_crop import NAMESPACES
+from src.core.svg_simplify import (COMMAND_PATTERN, NUMBER_PATTERN, IDENTITY_AFFINE, multiply_affine,
+                                   parse_affine, document_matrix)
+
+SVG_URI = NAMESPACES[""]
+XLINK_HREF = "{%s}href" % NAMESPACES["xlink"]
+XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+URL_PATTERN = re.compile(r"url\(\s*['\"]?#([^)'\"\s]+)")
+# Editor data: never rendered, dropped with the elements and attributes using it
+EDITOR_URIS = {NAMESPACES["inkscape"], NAMESPACES["sodipodi"]}
+# Elements drawn only when referenced; top-level children of <defs> are treated the same way
+RESOURCE_TAGS = {"clipPath", "mask", "marker", "pattern", "linearGradient", "radialGradient", "filter",
+                 "symbol", "font", "font-face", "cursor"}
+# Resources applied in the user space of the element using them, rounded like it
+ROUNDED_RESOURCE_TAGS = {"clipPath", "mask"}
+DROPPED_TAGS = {"metadata"}
+TEXT_TAGS = {"text", "tspan", "textPath", "title", "desc", "style", "script"}
+COORDINATE_ATTRIBUTES = {"x", "y", "x1", "y1", "x2", "y2", "cx", "cy", "r", "rx", "ry", "width", "height",
+                         "points"}
+# Values of those attributes in user units only: lengths with a unit or a percentage are left as written
+NUMBER_LIST_PATTERN = re.compile(r"\s*{0}(?:\s*,?\s*{0})*\s*".format(NUMBER_PATTERN.pattern))
+
+DEFAULT_PRECISION_PX = 0.01
+
+
+def local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def tag_uri(tag):
+    return tag[1:tag.index("}")] if tag.startswith("{") else ""
+
+
+def references(element):
+    """Ids an element refers to, through href or url(#id) in any attribute."""
+    found = []
+    for name, value in element.attrib.items():
+        if name in (XLINK_HREF, "href") and value.startswith("#"):
+            found.append(value[1:])
+        elif "url(" in value:
+            found.extend(URL_PATTERN.findall(value))
+    return found
+
+
+def rounding_decimals(max_error):
+    """Decimals moving a point by at most max_error once both coordinates are rounded."""
+    return min(8, max(0, math.ceil(math.log10(math.sqrt(2) / 2 / max_error))))
+
+
+def affine_stretch(matrix):
+    """Largest factor by which an (a, b, c, d, e, f) transform can stretch a distance."""
+    a, b, c, d = matrix[:4]
+    squares, determinant = a * a + b * b + c * c + d * d, a * d - b * c
+    return math.sqrt((squares + math.sqrt(max(squares * squares - 4 * determinant * determinant, 0.0))) / 2) or 1.0
+
+
+def round_numbers(text, decimals):
+    """The numbers of text, space separated, rounded to decimals without trailing zeros."""
+    numbers = []
+    template = f"%.{decimals}f"
+    for number in NUMBER_PATTERN.findall(text):
+        number = template % float(number)
+        if decimals:
+            number = number.rstrip("0").rstrip(".")
+        numbers.append("0" if number == "-0" else number)
+    return " ".join(numbers)
+
+
+def round_path_data(d, decimals):
+    """Path data with rounded coordinates; None for arcs, whose flags may not be separated."""
+    if "a" in d or "A" in d:
+        return None
+    return "".join(letter + round_numbers(args, decimals) for letter, args in COMMAND_PATTERN.findall(d))
+
+
+def is_identity(matrix):
+    return all(abs(value - identity) <= 1e-12 for value, identity in zip(matrix, IDENTITY_AFFINE))
+
+
+def escape_text(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def escape_attribute(value):
+    return (escape_text(value).replace('"', "&quot;")
+            .replace("\n", "&#10;").replace("\r", "&#13;").replace("\t", "&#9;"))
+
+
+class ReferenceScan:
+    """
+    What the first pass learns about a document.
+
+    An "owner" is a resource: a top-level child of <defs> or an element of
+    RESOURCE_TAGS. It is kept only if something rendered refers to it,
+    directly or through other kept owners. Identical clip paths are aliased
+    to the first one.
+    """
+
+    def __init__(self):
+        self.namespaces = {}  # uri -> prefix
+        self.id_owner = {}  # id inside a resource -> id of its owner ("" for owners without id)
+        self.edges = {None: set()}  # owner id (None: rendered content) -> ids referred to
+        self.aliases = {}  # id of a duplicate clip path -> id of the one kept
+        self.elements = 0
+        self.has_stylesheet = False
+        self.kept_owners = set()
+        self.referenced = set()
+
+    def resolve(self):
+        """Compute kept_owners and referenced once the document is scanned."""
+        pending = [self.aliases.get(ref, ref) for ref in self.edges[None]]
+        while pending:
+            ref = pending.pop()
+            if ref in self.referenced:
+                continue
+            self.referenced.add(ref)
+            owner = self.id_owner.get(ref)
+            if owner and owner not in self.kept_owners:
+                self.kept_owners.add(owner)
+                pending.extend(self.aliases.get(next_ref, next_ref) for next_ref in self.edges.get(owner, ()))
+
+
+class SvgMinifier:
+    """
+    Streaming garbage collection and minification of SVG files.
+
+    Two passes of iterparse, each holding only the open elements:
+    the first collects ids and references, the second writes the document
+    again without
+    - resources nobody refers to, and clip paths identical to an earlier one,
+    - editor data (inkscape: and sodipodi: namespaces, <metadata>),
+    - ids nobody refers to and identity transforms,
+    - groups left without attributes (their children move up) and empty groups,
+    - indentation outside text elements,
+    with coordinates rounded so no point moves by more than precision_px
+    pixels at the natural size of the document. Time and memory are linear
+    in the file size, memory only in its depth.
+    """
+
+    def __init__(self, precision_px=DEFAULT_PRECISION_PX, keep_ids=False):
+        self.precision_px = precision_px
+        self.keep_ids = keep_ids
+
+    @staticmethod
+    def owner_of(element, parent_tag, current_owner):
+        """
+        Return (starts an owner, owner id) for an element.
+
+        The owner id of an element without id is "", which nothing can
+        refer to.
+        """
+        if current_owner is not None:
+            return False, current_owner
+        if parent_tag == "defs" or local_name(element.tag) in RESOURCE_TAGS:
+            return True, element.get("id", "")
+        return False, None
+
+    def scan(self, svg_path):
+        """First pass: ids, references, namespaces and duplicate clip paths."""
+        scan = ReferenceScan()
+        stack = []  # (element, local name, owner id)
+        clip_signatures = {}  # signature -> id of the first clip path
+        clip = None  # [id, depth, signature parts, inner ids] of the clip path being read
+        duplicates = []  # (id, id of the identical clip path, inner ids)
+        for event, item in ET.iterparse(svg_path, events=("start", "end", "start-ns")):
+            if event == "start-ns":
+                prefix, uri = item
+                scan.namespaces.setdefault(uri, prefix)
+                continue
+            element = item
+            if event == "start":
+                scan.elements += 1
+                name = local_name(element.tag)
+                parent_tag, current_owner = (stack[-1][1], stack[-1][2]) if stack else (None, None)
+                starts_owner, owner = self.owner_of(element, parent_tag, current_owner)
+                element_id = element.get("id")
+                if element_id is not None and owner is not None:
+                    scan.id_owner[element_id] = owner
+                refs = references(element)
+                if refs:
+                    scan.edges.setdefault(owner, set()).update(refs)
+                if name in ("style", "script"):
+                    scan.has_stylesheet = True
+                if starts_owner and name == "clipPath" and owner:
+                    clip = [owner, len(stack), [], []]
+                if clip is not None:
+                    clip[2].append((element.tag, tuple(sorted((key, value) for key, value in element.attrib.items()
+                                                              if key != "id"))))
+                    if element_id is not None and element_id != clip[0]:
+                        clip[3].append(element_id)
+                stack.append((element, name, owner))
+            else:
+                stack.pop()
+                if clip is not None:
+                    clip[2].append(("/", (element.text or "").strip()))
+                    if len(stack) == clip[1]:
+                        signature = tuple(clip[2])
+                        if signature in clip_signatures:
+                            duplicates.append((clip[0], clip_signatures[signature], clip[3]))
+                        else:
+                            clip_signatures[signature] = clip[0]
+                        clip = None
+                # Only the open elements are kept in memory
+                element.clear()
+                if stack:
+                    del stack[-1][0][:]
+
+        all_refs = set().union(*scan.edges.values())
+        for duplicate, kept, inner_ids in duplicates:
+            # A duplicate whose inner elements are used on their own stays
+            if not any(inner_id in all_refs for inner_id in inner_ids):
+                scan.aliases[duplicate] = kept
+        scan.resolve()
+        return scan
+
+    def minify(self, svg_path, output_path):
+        """
+        Write a minified copy of svg_path to output_path (may be svg_path).
+
+        Returns:
+            dict: bytes_before, bytes_after, elements_before, elements_after,
+                resources_removed, groups_flattened, seconds
+        """
+        start = time.perf_counter()
+        bytes_before = os.path.getsize(svg_path)
+        scan = self.scan(svg_path)
+        fd, temp_path = tempfile.mkstemp(suffix=".svg", dir=os.path.dirname(os.path.abspath(output_path)))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as output:
+                report = self.write(svg_path, scan, output)
+            os.replace(temp_path, output_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        report.update(bytes_before=bytes_before, bytes_after=os.path.getsize(output_path),
+                      elements_before=scan.elements, seconds=time.perf_counter() - start)
+        return report
+
+    def prefixes(self, scan):
+        """uri -> prefix used in the output, unique, the SVG namespace as the default one."""
+        prefixes = {SVG_URI: ""}
+        used = {""}
+        for uri, prefix in scan.namespaces.items():
+            if uri in prefixes or uri in EDITOR_URIS:
+                continue
+            if not prefix or prefix in used:
+                prefix = f"ns{len(used)}"
+            prefixes[uri] = prefix
+            used.add(prefix)
+        return prefixes
+
+    @staticmethod
+    def qualified_name(name, prefixes, names):
+        """Prefixed name of a {uri}local tag or attribute, memoized in names."""
+        if name in names:
+            return names[name]
+        qualified = name
+        if name.startswith("{"):
+            uri, local = name[1:].split("}", 1)
+            if uri == "http://www.w3.org/XML/1998/namespace":
+                qualified = "xml:" + local
+            else:
+                prefix = prefixes.get(uri)
+                qualified = f"{prefix}:{local}" if prefix else local
+        names[name] = qualified
+        return qualified
+
+    def clean_attributes(self, element, name, scan, decimals, transform):
+        """(name, value) of the attributes written, cleaned; decimals None leaves numbers as they are."""
+        attributes = []
+        for key, value in element.attrib.items():
+            if key.startswith("{") and tag_uri(key) in EDITOR_URIS:
+                continue
+            if key == "id" and not self.keep_ids and not scan.has_stylesheet and value not in scan.referenced:
+                continue
+            if key == "transform" and is_identity(transform):
+                continue
+            if key == "style" and not value.strip():
+                continue
+            if decimals is not None:
+                if key == "d":
+                    value = round_path_data(value, decimals) or value
+                elif key in COORDINATE_ATTRIBUTES and name != "svg" and NUMBER_LIST_PATTERN.fullmatch(value):
+                    value = round_numbers(value, decimals)
+            if scan.aliases and "url(" in value:
+                value = URL_PATTERN.sub(lambda match: "url(#" + scan.aliases.get(match.group(1), match.group(1)),
+                                        value)
+            elif scan.aliases and key in (XLINK_HREF, "href") and value[1:] in scan.aliases:
+                value = "#" + scan.aliases[value[1:]]
+            attributes.append((key, value))
+        return attributes
+
+    def write(self, svg_path, scan, output):
+        """Second pass: write the document, see the class docstring for what is left out."""
+        prefixes = self.prefixes(scan)
+        names = {}
+        output.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        # Open elements: dict with element, name, qualified name, open tag text, emitted, mode
+        stack = []
+        skip_depth = 0
+        last_closed = None  # Element whose tail is written once known
+        elements_after = resources_removed = groups_flattened = 0
+
+        def emit_open(index):
+            """Write the open tags not written yet, up to stack[index]."""
+            first = index
+            while first > 0 and not stack[first - 1]["emitted"]:
+                first -= 1
+            for entry in stack[first:index + 1]:
+                if not entry["emitted"]:
+                    entry["emitted"] = True
+                    if entry["mode"] != "unwrap":
+                        output.write(entry["open"] + ">")
+                        write_text(entry["element"].text, entry)
+
+        def write_text(text, entry):
+            if not text:
+                return
+            if entry["preserve"] or text.strip():
+                output.write(escape_text(text if entry["preserve"] else text.strip()))
+
+        def flush_tail(parent_index):
+            """Write the tail of the last closed child and release it: only open elements stay in memory."""
+            nonlocal last_closed
+            if last_closed is None:
+                return
+            element, last_closed = last_closed, None
+            tail = element.tail
+            element.clear()
+            if parent_index < 0:
+                return
+            parent = stack[parent_index]
+            del parent["element"][:]
+            if tail and (parent["preserve"] or tail.strip()):
+                emit_open(parent_index)
+                write_text(tail, parent)
+
+        for event, element in ET.iterparse(svg_path, events=("start", "end")):
+            if event == "start":
+                flush_tail(len(stack) - 1)
+                if skip_depth:
+                    skip_depth += 1
+                    continue
+                name = local_name(element.tag)
+                parent = stack[-1] if stack else None
+                starts_owner, owner = self.owner_of(element, parent["name"] if parent else None,
+                                                    parent["owner"] if parent else None)
+                dropped = (tag_uri(element.tag) in EDITOR_URIS or name in DROPPED_TAGS
+                           or starts_owner and not scan.has_stylesheet
+                           and (owner not in scan.kept_owners or owner in scan.aliases))
+                if dropped:
+                    if starts_owner:
+                        resources_removed += 1
+                    skip_depth = 1
+                    continue
+
+                if parent is None:
+                    root = document_matrix(element)
+                    matrix = (root[0, 0], root[1, 0], root[0, 1], root[1, 1], root[0, 2], root[1, 2])
+                else:
+                    matrix = parent["matrix"]
+                rounded = (owner is None or starts_owner and name in ROUNDED_RESOURCE_TAGS
+                           or not starts_owner and parent["rounded"])
+                transform = parse_affine(element.get("transform")) if "transform" in element.attrib else None
+                if parent is None or transform is not None or rounded and not parent["rounded"]:
+                    matrix = multiply_affine(matrix, transform or IDENTITY_AFFINE)
+                    decimals = rounding_decimals(self.precision_px / affine_stretch(matrix))
+                else:
+                    decimals = parent["decimals"]
+                attributes = self.clean_attributes(element, name, scan, decimals if rounded else None, transform)
+
+                mode = "keep"
+                if name == "g" and not attributes and not (parent and parent["preserve"]):
+                    mode = "unwrap"
+                    groups_flattened += 1
+                elif name in ("g", "defs") and all(key != "id" for key, _ in attributes):
+                    mode = "optional"  # Left out if it ends up empty
+                qualified = self.qualified_name(element.tag, prefixes, names)
+                open_tag = "<" + qualified
+                if parent is None:
+                    for uri, prefix in prefixes.items():
+                        if uri in scan.namespaces or uri == SVG_URI:
+                            open_tag += f' xmlns{":" + prefix if prefix else ""}="{escape_attribute(uri)}"'
+                for key, value in attributes:
+                    open_tag += f' {self.qualified_name(key, prefixes, names)}="{escape_attribute(value)}"'
+                preserve = name in TEXT_TAGS or element.get(XML_SPACE) == "preserve" \
+                    or bool(parent and parent["preserve"])
+                stack.append({"element": element, "name": name, "qualified": qualified, "open": open_tag,
+                              "emitted": False, "mode": mode, "preserve": preserve, "owner": owner,
+                              "rounded": rounded, "matrix": matrix, "decimals": decimals})
+            else:
+                if skip_depth:
+                    skip_depth -= 1
+                    if skip_depth == 0:
+                        last_closed = element
+                    else:
+                        element.clear()
+                    continue
+                flush_tail(len(stack) - 1)
+                entry = stack.pop()
+                if entry["mode"] == "unwrap":
+                    pass
+                elif entry["emitted"]:
+                    output.write(f"</{entry['qualified']}>")
+                    elements_after += 1
+                else:
+                    text = element.text
+                    has_text = bool(text and (entry["preserve"] or text.strip()))
+                    if has_text or entry["mode"] == "keep":
+                        if stack:
+                            emit_open(len(stack) - 1)
+                        if has_text:
+                            output.write(entry["open"] + ">")
+                            write_text(text, entry)
+                            output.write(f"</{entry['qualified']}>")
+                        else:
+                            output.write(entry["open"] + "/>")
+                        elements_after += 1
+                last_closed = element
+        output.write("\n")
+        return {"elements_after": elements_after, "resources_removed": resources_removed,
+                "groups_flattened": groups_flattened}
+
+
+def minify_svg_file(svg_path, output_path, precision_px=DEFAULT_PRECISION_PX, keep_ids=False):
+    """
+    Write a minified copy of an SVG file, see SvgMinifier.
+
+    Args:
+        svg_path (str): Source SVG file
+        output_path (str): Minified SVG file (may be svg_path)
+        precision_px (float): Largest displacement of a point by rounding, in pixels
+        keep_ids (bool): Keep the ids nothing in the document refers to
+
+    Returns:
+        dict: The report of SvgMinifier.minify, or None if the file could not be minified
+    """
+    try:
+        return SvgMinifier(precision_px, keep_ids).minify(svg_path, output_path)
+    except (OSError, ET.ParseError, ValueError) as e:
+        print(f"Error minifying {svg_path}: {e}")
+        return None
+
+
+def format_minify_report(report):
+    """One line summary of a minification report."""
+    return (f"{report['elements_before']:,} -> {report['elements_after']:,} elements, "
+            f"{report['bytes_before'] / 1024:,.0f} -> {report['bytes_after'] / 1024:,.0f} KB "
+            f"({report['resources_removed']} unused or duplicate resources, {report['groups_flattened']} groups flattened, "
+            f"{report['seconds']:.2f} s)")
@@ -0,0 +1,459 @@
+import math
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+import numpy as np
+from src.core.svg_crop import NAMESPACES, parse_length, write_svg_tree
+
+SVG_NS = "{http://www.w3.org/2000/svg}"
+COMMAND_PATTERN = re.compile(r"([MmLlHhVvCcSsQqTtAaZz])([^MmLlHhVvCcSsQqTtAaZz]*)")
+NUMBER_PATTERN = re.compile(r"[-+]?(?:\d*\.\d+|\d+\.?)(?:[eE][-+]?\d+)?")
+MERGEABLE_COMMANDS = set("LlHhVvCcQq")
+TRANSFORM_PATTERN = re.compile(r"(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)")
+IDENTITY_AFFINE = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+UNIT_TO_PX = {"": 1.0, "px": 1.0, "pt": 4 / 3, "pc": 16.0, "mm": 96 / 25.4, "cm": 96 / 2.54, "in": 96.0}
+
+DEFAULT_TOLERANCE_PX = 0.25
+# Share of the tolerance given to each step; the rest covers coordinate rounding
+# (under a tenth, see decimals_for) and the other steps of svg_ingest
+CURVE_SHARE = 0.4
+POLYLINE_SHARE = 0.4
+# Nodes parsed before a batch of paths is simplified and written back: large enough for the
+# array operations to pay off, small enough that the parsed paths stay a fraction of the DOM
+BATCH_NODES = 200_000
+
+
+class Subpath:
+    """
+    One subpath of a path, in absolute coordinates.
+
+    runs is a list of [kind, array] where kind is "L" (array of end points,
+    shape (k, 2)), "C" (control, control, end: (k, 3, 2)) or "Q" (control,
+    end: (k, 2, 2)). Every segment starts where the previous one ends, the
+    first one at start.
+    """
+
+    def __init__(self, start):
+        self.start = start
+        self.runs = []
+        self.closed = False
+
+    def add(self, kind, array):
+        if self.runs and self.runs[-1][0] == kind:
+            self.runs[-1][1].append(array)
+        else:
+            self.runs.append([kind, [array]])
+
+    def freeze(self):
+        """Concatenate the arrays collected while parsing."""
+        self.runs = [[kind, np.concatenate(arrays)] for kind, arrays in self.runs]
+
+    def node_count(self):
+        return 1 + sum(len(array) for _, array in self.runs)
+
+
+def command_chunks(d):
+    """
+    Yield (command letter, argument text) of path data.
+
+    Consecutive repeats of a command are merged into one chunk ("L1 2L3 4"
+    becomes "L" "1 2 3 4", the implicit repetition of the SVG grammar), so
+    the numbers of a long polyline are parsed in one call.
+    """
+    letter, args = None, []
+    for next_letter, next_args in COMMAND_PATTERN.findall(d):
+        if next_letter == letter and letter in MERGEABLE_COMMANDS:
+            args.append(next_args)
+            continue
+        if letter is not None:
+            yield letter, " ".join(args)
+        letter, args = next_letter, [next_args]
+    if letter is not None:
+        yield letter, " ".join(args)
+
+
+def parse_path(d):
+    """
+    Parse SVG path data into a list of Subpath.
+
+    Returns None for data this module leaves alone: arcs (their flags are
+    not always separated by spaces) and malformed data.
+    """
+    subpaths = []
+    subpath = None
+    current = np.zeros(2)
+    last_kind, last_control = None, None  # For the reflected controls of S and T
+
+    for letter, args in command_chunks(d):
+        command = letter.upper()
+        relative = letter != command
+        if command == "A":
+            return None
+        if command == "Z":
+            if subpath is not None:
+                subpath.closed = True
+                current = subpath.start
+                subpath = None
+            last_kind = None
+            continue
+
+        values = np.array(NUMBER_PATTERN.findall(args), dtype=float)
+        arity = {"M": 2, "L": 2, "H": 1, "V": 1, "C": 6, "S": 4, "Q": 4, "T": 2}[command]
+        if len(values) == 0 or len(values) % arity:
+            return None
+
+        if command == "M":
+            points = values.reshape(-1, 2)
+            if relative:
+                points = current + np.cumsum(points, axis=0)
+            subpath = Subpath(points[0])
+            subpaths.append(subpath)
+            if len(points) > 1:
+                subpath.add("L", points[1:])  # Extra pairs are implicit line-tos
+            current = points[-1]
+            last_kind = None
+            continue
+
+        if subpath is None:
+            # Drawing after a closepath starts a new subpath at the same point
+            subpath = Subpath(current)
+            subpaths.append(subpath)
+
+        if command in ("L", "H", "V"):
+            if command == "L":
+                points = values.reshape(-1, 2)
+                if relative:
+                    points = current + np.cumsum(points, axis=0)
+            else:
+                axis = 0 if command == "H" else 1
+                coordinates = current[axis] + np.cumsum(values) if relative else values
+                points = np.empty((len(values), 2))
+                points[:, axis] = coordinates
+                points[:, 1 - axis] = current[1 - axis]
+            subpath.add("L", points)
+            current = points[-1]
+            last_kind = None
+        elif command in ("C", "Q"):
+            segments = values.reshape(-1, arity // 2, 2)
+            if relative:
+                ends = np.cumsum(segments[:, -1], axis=0)
+                bases = current + np.vstack([np.zeros(2), ends[:-1]])
+                segments = segments + bases[:, None, :]
+            subpath.add(command, segments)
+            current = segments[-1, -1]
+            last_kind, last_control = command, segments[-1, -2]
+        else:
+            # S and T reflect the previous control point: sequential, rare
+            kind = "C" if command == "S" else "Q"
+            segments = []
+            for row in values.reshape(-1, arity // 2, 2):
+                if relative:
+                    row = row + current
+                reflected = 2 * current - last_control if last_kind == kind else current
+                segment = np.vstack([reflected, row])
+                segments.append(segment)
+                current = segment[-1]
+                last_kind, last_control = kind, segment[-2]
+            subpath.add(kind, np.array(segments))
+
+    for subpath in subpaths:
+        subpath.freeze()
+    return subpaths
+
+
+def multiply_affine(m, n):
+    """Product of two (a, b, c, d, e, f) transforms, n applied first."""
+    a, b, c, d, e, f = m
+    na, nb, nc, nd, ne, nf = n
+    return (a * na + c * nb, b * na + d * nb, a * nc + c * nd, b * nc + d * nd,
+            a * ne + c * nf + e, b * ne + d * nf + f)
+
+
+def parse_affine(text):
+    """Return the (a, b, c, d, e, f) coefficients of an SVG transform attribute."""
+    matrix = IDENTITY_AFFINE
+    for name, args in TRANSFORM_PATTERN.findall(text or ""):
+        values = [float(value) for value in NUMBER_PATTERN.findall(args)]
+        if name == "matrix" and len(values) == 6:
+            step = tuple(values)
+        elif name == "translate" and values:
+            step = (1.0, 0.0, 0.0, 1.0, values[0], values[1] if len(values) > 1 else 0.0)
+        elif name == "scale" and values:
+            step = (values[0], 0.0, 0.0, values[1] if len(values) > 1 else values[0], 0.0, 0.0)
+        elif name == "rotate" and values:
+            cos, sin = math.cos(math.radians(values[0])), math.sin(math.radians(values[0]))
+            step = (cos, sin, -sin, cos, 0.0, 0.0)
+            if len(values) == 3:
+                cx, cy = values[1:]
+                step = multiply_affine(multiply_affine((1.0, 0.0, 0.0, 1.0, cx, cy), step),
+                                       (1.0, 0.0, 0.0, 1.0, -cx, -cy))
+        elif name == "skewX" and values:
+            step = (1.0, 0.0, math.tan(math.radians(values[0])), 1.0, 0.0, 0.0)
+        elif name == "skewY" and values:
+            step = (1.0, math.tan(math.radians(values[0])), 0.0, 1.0, 0.0, 0.0)
+        else:
+            continue
+        matrix = multiply_affine(matrix, step)
+    return matrix
+
+
+def parse_transform(text):
+    """Return the 3x3 matrix of an SVG transform attribute."""
+    a, b, c, d, e, f = parse_affine(text)
+    return np.array([[a, c, e], [b, d, f], [0.0, 0.0, 1.0]])
+
+
+def max_stretch(matrix):
+    """Largest factor by which a transform can stretch a distance (largest singular value)."""
+    return float(np.linalg.norm(matrix[:2, :2], 2)) or 1.0
+
+
+def document_matrix(root):
+    """Transform from the user units of the root element to pixels of its natural size."""
+    matrix = np.identity(3)
+    view_box = root.get("viewBox")
+    if not view_box:
+        return matrix
+    x, y, width, height = (float(part) for part in view_box.replace(",", " ").split())
+    for axis, attribute, extent in ((0, "width", width), (1, "height", height)):
+        length = parse_length(root.get(attribute))
+        if length is not None and length[1] in UNIT_TO_PX and extent:
+            matrix[axis, axis] = length[0] * UNIT_TO_PX[length[1]] / extent
+    return matrix
+
+
+def iter_paths(element, matrix):
+    """Yield (path element, transform to pixels) for every path under element."""
+    matrix = matrix @ parse_transform(element.get("transform"))
+    if element.tag == SVG_NS + "path":
+        yield element, matrix
+    for child in element:
+        yield from iter_paths(child, matrix)
+
+
+def segment_distances(points, starts, ends):
+    """Distance of each point to the segment [start, end] of the same row."""
+    chord = ends - starts
+    offset = points - starts
+    length2 = np.einsum("ij,ij->i", chord, chord)
+    t = np.einsum("ij,ij->i", offset, chord) / np.where(length2 > 0, length2, 1)
+    t = np.clip(t, 0, 1)
+    return np.hypot(*(offset - t[:, None] * chord).T)
+
+
+def rdp_keep_mask(points, starts, ends, tolerances):
+    """
+    Ramer-Douglas-Peucker on many polylines at once.
+
+    The polylines are points[starts[i]:ends[i] + 1]. Each iteration handles
+    every interval still to split, of every polyline, with array operations,
+    so the Python overhead grows with the depth of the recursion and not
+    with the number of points or polylines.
+
+    Returns:
+        numpy.ndarray: Boolean mask of the points to keep
+    """
+    keep = np.zeros(len(points), dtype=bool)
+    keep[starts] = True
+    keep[ends] = True
+    while len(starts):
+        counts = ends - starts - 1
+        active = counts > 0
+        starts, ends, tolerances, counts = starts[active], ends[active], tolerances[active], counts[active]
+        if not len(starts):
+            break
+        group = np.repeat(np.arange(len(starts)), counts)
+        offsets = np.cumsum(counts) - counts
+        index = np.arange(counts.sum()) - np.repeat(offsets, counts) + np.repeat(starts + 1, counts)
+        distances = segment_distances(points[index], points[starts][group], points[ends][group])
+
+        farthest = np.maximum.reduceat(distances, offsets)
+        candidates = np.flatnonzero(distances == farthest[group])
+        _, first = np.unique(group[candidates], return_index=True)
+        split = index[candidates[first]]
+
+        far = farthest > tolerances
+        keep[split[far]] = True
+        starts, ends = np.concatenate([starts[far], split[far]]), np.concatenate([split[far], ends[far]])
+        tolerances = np.concatenate([tolerances[far], tolerances[far]])
+    return keep
+
+
+def flatten_curves(paths):
+    """Replace the Bézier segments whose control points are within tolerance of their chord by lines."""
+    for kind in ("C", "Q"):
+        runs, firsts = [], []
+        for subpaths, tolerance in paths:
+            for subpath in subpaths:
+                previous = subpath.start
+                for run in subpath.runs:
+                    if run[0] == kind:
+                        runs.append((subpath, run, tolerance))
+                        firsts.append(previous)
+                    previous = run[1][-1, -1] if run[0] != "L" else run[1][-1]
+        if not runs:
+            continue
+        segments = np.concatenate([run[1] for _, run, _ in runs])
+        lengths = np.array([len(run[1]) for _, run, _ in runs])
+        starts = np.concatenate([np.vstack([first, run[1][:-1, -1]]) for first, (_, run, _) in zip(firsts, runs)])
+        tolerances = np.repeat([tolerance * CURVE_SHARE for _, _, tolerance in runs], lengths)
+        # A Bézier curve stays inside the hull of its control points: if they
+        # are all close to the chord, so is the curve
+        ends = segments[:, -1]
+        deviation = np.zeros(len(segments))
+        for control in range(segments.shape[1] - 1):
+            deviation = np.maximum(deviation, segment_distances(segments[:, control], starts, ends))
+        flat = deviation <= tolerances
+
+        for (subpath, run, _), run_flat in zip(runs, np.split(flat, np.cumsum(lengths)[:-1])):
+            if not run_flat.any():
+                continue
+            pieces = []
+            boundaries = np.flatnonzero(np.diff(run_flat.astype(np.int8))) + 1
+            for piece, piece_flat in zip(np.split(run[1], boundaries), np.split(run_flat, boundaries)):
+                pieces.append(["L", piece[:, -1]] if piece_flat[0] else [kind, piece])
+            index = next(i for i, other in enumerate(subpath.runs) if other is run)
+            subpath.runs[index:index + 1] = pieces
+    for subpaths, _ in paths:
+        for subpath in subpaths:
+            merge_line_runs(subpath)
+
+
+def merge_line_runs(subpath):
+    merged = []
+    for kind, array in subpath.runs:
+        if merged and kind == "L" and merged[-1][0] == "L":
+            merged[-1][1] = np.concatenate([merged[-1][1], array])
+        else:
+            merged.append([kind, array])
+    subpath.runs = merged
+
+
+def simplify_polylines(paths):
+    """Run Ramer-Douglas-Peucker on every line run of every path, in one batch."""
+    runs, polylines, tolerances = [], [], []
+    for subpaths, tolerance in paths:
+        for subpath in subpaths:
+            previous = subpath.start
+            for run in subpath.runs:
+                if run[0] == "L":
+                    if len(run[1]) > 1:
+                        runs.append(run)
+                        polylines.append(np.vstack([previous, run[1]]))
+                        tolerances.append(tolerance * POLYLINE_SHARE)
+                    previous = run[1][-1]
+                else:
+                    previous = run[1][-1, -1]
+    if not runs:
+        return
+    lengths = np.array([len(polyline) for polyline in polylines])
+    ends = np.cumsum(lengths) - 1
+    starts = ends - lengths + 1
+    keep = rdp_keep_mask(np.concatenate(polylines), starts, ends, np.array(tolerances))
+    for run, polyline, run_keep in zip(runs, polylines, np.split(keep, np.cumsum(lengths)[:-1])):
+        run[1] = polyline[run_keep][1:]
+
+
+def format_numbers(array, decimals):
+    """Space separated coordinates, with trailing zeros removed."""
+    text = []
+    for value in np.round(array, decimals).ravel().tolist():
+        number = f"{value:.{decimals}f}"
+        if "." in number:
+            number = number.rstrip("0").rstrip(".")
+        text.append("0" if number == "-0" else number)
+    return " ".join(text)
+
+
+def format_path(subpaths, decimals):
+    parts = []
+    for subpath in subpaths:
+        parts.append("M" + format_numbers(subpath.start, decimals))
+        for kind, array in subpath.runs:
+            parts.append(kind + format_numbers(array, decimals))
+        if subpath.closed:
+            parts.append("Z")
+    return "".join(parts)
+
+
+def decimals_for(tolerance):
+    """Decimals keeping the rounding error of a point under a tenth of the tolerance."""
+    return min(6, max(0, math.ceil(math.log10(10 / tolerance))))
+
+
+def simplify_svg_tree(root, tolerance_px=DEFAULT_TOLERANCE_PX, scale=1.0):
+    """
+    Simplify the paths of a parsed SVG document in place.
+
+    The tolerance is a distance in pixels of the document shown at its
+    natural size (width and height attributes) times scale; it is
+    converted to the user units of each path through its transforms, so
+    a shape is never moved by more than tolerance_px on screen.
+
+    Paths are independent, so they are parsed and simplified in batches of
+    about BATCH_NODES nodes: the memory used on top of the document is
+    bounded by one batch, whatever the size of the document.
+
+    Returns:
+        dict: paths, skipped_paths, nodes_before, nodes_after
+    """
+    report = {"paths": 0, "skipped_paths": 0, "nodes_before": 0, "nodes_after": 0}
+    paths, elements = [], []
+    batch_nodes = 0
+    for element, matrix in iter_paths(root, document_matrix(root)):
+        subpaths = parse_path(element.get("d", ""))
+        if subpaths is None:
+            report["skipped_paths"] += 1
+            continue
+        tolerance = tolerance_px / (scale * max_stretch(matrix))
+        paths.append((subpaths, tolerance))
+        elements.append(element)
+        batch_nodes += sum(subpath.node_count() for subpath in subpaths)
+        if batch_nodes >= BATCH_NODES:
+            simplify_batch(paths, elements, report)
+            paths, elements = [], []
+            batch_nodes = 0
+    simplify_batch(paths, elements, report)
+    return report
+
+
+def simplify_batch(paths, elements, report):
+    """Simplify parsed paths, write them back to their elements and add the counts to report."""
+    report["paths"] += len(paths)
+    report["nodes_before"] += sum(subpath.node_count() for subpaths, _ in paths for subpath in subpaths)
+    flatten_curves(paths)
+    simplify_polylines(paths)
+    report["nodes_after"] += sum(subpath.node_count() for subpaths, _ in paths for subpath in subpaths)
+    for element, (subpaths, tolerance) in zip(elements, paths):
+        element.set("d", format_path(subpaths, decimals_for(tolerance)))
+
+
+def simplify_svg_file(svg_path, output_path, tolerance_px=DEFAULT_TOLERANCE_PX, scale=1.0):
+    """
+    Write a lighter copy of an SVG file with simplified paths.
+
+    Args:
+        svg_path (str): Source SVG file
+        output_path (str): Simplified SVG file (may be svg_path)
+        tolerance_px (float): Largest visual error, in pixels
+        scale (float): Zoom at which tolerance_px applies, relative to the natural size
+
+    Returns:
+        dict: The report of simplify_svg_tree plus bytes_before, bytes_after,
+            tolerance_px and seconds, or None if the file could not be simplified
+    """
+    start = time.perf_counter()
+    try:
+        bytes_before = os.path.getsize(svg_path)
+        for prefix, uri in NAMESPACES.items():
+            ET.register_namespace(prefix, uri)
+        tree = ET.parse(svg_path)
+        report = simplify_svg_tree(tree.getroot(), tolerance_px, scale)
+        write_svg_tree(tree, output_path)
+        report.update(bytes_before=bytes_before, bytes_after=os.path.getsize(output_path),
+                      tolerance_px=tolerance_px, seconds=time.perf_counter() - start)
+        return report
+    except (OSError, ET.ParseError, ValueError) as e:
+        print(f"Error simplifying {svg_path}: {e}")
+        return None
@@ -0,0 +1,24 @@
+from src.core.disk_cache import DiskCache
+from src.utils.file_utils import get_cache_directory
+
+
+class ThumbnailCache(DiskCache):
+    """On-disk PNG thumbnails keyed by PdfDocument.cache_key, page index and width."""
+
+    CACHE_SIZE_BYTES = 200 * 1024 * 1024
+    THUMBNAIL_WIDTH = 120  # Pixels, shared by the thumbnail strip and the viewer previews
+
+    def __init__(self, directory=None, max_bytes=CACHE_SIZE_BYTES):
+        super().__init__(directory or get_cache_directory("thumbnails"), max_bytes, suffix=".png")
+
+    def thumbnail_key(self, document, page_index, width):
+        """Cache key of the thumbnail of a page of a PdfDocument."""
+        return f"{document.cache_key}_{page_index}_{width}"
+
+    def get_thumbnail(self, document, page_index, width):
+        """Return the PNG data of a thumbnail, or None if it was never rendered."""
+        return self.get_bytes(self.thumbnail_key(document, page_index, width))
+
+    def put_thumbnail(self, document, page_index, width, data):
+        """Store the PNG data of a thumbnail."""
+        return self.put_bytes(self.thumbnail_key(document, page_index, width), data)
@@ -0,0 +1,164 @@
+import os
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+                             QSpinBox, QProgressBar, QListWidget, QFileDialog, QLineEdit,
+                             QComboBox)
+from src.core.batch_converter import output_directory_for, output_path
+from src.gui.conversion_scheduler import ConversionJob, ConversionScheduler
+
+
+class BatchExtractDialog(QDialog):
+    """
+    Dialogue d'extraction de toutes les pages (ou d'un intervalle) en SVG simplifiés
+
+    Les pages sont envoyées au ConversionScheduler avec la priorité "batch" :
+    la conversion continue si le dialogue est fermé et reste visible dans le
+    panneau des conversions.
+    """
+    def __init__(self, pdf_path, page_count, scheduler, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Extract Pages as SVG")
+        self.pdf_path = pdf_path
+        self.scheduler = scheduler
+        self.jobs = {}  # job_id -> ConversionJob de ce lot
+        self.finished_ids = set()
+        self.scheduler.job_finished.connect(self.on_job_finished)
+
+        layout = QVBoxLayout(self)
+
+        # Intervalle de pages
+        range_layout = QHBoxLayout()
+        range_layout.addWidget(QLabel("Pages:"))
+        self.first_spin = QSpinBox()
+        self.first_spin.setRange(1, page_count)
+        self.first_spin.setValue(1)
+        range_layout.addWidget(self.first_spin)
+        range_layout.addWidget(QLabel("to"))
+        self.last_spin = QSpinBox()
+        self.last_spin.setRange(1, page_count)
+        self.last_spin.setValue(page_count)
+        range_layout.addWidget(self.last_spin)
+        range_layout.addStretch()
+        layout.addLayout(range_layout)
+
+        # Dossier de sortie, un par présentation
+        output_layout = QHBoxLayout()
+        output_layout.addWidget(QLabel("Output folder:"))
+        self.output_edit = QLineEdit(output_directory_for(pdf_path))
+        output_layout.addWidget(self.output_edit)
+        browse_button = QPushButton("Browse...")
+        browse_button.clicked.connect(self.browse_output)
+        output_layout.addWidget(browse_button)
+        layout.addLayout(output_layout)
+
+        # Convertisseur : Inkscape ou PyMuPDF (sans processus externe)
+        backend_layout = QHBoxLayout()
+        backend_layout.addWidget(QLabel("Converter:"))
+        self.backend_combo = QComboBox()
+        self.backend_combo.addItem("Inkscape", "inkscape")
+        self.backend_combo.addItem("PyMuPDF (fast, no Inkscape)", "pymupdf")
+        backend_layout.addWidget(self.backend_combo)
+        backend_layout.addStretch()
+        layout.addLayout(backend_layout)
+
+        self.status_label = QLabel(f"{self.scheduler.max_workers} parallel workers")
+        layout.addWidget(self.status_label)
+        self.progress_bar = QProgressBar()
+        layout.addWidget(self.progress_bar)
+        self.log_list = QListWidget()
+        layout.addWidget(self.log_list)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        self.start_button = QPushButton("Start")
+        self.start_button.clicked.connect(self.start)
+        buttons.addWidget(self.start_button)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel)
+        buttons.addWidget(self.cancel_button)
+        self.close_button = QPushButton("Close")
+        self.close_button.clicked.connect(self.reject)
+        buttons.addWidget(self.close_button)
+        layout.addLayout(buttons)
+
+        self.resize(500, 400)
+
+    def browse_output(self):
+        directory = QFileDialog.getExistingDirectory(self, "Output Folder", self.output_edit.text())
+        if directory:
+            self.output_edit.setText(directory)
+
+    def start(self):
+        """Envoie les pages sélectionnées au scheduler"""
+        first, last = self.first_spin.value(), self.last_spin.value()
+        if first > last:
+            first, last = last, first
+        output_dir = self.output_edit.text()
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+        except OSError as e:
+            self.status_label.setText(f"Cannot create {output_dir}: {e}")
+            return
+
+        self.log_list.clear()
+        self.jobs = {}
+        self.finished_ids = set()
+        self.progress_bar.setRange(0, last - first + 1)
+        self.progress_bar.setValue(0)
+        self.status_label.setText(f"Converting {last - first + 1} pages...")
+        self.set_running(True)
+
+        backend = self.backend_combo.currentData()
+        for page_number in range(first, last + 1):
+            job = self.scheduler.submit(self.pdf_path, page_number,
+                                        output_path(output_dir, page_number),
+                                        backend=backend, priority=ConversionScheduler.PRIORITY_BATCH)
+            self.jobs[job.job_id] = job
+        # Un job peut échouer dès sa soumission, avant que le lot soit complet
+        for job in list(self.jobs.values()):
+            if job.is_finished:
+                self.on_job_finished(job)
+
+    def cancel(self):
+        """Annule les pages pas encore commencées"""
+        self.scheduler.cancel(list(self.jobs.values()))
+        self.cancel_button.setEnabled(False)
+        self.status_label.setText("Cancelling, waiting for the pages in progress...")
+
+    def set_running(self, running):
+        self.start_button.setEnabled(not running)
+        self.cancel_button.setEnabled(running)
+        self.first_spin.setEnabled(not running)
+        self.last_spin.setEnabled(not running)
+        self.output_edit.setEnabled(not running)
+        self.backend_combo.setEnabled(not running)
+
+    def on_job_finished(self, job):
+        if job.job_id not in self.jobs or job.job_id in self.finished_ids:
+            return
+        self.finished_ids.add(job.job_id)
+        self.progress_bar.setValue(len(self.finished_ids))
+        if job.state != ConversionJob.CANCELLED:
+            result = "ok" if job.state == ConversionJob.DONE else f"failed ({job.error})"
+            self.log_list.addItem(f"Page {job.page_number}: {result}")
+            self.log_list.scrollToBottom()
+        if len(self.finished_ids) == len(self.jobs):
+            self.on_batch_finished()
+
+    def on_batch_finished(self):
+        self.set_running(False)
+        states = [job.state for job in self.jobs.values()]
+        text = f"{states.count(ConversionJob.DONE)} pages written to {self.output_edit.text()}"
+        if states.count(ConversionJob.FAILED):
+            text += f", {states.count(ConversionJob.FAILED)} failed"
+        if states.count(ConversionJob.CANCELLED):
+            text += f", {states.count(ConversionJob.CANCELLED)} cancelled"
+        self.status_label.setText(text)
+
+    def done(self, result):
+        # Les conversions continuent en arrière-plan, le dialogue ne les suit plus
+        try:
+            self.scheduler.job_finished.disconnect(self.on_job_finished)
+        except TypeError:
+            pass  # Déjà déconnecté : done() peut être appelé plusieurs fois
+        super().done(result)
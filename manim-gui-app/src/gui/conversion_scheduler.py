@@ -0,0 +1,207 @@
+import heapq
+import itertools
+import multiprocessing
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from PyQt5.QtCore import QObject, pyqtSignal
+from src.core.batch_converter import init_worker, convert_page
+
+
+class ConversionJob:
+    """One PDF page to convert to SVG, possibly requested several times."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    def __init__(self, job_id, pdf_path, page_number, output_path, simplify, backend, priority):
+        self.job_id = job_id
+        self.pdf_path = pdf_path
+        self.page_number = page_number
+        # Duplicate requests add their destination here instead of a new job
+        self.output_paths = [output_path]
+        self.simplify = simplify
+        self.backend = backend
+        self.priority = priority
+        self.state = self.QUEUED
+        self.error = None
+
+    @property
+    def key(self):
+        """Identity of the conversion: jobs with the same key are merged."""
+        return (os.path.realpath(self.pdf_path), self.page_number, self.simplify, self.backend)
+
+    @property
+    def is_finished(self):
+        return self.state in (self.DONE, self.FAILED, self.CANCELLED)
+
+    def description(self):
+        kind = "simplified SVG" if self.simplify else "SVG"
+        return f"{os.path.basename(self.pdf_path)} page {self.page_number} -> {kind}"
+
+
+class ConversionScheduler(QObject):
+    """
+    Run PDF to SVG conversions in background processes, by priority.
+
+    Jobs wait in a priority heap and only max_workers of them are handed to
+    the process pool at a time, so a job submitted with a higher priority
+    (the page the user is looking at) overtakes the queued batch work. A
+    request for a conversion which is already queued or running is merged
+    into that job: the result is copied to every requested output.
+
+    The signals are emitted on the GUI thread.
+    """
+
+    job_added = pyqtSignal(object)     # ConversionJob
+    job_changed = pyqtSignal(object)   # ConversionJob, state or priority changed
+    job_finished = pyqtSignal(object)  # ConversionJob, done, failed or cancelled
+    _future_done = pyqtSignal(object, object)  # Emitted from the pool threads
+
+    PRIORITY_INTERACTIVE = 0
+    PRIORITY_CURRENT_PAGE = 1
+    PRIORITY_BATCH = 2
+
+    def __init__(self, inkscape_path="inkscape", max_workers=None, use_shell=True, use_cache=True,
+                 parent=None):
+        super().__init__(parent)
+        self.inkscape_path = inkscape_path
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.use_shell = use_shell
+        self.use_cache = use_cache
+        self.executor = None
+        self.jobs = []          # Every job, in submission order, for the job panel
+        self.active = {}        # key -> queued or running job
+        self.heap = []          # (priority, sequence, job), stale entries are skipped
+        self.sequence = itertools.count()
+        self.job_ids = itertools.count()
+        self.running = 0
+        self._future_done.connect(self.on_future_done)
+
+    def submit(self, pdf_path, page_number, output_path, simplify=True, backend=None,
+               priority=PRIORITY_BATCH):
+        """
+        Queue the conversion of a page (1-based) and return its ConversionJob.
+
+        If the same conversion is already queued or running, that job is
+        returned instead, with output_path added to its destinations and
+        its priority raised if needed.
+        """
+        job = ConversionJob(next(self.job_ids), pdf_path, page_number, output_path, simplify,
+                            backend, priority)
+        existing = self.active.get(job.key)
+        if existing is not None:
+            if output_path not in existing.output_paths:
+                existing.output_paths.append(output_path)
+            self.raise_priority(existing, priority)
+            return existing
+
+        self.jobs.append(job)
+        self.active[job.key] = job
+        heapq.heappush(self.heap, (job.priority, next(self.sequence), job))
+        self.job_added.emit(job)
+        self.dispatch()
+        return job
+
+    def raise_priority(self, job, priority):
+        """Move a queued job ahead if priority is higher than its current one."""
+        if job.state != ConversionJob.QUEUED or priority >= job.priority:
+            return
+        job.priority = priority
+        # The old heap entry stays behind and is skipped when popped
+        heapq.heappush(self.heap, (priority, next(self.sequence), job))
+        self.job_changed.emit(job)
+
+    def prioritize_page(self, pdf_path, page_number):
+        """Move the queued jobs of the page being viewed ahead of the batch work."""
+        path = os.path.realpath(pdf_path)
+        for job in list(self.active.values()):
+            if job.key[0] == path and job.page_number == page_number:
+                self.raise_priority(job, self.PRIORITY_CURRENT_PAGE)
+
+    def cancel(self, jobs):
+        """Cancel queued jobs; running ones are left to finish."""
+        for job in jobs:
+            if job.state == ConversionJob.QUEUED:
+                job.state = ConversionJob.CANCELLED
+                del self.active[job.key]
+                self.job_changed.emit(job)
+                self.job_finished.emit(job)
+
+    def clear_finished(self):
+        """Forget the finished jobs (they disappear from the job panel)."""
+        self.jobs = [job for job in self.jobs if not job.is_finished]
+
+    def pending_jobs(self):
+        """Queued and running jobs."""
+        return list(self.active.values())
+
+    def get_executor(self):
+        if self.executor is None:
+            # Forking a process running Qt threads is unsafe, start fresh interpreters
+            self.executor = ProcessPoolExecutor(
+                self.max_workers, mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker,
+                initargs=(self.inkscape_path, self.use_shell, self.use_cache))
+        return self.executor
+
+    def dispatch(self):
+        """Hand the highest priority queued jobs to the free workers."""
+        while self.running < self.max_workers and self.heap:
+            priority, _, job = heapq.heappop(self.heap)
+            if job.state != ConversionJob.QUEUED or priority != job.priority:
+                continue  # Cancelled, or an outdated entry of a re-prioritized job
+            try:
+                future = self.get_executor().submit(
+                    convert_page, job.pdf_path, job.page_number, job.output_paths[0],
+                    job.backend, job.simplify)
+            except (BrokenProcessPool, RuntimeError) as e:
+                self.executor = None
+                self.finish(job, ConversionJob.FAILED, str(e))
+                continue
+            job.state = ConversionJob.RUNNING
+            self.running += 1
+            self.job_changed.emit(job)
+            future.add_done_callback(lambda future, job=job: self._future_done.emit(job, future))
+
+    def on_future_done(self, job, future):
+        """Record the result of a job on the GUI thread and start the next ones."""
+        self.running -= 1
+        try:
+            success = future.result()[1]
+            error = None if success else "Conversion failed"
+        except BrokenProcessPool as e:
+            # A worker died, the pool cannot be used anymore
+            self.executor = None
+            success, error = False, f"Worker process died: {e}"
+        except Exception as e:
+            success, error = False, str(e)
+
+        if success:
+            # Merged requests get a copy of the result
+            for output_path in job.output_paths[1:]:
+                try:
+                    shutil.copyfile(job.output_paths[0], output_path)
+                except OSError as e:
+                    success, error = False, f"Could not copy to {output_path}: {e}"
+        self.finish(job, ConversionJob.DONE if success else ConversionJob.FAILED, error)
+        self.dispatch()
+
+    def finish(self, job, state, error=None):
+        job.state = state
+        job.error = error
+        if self.active.get(job.key) is job:
+            del self.active[job.key]
+        self.job_changed.emit(job)
+        self.job_finished.emit(job)
+
+    def shutdown(self):
+        """Cancel the queued jobs and stop the worker processes."""
+        self.cancel(self.pending_jobs())
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
@@ -0,0 +1,184 @@
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QWidget, QRubberBand,
+                             QSizePolicy)
+from PyQt5.QtCore import Qt, QRect, QRectF, QSize, pyqtSignal
+from PyQt5.QtGui import QPainter, QColor, QPen, QPixmap
+from src.gui.svg_renderer_pool import svg_renderer_pool
+
+# Couleur du cadre de chaque type de fragment
+KIND_COLORS = {"text": QColor(30, 120, 220), "equation": QColor(200, 120, 0), "figure": QColor(40, 160, 60)}
+
+
+class FragmentPageView(QWidget):
+    """
+    Page affichée avec le cadre de ses fragments.
+
+    Un clic ajoute ou retire le fragment sous le curseur (le plus petit),
+    un glisser sélectionne tous ceux qu'il touche. La page est dessinée une
+    fois dans un pixmap à la taille du widget : les cadres se redessinent
+    sans refaire le rendu du SVG.
+    """
+    selection_changed = pyqtSignal()
+
+    def __init__(self, page_fragments, parent=None):
+        super().__init__(parent)
+        self.page_fragments = page_fragments
+        self.selected = set()  # Indices des fragments choisis
+        self.hovered = None
+        self.page_pixmap = None
+        self.press_pos = None
+        self.rubber_band = QRubberBand(QRubberBand.Rectangle, self)
+        self.renderer = svg_renderer_pool.acquire(page_fragments.svg_path)
+        self.renderer_release = svg_renderer_pool.bind(self.renderer, self)
+        self.setMouseTracking(True)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.setMinimumSize(300, 300)
+
+    def sizeHint(self):
+        return QSize(700, 800)
+
+    def release_renderer(self):
+        if self.renderer is not None:
+            self.renderer_release()
+            self.renderer = None
+
+    def page_rect(self):
+        """Rectangle du widget où la page est dessinée, ratio conservé"""
+        _, _, width, height = self.page_fragments.view_box
+        scale = min(self.width() / width, self.height() / height)
+        return QRectF((self.width() - width * scale) / 2, (self.height() - height * scale) / 2,
+                      width * scale, height * scale)
+
+    def to_widget(self, box):
+        """Boîte (x0, y0, x1, y1) de la page vers un QRectF du widget"""
+        x, y, width, height = self.page_fragments.view_box
+        target = self.page_rect()
+        scale = target.width() / width
+        return QRectF(target.x() + (box[0] - x) * scale, target.y() + (box[1] - y) * scale,
+                      (box[2] - box[0]) * scale, (box[3] - box[1]) * scale)
+
+    def to_page(self, point):
+        """Point du widget vers les unités de la page"""
+        x, y, width, _ = self.page_fragments.view_box
+        target = self.page_rect()
+        scale = width / target.width()
+        return x + (point.x() - target.x()) * scale, y + (point.y() - target.y()) * scale
+
+    def fragment_at(self, pos):
+        found = self.page_fragments.fragments_at(*self.to_page(pos))
+        return found[0].index if found else None
+
+    def set_selected(self, indices):
+        self.selected = set(indices)
+        self.update()
+        self.selection_changed.emit()
+
+    def resizeEvent(self, event):
+        self.page_pixmap = None  # Rendu refait à la nouvelle taille
+        super().resizeEvent(event)
+
+    def render_page(self):
+        pixmap = QPixmap(self.size())
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.fillRect(self.page_rect(), Qt.white)
+        if self.renderer is not None and self.renderer.isValid():
+            self.renderer.render(painter, self.page_rect())
+        painter.end()
+        return pixmap
+
+    def paintEvent(self, event):
+        if self.page_pixmap is None:
+            self.page_pixmap = self.render_page()
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.page_pixmap)
+        for fragment in self.page_fragments.fragments:
+            rect = self.to_widget(fragment.box).adjusted(-2, -2, 2, 2)
+            if not rect.intersects(QRectF(event.rect())):
+                continue
+            color = KIND_COLORS.get(fragment.kind, QColor(120, 120, 120))
+            if fragment.index in self.selected:
+                painter.fillRect(rect, QColor(color.red(), color.green(), color.blue(), 60))
+            pen = QPen(color, 2 if fragment.index == self.hovered else 1)
+            pen.setStyle(Qt.SolidLine if fragment.index in self.selected else Qt.DashLine)
+            painter.setPen(pen)
+            painter.drawRect(rect)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.press_pos = event.pos()
+            self.rubber_band.setGeometry(QRect(self.press_pos, QSize()))
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self.press_pos is not None and event.buttons() & Qt.LeftButton:
+            if (event.pos() - self.press_pos).manhattanLength() > 4:
+                self.rubber_band.setGeometry(QRect(self.press_pos, event.pos()).normalized())
+                self.rubber_band.show()
+        else:
+            hovered = self.fragment_at(event.pos())
+            if hovered != self.hovered:
+                self.hovered = hovered
+                self.update()
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.LeftButton and self.press_pos is not None:
+            if self.rubber_band.isVisible():
+                self.rubber_band.hide()
+                rect = self.rubber_band.geometry()
+                box = self.to_page(rect.topLeft()) + self.to_page(rect.bottomRight())
+                self.set_selected(self.selected | {fragment.index
+                                                   for fragment in self.page_fragments.fragments_in(box)})
+            else:
+                index = self.fragment_at(event.pos())
+                if index is not None:
+                    self.set_selected(self.selected ^ {index})
+            self.press_pos = None
+        super().mouseReleaseEvent(event)
+
+
+class FragmentPickerDialog(QDialog):
+    """Choix des fragments d'une page (lignes de texte, équations, figures) à insérer dans la slide"""
+
+    def __init__(self, page_fragments, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Insérer des fragments")
+        self.page_fragments = page_fragments
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("Cliquez sur les fragments à insérer, ou faites glisser pour en choisir plusieurs :"))
+        self.page_view = FragmentPageView(page_fragments, self)
+        self.page_view.selection_changed.connect(self.update_count)
+        layout.addWidget(self.page_view, 1)
+
+        buttons_layout = QHBoxLayout()
+        self.count_label = QLabel()
+        buttons_layout.addWidget(self.count_label)
+        buttons_layout.addStretch()
+        select_all_button = QPushButton("Tout sélectionner")
+        select_all_button.clicked.connect(
+            lambda: self.page_view.set_selected(fragment.index for fragment in page_fragments.fragments))
+        clear_button = QPushButton("Aucun")
+        clear_button.clicked.connect(lambda: self.page_view.set_selected(()))
+        cancel_button = QPushButton("Annuler")
+        cancel_button.clicked.connect(self.reject)
+        self.insert_button = QPushButton("Insérer")
+        self.insert_button.setDefault(True)
+        self.insert_button.clicked.connect(self.accept)
+        for button in (select_all_button, clear_button, cancel_button, self.insert_button):
+            buttons_layout.addWidget(button)
+        layout.addLayout(buttons_layout)
+        self.update_count()
+
+    def update_count(self):
+        count = len(self.page_view.selected)
+        self.count_label.setText(f"{count} / {len(self.page_fragments.fragments)} fragments")
+        self.insert_button.setEnabled(count > 0)
+
+    def selected_fragments(self):
+        """Fragments choisis, dans l'ordre de lecture de la page"""
+        return [self.page_fragments.fragments[index] for index in sorted(self.page_view.selected)]
+
+    def done(self, result):
+        self.page_view.release_renderer()
+        super().done(result)
@@ -0,0 +1,64 @@
+import threading
+from PyQt5 import sip
+from PyQt5.QtGui import QImage
+
+
+class CopyStats:
+    """Count the bytes copied while handing MuPDF pixmaps over to Qt."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.frames = 0
+        self.bytes_copied = 0
+        self.last_frame_bytes = 0
+
+    def record(self, copied):
+        with self.lock:
+            self.frames += 1
+            self.bytes_copied += copied
+            self.last_frame_bytes = copied
+
+    def stats(self):
+        """Return a dictionary with the copy counters."""
+        with self.lock:
+            return {
+                "frames": self.frames,
+                "bytes_copied": self.bytes_copied,
+                "last_frame_bytes": self.last_frame_bytes,
+                "bytes_per_frame": self.bytes_copied / self.frames if self.frames else 0.0,
+            }
+
+
+copy_stats = CopyStats()
+
+
+def qimage_from_pixmap(pix):
+    """
+    Wrap a fitz.Pixmap in a QImage without copying its pixels.
+
+    Pixmaps rendered with alpha=True are premultiplied RGBA, which Qt
+    draws directly as Format_RGBA8888_Premultiplied. The QImage points to
+    the MuPDF buffer, so the pixmap is attached to the returned wrapper to
+    keep that buffer alive for as long as the QImage object. Hand the
+    returned object around as a Python object (pyqtSignal(object)), since
+    Qt-side copies of the QImage would not hold the pixmap.
+
+    Other layouts (no alpha channel, grayscale) fall back to a detached
+    copy. Either way the copied bytes are recorded in copy_stats.
+    """
+    if pix.n == 4 and pix.alpha:
+        image = QImage(sip.voidptr(pix.samples_ptr), pix.width, pix.height, pix.stride,
+                       QImage.Format_RGBA8888_Premultiplied)
+        image.fitz_pixmap = pix
+        copy_stats.record(0)
+        return image
+
+    if pix.n == 3 and not pix.alpha:
+        image_format = QImage.Format_RGB888
+    elif pix.n == 1 and not pix.alpha:
+        image_format = QImage.Format_Grayscale8
+    else:
+        raise ValueError(f"Unsupported pixmap layout: {pix.n} channels, alpha={pix.alpha}")
+    image = QImage(pix.samples_mv, pix.width, pix.height, pix.stride, image_format).copy()
+    copy_stats.record(image.sizeInBytes())
+    return image
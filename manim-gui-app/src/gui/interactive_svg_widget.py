@@ -1,14 +1,18 @@
 from PyQt5.QtWidgets import QWidget, QFrame
 from PyQt5.QtSvg import QSvgWidget, QSvgRenderer
-from PyQt5.QtCore import Qt, QSize, QRect, QPoint, QRectF
-from PyQt5.QtGui import QPainter, QPen, QBrush, QColor, QCursor, QPainterPath
-import os
-import xml.etree.ElementTree as ET
+from PyQt5.QtCore import Qt, QSize, QRect, QPoint, QRectF, QTimer
+from PyQt5.QtGui import QPainter, QPen, QBrush, QColor, QCursor, QPainterPath, QPixmap, QGuiApplication, QRegion
+import logging
+from src.gui.svg_renderer_pool import svg_renderer_pool
+
+logger = logging.getLogger(__name__)
 
 class InteractiveSvgWidget(QFrame):
     """Widget SVG interactif avec poignées de redimensionnement et rognage"""
     
     HANDLE_SIZE = 10  # Taille des poignées en pixels
+    RESIZE_DEBOUNCE_MS = 150  # Délai sans redimensionnement avant de re-rasteriser le SVG
+    FALLBACK_REFRESH_RATE = 60  # Hz, si l'écran ne donne pas sa fréquence
     
     # Constantes pour identifier les différentes poignées
     (HANDLE_TOP_LEFT, HANDLE_TOP, HANDLE_TOP_RIGHT, 
@@ -22,25 +26,40 @@ class InteractiveSvgWidget(QFrame):
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.setAutoFillBackground(False)
         
-        self.svg_path = svg_path
-        
         # --- REFACTOR: Utiliser un QSvgRenderer au lieu d'un QSvgWidget enfant ---
-        self.renderer = QSvgRenderer(self)
-        if svg_path:
-            self.renderer.load(svg_path)
+        # Le renderer (document SVG analysé) est partagé entre tous les widgets
+        # qui affichent le même fichier, via svg_renderer_pool
+        self.svg_path = None
+        self.renderer = None
+        self.renderer_release = None  # Rend le renderer au pool, voir svg_renderer_pool.bind
+        # Rognages successifs (viewBox en unités du document), le dernier est affiché
+        self.crop_stack = []
+        # (géométrie en pixels, géométrie en unités de slide) du dernier placement par l'éditeur
+        self.slide_placement = None
+
+        # --- Cache raster du SVG ---
+        # Le SVG est rendu une seule fois dans un QPixmap à la taille du widget
+        # (et au device pixel ratio de l'écran), chaque paintEvent ne fait que
+        # le copier. Pendant un redimensionnement, l'ancien pixmap est étiré
+        # et le SVG n'est re-rendu qu'une fois le geste terminé.
+        self.svg_pixmap = None
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(self.RESIZE_DEBOUNCE_MS)
+        self.resize_timer.timeout.connect(self.refresh_svg_pixmap)
+
+        # Déplacements et redimensionnements regroupés à la fréquence de l'écran
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.timeout.connect(self.apply_pending_geometry)
+        self.crop_mode = False
+        # Les variables de suivi (sélection, poignée, glisser) sont initialisées par reset_interaction
+        self.set_svg_source(svg_path)
 
         # Configuration du widget principal (le cadre)
         self.setFrameShape(QFrame.NoFrame) # Pas de cadre visible par défaut
         self.setMouseTracking(True)
         
-        # Variables de suivi
-        self.active_handle = None
-        self.is_active = False # Nouveau: pour savoir si le widget est sélectionné
-        self.drag_start_pos = None
-        self.original_rect = None
-        self.crop_mode = False
-        self.crop_selection_rect = None
-        
         # Définir la taille initiale du widget pour correspondre au SVG
         if self.renderer.isValid():
             initial_size = self.renderer.defaultSize()
@@ -57,12 +76,19 @@ class InteractiveSvgWidget(QFrame):
     def set_active(self, active):
         """Définit le widget comme actif ou inactif et met à jour son apparence."""
         self.is_active = active
-        self.update()
+        self.update(self.handles_region()) # Seules les poignées apparaissent ou disparaissent
 
     def set_crop_mode(self, checked):
         """Activer ou désactiver le mode rognage."""
         self.crop_mode = checked
-        self.update() # Redessiner pour changer la couleur des poignées
+        self.update(self.handles_region()) # Redessiner pour afficher ou cacher les poignées
+
+    def handles_region(self):
+        """Zone couverte par les poignées, à repeindre quand elles changent"""
+        region = QRegion()
+        for handle_rect in self.handles.values():
+            region += handle_rect.adjusted(-1, -1, 1, 1)
+        return region
 
 
     def update_handles(self):
@@ -80,10 +106,89 @@ class InteractiveSvgWidget(QFrame):
         self.handles[self.HANDLE_BOTTOM] = QRect(rect.width() // 2 - handle_size // 2, rect.height() - handle_size, handle_size, handle_size)
         self.handles[self.HANDLE_BOTTOM_RIGHT] = QRect(rect.width() - handle_size, rect.height() - handle_size, handle_size, handle_size)
     
+    def set_svg_source(self, svg_path):
+        """Utiliser le renderer partagé de svg_path (sans changer la taille du widget)"""
+        self.release_renderer()
+        self.reset_interaction()
+        self.svg_path = svg_path
+        self.crop_stack = []
+        self.slide_placement = None
+        self.renderer = svg_renderer_pool.acquire(svg_path) if svg_path else QSvgRenderer(self)
+        self.renderer_release = svg_renderer_pool.bind(self.renderer, self)
+        self.renderer.repaintNeeded.connect(self.invalidate_svg_pixmap)
+        self.svg_pixmap = None
+        self.update()
+
+    def reset_interaction(self):
+        """Oublier la sélection et le geste en cours (widget neuf ou réutilisé pour un autre SVG)"""
+        self.is_active = False # Pour savoir si le widget est sélectionné
+        self.active_handle = None
+        self.drag_start_pos = None
+        self.original_rect = None
+        self.crop_selection_rect = None
+        self.pending_geometry = None
+        self.frame_timer.stop()
+
+    def release_renderer(self):
+        """Rendre le renderer partagé au pool (fait aussi à la destruction du widget s'il est oublié)"""
+        if self.renderer is None:
+            return
+        try:
+            self.renderer.repaintNeeded.disconnect(self.invalidate_svg_pixmap)
+        except TypeError:
+            pass
+        self.renderer_release()
+        self.renderer = None
+        self.svg_pixmap = None
+
+    def invalidate_svg_pixmap(self):
+        """Le contenu du SVG a changé : le pixmap sera recalculé au prochain affichage"""
+        self.svg_pixmap = None
+        self.update()
+
+    def refresh_svg_pixmap(self):
+        """Fin du geste de redimensionnement : re-rasteriser à la nouvelle taille"""
+        self.resize_timer.stop()
+        self.svg_pixmap = None
+        self.update()
+
+    def render_svg_pixmap(self):
+        """Rendre le SVG dans un QPixmap de la taille du widget en pixels physiques"""
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap(max(1, round(self.width() * dpr)), max(1, round(self.height() * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        if self.crop_stack:
+            # Le renderer est partagé : appliquer notre rognage le temps du rendu seulement
+            full_view_box = self.renderer.viewBoxF()
+            self.renderer.setViewBox(self.crop_stack[-1])
+            self.renderer.render(painter, QRectF(0, 0, self.width(), self.height()))
+            self.renderer.setViewBox(full_view_box)
+        else:
+            self.renderer.render(painter, QRectF(0, 0, self.width(), self.height()))
+        painter.end()
+        return pixmap
+
+    def draw_svg(self, painter):
+        """Copier le SVG depuis le cache raster, en le recalculant si besoin"""
+        pixmap = self.svg_pixmap
+        stale = (pixmap is None or pixmap.devicePixelRatioF() != self.devicePixelRatioF())
+        if not stale and pixmap.size() != QSize(round(self.width() * pixmap.devicePixelRatioF()),
+                                                round(self.height() * pixmap.devicePixelRatioF())):
+            # Taille différente : redimensionnement en cours, on étire l'ancien rendu
+            if self.resize_timer.isActive():
+                painter.drawPixmap(self.rect(), pixmap)
+                return
+            stale = True
+        if stale:
+            self.svg_pixmap = pixmap = self.render_svg_pixmap()
+        painter.drawPixmap(0, 0, pixmap)
+
     def load_svg(self, svg_path):
         """Charger un nouveau fichier SVG"""
-        self.svg_path = svg_path
-        self.renderer.load(svg_path)
+        self.set_svg_source(svg_path)
         
         # Réinitialiser les dimensions et les poignées
         new_size = self.renderer.defaultSize()
@@ -98,10 +203,9 @@ class InteractiveSvgWidget(QFrame):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         
-        # 1. Dessiner le SVG en premier
-        if self.renderer.isValid():
-            # Correction: Convertir le QRect en QRectF
-            self.renderer.render(painter, QRectF(self.rect()))
+        # 1. Dessiner le SVG en premier (depuis le cache raster)
+        if self.renderer is not None and self.renderer.isValid():
+            self.draw_svg(painter)
         
         # 2. Dessiner le rectangle de rognage par-dessus
         if self.crop_mode and self.is_active and self.crop_selection_rect:
@@ -120,40 +224,41 @@ class InteractiveSvgWidget(QFrame):
     
     def mousePressEvent(self, event):
         """Gérer le clic de souris pour commencer une action."""
-        print(f"\n--- mousePressEvent sur {self.svg_path.split('/')[-1]} ---")
+        logger.debug("mousePressEvent sur %s", self.svg_path)
         
         # Notifier le parent (SlideEditor) que ce widget a été cliqué
         # Cela va mettre self.is_active à True
         if self.parent() and hasattr(self.parent(), 'editor'):
             self.parent().editor.setActiveWidget(self)
         
-        print(f"Widget actif: {self.is_active}, Mode rognage: {self.crop_mode}")
+        logger.debug("Widget actif: %s, Mode rognage: %s", self.is_active, self.crop_mode)
 
         # --- CORRECTION : La logique d'interaction est déplacée ici ---
         # On vérifie si le clic est le bouton gauche et si le widget est MAINTENANT actif
         if event.button() == Qt.LeftButton and self.is_active:
             # CAS 1: Si on est en mode rognage, on commence à dessiner le rectangle
             if self.crop_mode:
-                print("Action: Début du rognage")
+                logger.debug("Action: Début du rognage")
                 self.crop_selection_rect = QRect(event.pos(), QSize())
-                self.update()
                 # On stocke l'état pour mouseMoveEvent mais on ne fait rien d'autre
                 return
 
+            # Les positions sont globales : le widget peut avoir bougé depuis le clic
+            # (poignées gauche et haute), pas le pointeur
+            self.drag_start_pos = event.globalPos()
+            self.original_rect = self.geometry()
+            self.frame_timer.setInterval(self.frame_interval_ms())
+
             # CAS 2: On vérifie si on clique sur une poignée pour redimensionner
             for handle_id, handle_rect in self.handles.items():
                 if handle_rect.contains(event.pos()):
-                    print(f"Action: Début du redimensionnement (poignée {handle_id})")
+                    logger.debug("Action: Début du redimensionnement (poignée %s)", handle_id)
                     self.active_handle = handle_id
-                    self.drag_start_pos = event.pos()
-                    self.original_rect = self.geometry()
                     return
             
             # CAS 3: Si on ne clique pas sur une poignée, on prépare le déplacement
-            print("Action: Début du déplacement")
+            logger.debug("Action: Début du déplacement")
             self.active_handle = -1
-            self.drag_start_offset = event.pos()
-            self.original_rect = self.geometry()
             return # On a traité l'événement
 
     def setGeometry(self, rect):
@@ -165,76 +270,93 @@ class InteractiveSvgWidget(QFrame):
         """Gérer le redimensionnement pour mettre à jour le SVG et les poignées."""
         super().resizeEvent(event)
         self.update_handles()
+        # Re-rasteriser seulement quand le redimensionnement s'arrête
+        if self.svg_pixmap is not None:
+            self.resize_timer.start()
+
+    def frame_interval_ms(self):
+        """Durée d'une image de l'écran du widget (16 ms à 60 Hz)"""
+        screen = self.screen() if hasattr(self, 'screen') else QGuiApplication.primaryScreen()
+        refresh_rate = screen.refreshRate() if screen else 0
+        return max(1, int(1000 / (refresh_rate or self.FALLBACK_REFRESH_RATE)))
+
+    def apply_pending_geometry(self):
+        """Appliquer la dernière géométrie demandée pendant le geste (une fois par image)"""
+        self.frame_timer.stop()
+        if self.pending_geometry is None:
+            return
+        geometry, self.pending_geometry = self.pending_geometry, None
+        if geometry.size() == self.size():
+            self.move(geometry.topLeft())  # Qt ne repeint que les zones découvertes
+        else:
+            self.setGeometry(geometry)
 
     def mouseMoveEvent(self, event):
-        """Gérer le déplacement de souris pour mettre à jour en temps réel"""
+        """
+        Gérer le déplacement de souris pendant un rognage, un déplacement ou un redimensionnement
+
+        Une souris rapide envoie bien plus d'événements que l'écran n'affiche
+        d'images : la géométrie demandée est gardée et appliquée au plus une
+        fois par image par frame_timer.
+        """
         if not self.is_active:
             return
 
         # CAS 1: L'utilisateur dessine un rectangle de rognage
         if self.crop_mode and self.crop_selection_rect is not None:
-            # print("Déplacement: Dessin du rectangle de rognage") # Optionnel, peut être très verbeux
+            # Ne repeindre que l'ancien et le nouveau rectangle (plus l'épaisseur du trait)
+            dirty = self.crop_selection_rect.normalized()
             self.crop_selection_rect.setBottomRight(event.pos())
-            self.update()
+            dirty = dirty.united(self.crop_selection_rect.normalized())
+            self.update(dirty.adjusted(-2, -2, 2, 2))
             return
 
         # CAS 2 & 3: L'utilisateur déplace ou redimensionne le widget
-        if self.active_handle is not None:
-            if self.active_handle == -1:
-                # print("Déplacement: Mouvement du widget") # Optionnel
-                parent_coords = self.mapToParent(event.pos())
-                self.move(parent_coords - self.drag_start_offset)
+        if self.active_handle is None or self.drag_start_pos is None:
+            return
+        delta = event.globalPos() - self.drag_start_pos
+        new_rect = QRect(self.original_rect)
+        if self.active_handle == -1:
+            new_rect.translate(delta)
+        else:
+            dx, dy = delta.x(), delta.y()
+            if self.active_handle in (self.HANDLE_TOP_LEFT, self.HANDLE_LEFT, self.HANDLE_BOTTOM_LEFT): new_rect.setLeft(self.original_rect.left() + dx)
+            if self.active_handle in (self.HANDLE_TOP_LEFT, self.HANDLE_TOP, self.HANDLE_TOP_RIGHT): new_rect.setTop(self.original_rect.top() + dy)
+            if self.active_handle in (self.HANDLE_TOP_RIGHT, self.HANDLE_RIGHT, self.HANDLE_BOTTOM_RIGHT): new_rect.setRight(self.original_rect.right() + dx)
+            if self.active_handle in (self.HANDLE_BOTTOM_LEFT, self.HANDLE_BOTTOM, self.HANDLE_BOTTOM_RIGHT): new_rect.setBottom(self.original_rect.bottom() + dy)
+            if new_rect.width() <= 20 or new_rect.height() <= 20:
                 return
-            else:
-                # print("Déplacement: Redimensionnement du widget") # Optionnel
-                dx = event.pos().x() - self.drag_start_pos.x()
-                dy = event.pos().y() - self.drag_start_pos.y()
-                new_rect = QRect(self.original_rect)
-
-                if self.active_handle in (self.HANDLE_TOP_LEFT, self.HANDLE_LEFT, self.HANDLE_BOTTOM_LEFT): new_rect.setLeft(self.original_rect.left() + dx)
-                if self.active_handle in (self.HANDLE_TOP_LEFT, self.HANDLE_TOP, self.HANDLE_TOP_RIGHT): new_rect.setTop(self.original_rect.top() + dy)
-                if self.active_handle in (self.HANDLE_TOP_RIGHT, self.HANDLE_RIGHT, self.HANDLE_BOTTOM_RIGHT): new_rect.setRight(self.original_rect.right() + dx)
-                if self.active_handle in (self.HANDLE_BOTTOM_LEFT, self.HANDLE_BOTTOM, self.HANDLE_BOTTOM_RIGHT): new_rect.setBottom(self.original_rect.bottom() + dy)
-                
-                if new_rect.width() > 20 and new_rect.height() > 20:
-                    self.setGeometry(new_rect)
-                    self.update()
+
+        self.pending_geometry = new_rect
+        if not self.frame_timer.isActive():
+            self.frame_timer.start()
 
     def mouseReleaseEvent(self, event):
         """Terminer l'action lors du relâchement de la souris"""
-        print(f"--- mouseReleaseEvent sur {self.svg_path.split('/')[-1]} ---")
+        logger.debug("mouseReleaseEvent sur %s", self.svg_path)
         if not self.is_active or event.button() != Qt.LeftButton:
-            print("Release ignoré (inactif ou pas le bouton gauche)")
+            logger.debug("Release ignoré (inactif ou pas le bouton gauche)")
             return
 
         # CAS 1: Fin du rognage
         if self.crop_mode and self.crop_selection_rect and self.crop_selection_rect.isValid():
-            print("Action: Fin du rognage, application...")
-            crop_rect_normalized = self.crop_selection_rect.normalized()
-            
-            orig_size = self.renderer.defaultSize()
-            if self.rect().width() == 0 or self.rect().height() == 0: return # Eviter division par zéro
-            scale_x = orig_size.width() / self.rect().width()
-            scale_y = orig_size.height() / self.rect().height()
-            
-            crop_rect_svg = QRect(
-                int(crop_rect_normalized.x() * scale_x),
-                int(crop_rect_normalized.y() * scale_y),
-                int(crop_rect_normalized.width() * scale_x),
-                int(crop_rect_normalized.height() * scale_y)
-            )
-            
-            self.crop_svg(crop_rect_svg)
+            logger.debug("Action: Fin du rognage, application...")
+            # Limiter la sélection au widget
+            self.crop_svg(self.crop_selection_rect.normalized().intersected(self.rect()))
             self.crop_selection_rect = None
             self.update()
             return
 
         # CAS 2 & 3: Fin du déplacement ou du redimensionnement
-        print("Action: Fin du déplacement/redimensionnement, réinitialisation de l'état.")
+        logger.debug("Action: Fin du déplacement/redimensionnement, réinitialisation de l'état.")
+        # La dernière position demandée est appliquée tout de suite
+        self.apply_pending_geometry()
+        if self.resize_timer.isActive():
+            # Le geste est fini, inutile d'attendre le délai
+            self.refresh_svg_pixmap()
         self.active_handle = None
         self.drag_start_pos = None
         self.original_rect = None
-        self.update()
 
     def toggle_mode(self):
         """Basculer entre le mode redimensionnement et rognage"""
@@ -245,72 +367,69 @@ class InteractiveSvgWidget(QFrame):
         """Obtenir les dimensions actuelles du widget SVG"""
         return self.svg_rect.size()
     
-    def crop_svg(self, crop_rect):
+    def crop_svg(self, selection):
         """
-        Rogner le SVG en modifiant le viewBox sans changer la taille d'affichage
-        
+        Rogner le SVG sur une zone du widget, sans toucher au fichier
+
+        Le rognage est un viewBox appliqué au moment du rendu : pas de lecture
+        ni d'écriture de fichier. Les rognages successifs s'empilent dans
+        crop_stack et undo_crop revient au précédent. Le widget prend la
+        position et la taille de la zone, le contenu garde son échelle.
+
         Args:
-            crop_rect (QRect): Rectangle de rognage dans les coordonnées du SVG original
+            selection (QRect): Zone à garder, en coordonnées du widget
+
+        Returns:
+            QRectF: Le nouveau viewBox, ou None si rien n'a été rogné
         """
-        if not self.svg_path:
-            return
-            
-        try:
-            # Sauvegarder les dimensions actuelles d'affichage
-            current_display_size = self.size()
-            
-            # Créer un nouveau nom de fichier pour le SVG rogné
-            file_dir = os.path.dirname(self.svg_path)
-            file_name = os.path.basename(self.svg_path)
-            base_name, ext = os.path.splitext(file_name)
-            cropped_path = os.path.join(file_dir, f"{base_name}_cropped{ext}")
-            
-            # Charger et analyser le SVG
-            tree = ET.parse(self.svg_path)
-            root = tree.getroot()
-            
-            # Obtenir le viewBox actuel
-            view_box = root.attrib.get('viewBox', '0 0 100 100')
-            view_box_parts = list(map(float, view_box.split()))
-            
-            # Ajuster les coordonnées de rognage en fonction du viewBox existant
-            if len(view_box_parts) == 4:
-                orig_x, orig_y, orig_width, orig_height = view_box_parts
-                
-                # Calculer le nouveau viewBox
-                new_x = orig_x + crop_rect.x()
-                new_y = orig_y + crop_rect.y()
-                new_width = crop_rect.width()
-                new_height = crop_rect.height()
-                
-                # Mettre à jour l'attribut viewBox
-                new_view_box = f"{new_x} {new_y} {new_width} {new_height}"
-                root.attrib['viewBox'] = new_view_box
-                
-                # IMPORTANT: Ne pas modifier les attributs width et height du SVG
-                # Cela préserve la taille d'affichage tout en modifiant la zone visible
-                
-                # Enregistrer le SVG rogné
-                tree.write(cropped_path)
-                
-                # Recharger le SVG et redimensionner le widget à la nouvelle taille
-                self.svg_path = cropped_path
-                self.renderer.load(cropped_path)
-                
-                # Redimensionner le widget pour qu'il corresponde au contenu rogné
-                if self.renderer.isValid():
-                    new_size = self.renderer.defaultSize()
-                    if not new_size.isEmpty():
-                        self.resize(new_size)
-                
-                self.update()
-                return cropped_path
-                
-            else:
-                print("Format de viewBox non reconnu.")
-                return None
-                
-        except Exception as e:
-            print(f"Erreur lors du rognage du SVG: {e}")
+        if self.renderer is None or not self.renderer.isValid() or selection.isEmpty() or self.rect().isEmpty():
             return None
 
+        view_box = self.view_box()
+        scale_x = view_box.width() / self.width()
+        scale_y = view_box.height() / self.height()
+        crop_view_box = QRectF(view_box.x() + selection.x() * scale_x,
+                               view_box.y() + selection.y() * scale_y,
+                               selection.width() * scale_x,
+                               selection.height() * scale_y)
+        self.crop_stack.append(crop_view_box)
+        self.set_view_geometry(selection.translated(self.pos()))
+        return crop_view_box
+
+    def undo_crop(self):
+        """Annuler le dernier rognage ; retourne False s'il n'y en a pas"""
+        if not self.crop_stack or self.rect().isEmpty():
+            return False
+        cropped = self.crop_stack.pop()
+        restored = self.view_box()
+        # Agrandir le widget autour de la zone rognée, à l'échelle actuelle
+        scale_x = self.width() / cropped.width()
+        scale_y = self.height() / cropped.height()
+        self.set_view_geometry(QRect(
+            round(self.x() + (restored.x() - cropped.x()) * scale_x),
+            round(self.y() + (restored.y() - cropped.y()) * scale_y),
+            round(restored.width() * scale_x),
+            round(restored.height() * scale_y)))
+        return True
+
+    def set_crop_stack(self, crop_stack):
+        """Remplacer les rognages (restauration d'une slide), la géométrie est gérée à part"""
+        if list(crop_stack) == self.crop_stack:
+            return
+        self.crop_stack = list(crop_stack)
+        self.svg_pixmap = None
+        self.update()
+
+    def view_box(self):
+        """Partie du document affichée : le dernier rognage, ou le viewBox complet"""
+        if self.crop_stack:
+            return self.crop_stack[-1]
+        return self.renderer.viewBoxF()
+
+    def set_view_geometry(self, geometry):
+        """Appliquer la géométrie d'un rognage et re-rasteriser immédiatement"""
+        self.svg_pixmap = None  # Pas de pixmap étiré pendant un rognage
+        self.setGeometry(geometry)
+        self.update_handles()
+        self.update()
+
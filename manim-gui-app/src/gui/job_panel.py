@@ -0,0 +1,97 @@
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+                             QTreeWidget, QTreeWidgetItem, QAbstractItemView)
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor
+from src.gui.conversion_scheduler import ConversionJob, ConversionScheduler
+
+
+class JobPanel(QWidget):
+    """Liste des conversions en attente, en cours, terminées ou échouées"""
+
+    STATE_COLORS = {
+        ConversionJob.RUNNING: QColor(0, 90, 200),
+        ConversionJob.FAILED: QColor(200, 0, 0),
+        ConversionJob.CANCELLED: QColor(128, 128, 128),
+    }
+    PRIORITY_NAMES = {
+        ConversionScheduler.PRIORITY_INTERACTIVE: "interactive",
+        ConversionScheduler.PRIORITY_CURRENT_PAGE: "current page",
+        ConversionScheduler.PRIORITY_BATCH: "batch",
+    }
+
+    def __init__(self, scheduler, parent=None):
+        super().__init__(parent)
+        self.scheduler = scheduler
+        self.items = {}  # job_id -> QTreeWidgetItem
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Job", "State", "Priority", "Error"])
+        self.tree.setRootIsDecorated(False)
+        self.tree.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.tree.setColumnWidth(0, 300)
+        layout.addWidget(self.tree)
+
+        buttons = QHBoxLayout()
+        self.summary_label = QLabel()
+        buttons.addWidget(self.summary_label)
+        buttons.addStretch()
+        cancel_button = QPushButton("Cancel Selected")
+        cancel_button.clicked.connect(self.cancel_selected)
+        buttons.addWidget(cancel_button)
+        clear_button = QPushButton("Clear Finished")
+        clear_button.clicked.connect(self.clear_finished)
+        buttons.addWidget(clear_button)
+        layout.addLayout(buttons)
+
+        scheduler.job_added.connect(self.add_job)
+        scheduler.job_changed.connect(self.update_job)
+        for job in scheduler.jobs:
+            self.add_job(job)
+        self.update_summary()
+
+    def add_job(self, job):
+        item = QTreeWidgetItem([job.description(), "", "", ""])
+        item.setData(0, Qt.UserRole, job.job_id)
+        self.items[job.job_id] = item
+        self.tree.addTopLevelItem(item)
+        self.update_job(job)
+
+    def update_job(self, job):
+        item = self.items.get(job.job_id)
+        if item is None:
+            return
+        item.setText(1, job.state)
+        item.setText(2, self.PRIORITY_NAMES.get(job.priority, str(job.priority)))
+        item.setText(3, job.error or "")
+        item.setToolTip(0, "\n".join(job.output_paths))
+        color = self.STATE_COLORS.get(job.state)
+        for column in range(item.columnCount()):
+            item.setData(column, Qt.ForegroundRole, color)
+        self.update_summary()
+
+    def update_summary(self):
+        counts = {}
+        for job in self.scheduler.jobs:
+            counts[job.state] = counts.get(job.state, 0) + 1
+        states = [ConversionJob.QUEUED, ConversionJob.RUNNING, ConversionJob.FAILED]
+        self.summary_label.setText(", ".join(f"{counts.get(state, 0)} {state}" for state in states))
+
+    def selected_jobs(self):
+        selected = {item.data(0, Qt.UserRole) for item in self.tree.selectedItems()}
+        return [job for job in self.scheduler.jobs if job.job_id in selected]
+
+    def cancel_selected(self):
+        self.scheduler.cancel(self.selected_jobs())
+
+    def clear_finished(self):
+        """Retire les tâches terminées de la liste"""
+        self.scheduler.clear_finished()
+        remaining = {job.job_id for job in self.scheduler.jobs}
+        for job_id in list(self.items):
+            if job_id not in remaining:
+                item = self.items.pop(job_id)
+                self.tree.takeTopLevelItem(self.tree.indexOfTopLevelItem(item))
+        self.update_summary()
@@ -1,11 +1,22 @@
-from PyQt5.QtWidgets import QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QSplitter, QListWidget, QLabel, QToolBar, QAction, QFileDialog, QMessageBox
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QSplitter, QListWidget, QLabel, QToolBar, QAction, QFileDialog, QMessageBox, QDockWidget, QDialog
+from PyQt5.QtCore import Qt, QRect, QRectF
 from src.gui.pdf_viewer import PdfViewer
 from src.gui.slide_list import SlideList
-from src.gui.slide_editor import SlideEditor
+from src.gui.slide_editor import SLIDE_RECT, SlideEditor, ingest_inserted_svg, map_rect
+from src.gui.fragment_picker_dialog import FragmentPickerDialog
+from src.gui.slide_canvas import SlideCanvasEditor
 from src.gui.toolbar import Toolbar
-from src.core.inkscape_interface import InkscapeInterface
+from src.gui.thumbnail_strip import ThumbnailStrip
+from src.core.thumbnail_cache import ThumbnailCache
+from src.core.svg_fragments import PageFragments
+from src.core.project_file import PROJECT_EXTENSION
+from src.utils.file_utils import load_project_file, save_project_file
+from src.gui.batch_dialog import BatchExtractDialog
+from src.gui.conversion_scheduler import ConversionScheduler, ConversionJob
+from src.gui.job_panel import JobPanel
+from src.gui.svg_ingester import SvgIngester, log_ingest_report
 import os
+import shutil
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -13,12 +24,26 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("Manim GUI Application")
         self.setGeometry(100, 100, 1200, 800)
         
-        # Initialize InkscapeInterface
-        self.inkscape_interface = InkscapeInterface()
+        # Conversions run in background processes (each with its Inkscape shells and the SVG cache),
+        # the window stays responsive
+        inkscape_path = shutil.which("inkscape") or "inkscape"
+        self.conversion_scheduler = ConversionScheduler(inkscape_path, parent=self)
+        self.conversion_scheduler.job_finished.connect(self.on_conversion_finished)
+        self.interactive_jobs = {}  # job_id -> ConversionJob requested from the extract actions
+
+        # Inserted SVGs are simplified in a background thread before reaching the slide
+        self.svg_ingester = SvgIngester(self)
+        self.svg_ingester.svg_ingested.connect(self.on_svg_ingested)
+        self.svg_ingester.ingest_failed.connect(
+            lambda svg_path, error: QMessageBox.critical(self, "Error", f"Could not read {svg_path}: {error}"))
         
         # Initialize current PDF path
         self.current_pdf_path = None
         self.slide_data = {}
+        # Opened project: slides not shown yet stay as manifest entries, their SVGs unextracted
+        self.project = None
+        self.project_path = None
+        self.pending_slides = {}
 
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
@@ -60,10 +85,21 @@ class MainWindow(QMainWindow):
         self.pdf_layout = QHBoxLayout(self.pdf_container)
         self.pdf_layout.setContentsMargins(0, 0, 0, 0)
         
-        # Two PDF viewers side by side
-        self.pdf_viewer_left = PdfViewer()
-        self.pdf_viewer_right = PdfViewer()
+        # Two PDF viewers side by side, using the thumbnails as instant previews
+        self.thumbnail_cache = ThumbnailCache()
+        self.pdf_viewer_left = PdfViewer(self.thumbnail_cache)
+        self.pdf_viewer_right = PdfViewer(self.thumbnail_cache)
+
+        # Page thumbnails driving the left viewer
+        self.thumbnail_strip = ThumbnailStrip(thumbnail_cache=self.thumbnail_cache)
+        self.thumbnail_strip.page_selected.connect(lambda index: self.pdf_viewer_left.go_to_page(index + 1))
+        self.pdf_viewer_left.page_changed.connect(self.thumbnail_strip.set_current_page)
+        # Queued conversions of the page being viewed go first
+        self.pdf_viewer_left.page_changed.connect(
+            lambda index: self.conversion_scheduler.prioritize_page(self.current_pdf_path, index + 1)
+            if self.current_pdf_path else None)
         
+        self.pdf_layout.addWidget(self.thumbnail_strip)
         self.pdf_layout.addWidget(self.pdf_viewer_left)
         self.pdf_layout.addWidget(self.pdf_viewer_right)
         
@@ -73,8 +109,20 @@ class MainWindow(QMainWindow):
         self.main_splitter.setSizes([200, 1000])  # Slide list narrower than content
         self.vertical_splitter.setSizes([600, 400])  # Editor larger than PDFs
         
+        # Panel listing the queued, running and failed conversions
+        self.job_panel = JobPanel(self.conversion_scheduler)
+        self.job_dock = QDockWidget("Conversions", self)
+        self.job_dock.setWidget(self.job_panel)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.job_dock)
+        
         # Add extra actions to the toolbar for Inkscape operations
         self.add_inkscape_actions()
+        
+        # Alternate slide editor for slides with many objects (zoom and pan)
+        self.canvas_action = QAction("Graphics Canvas", self)
+        self.canvas_action.setCheckable(True)
+        self.canvas_action.toggled.connect(self.set_slide_canvas)
+        self.toolbar.addAction(self.canvas_action)
         self.add_slide()
 
     def on_slide_changed(self, current, previous):
@@ -87,14 +135,113 @@ class MainWindow(QMainWindow):
         if current:
             # Charger l'état de la nouvelle slide
             current_slide_name = current.text()
-            slide_content = self.slide_data.get(current_slide_name, [])
+            slide_content = self.get_slide_data(current_slide_name)
             self.selected_slide.load_slide_content(slide_content)
 
+    def get_slide_data(self, slide_name):
+        """Contenu d'une slide ; celui d'une slide du projet ouvert est extrait au premier affichage."""
+        pending = self.pending_slides.pop(slide_name, None)
+        if pending is not None:
+            slide_rect = QRectF(0, 0, *self.project.slide_size)
+            content = []
+            for svg_object in pending:
+                path = self.project.asset_path(svg_object['asset'])
+                if path is None:
+                    continue
+                content.append({
+                    'path': path,
+                    'geometry': map_rect(QRectF(*svg_object['geometry']), slide_rect, SLIDE_RECT),
+                    'crop': [QRectF(*view_box) for view_box in svg_object['crop']]
+                })
+            self.slide_data[slide_name] = content
+        return self.slide_data.get(slide_name, [])
+
+    def set_slide_canvas(self, enabled):
+        """Switch the slide editor between the widget editor and the QGraphicsScene canvas"""
+        content = self.selected_slide.get_slide_content()
+        editor = SlideCanvasEditor(self) if enabled else SlideEditor(self)
+        previous = self.selected_slide
+        self.vertical_splitter.replaceWidget(self.vertical_splitter.indexOf(previous), editor)
+        # Give the shared renderers back before the old editor goes away
+        previous.load_slide_content([])
+        previous.deleteLater()
+        self.selected_slide = editor
+        editor.load_slide_content(content)
+
     def get_current_slide_name(self):
         """Retourne le nom de la slide actuellement sélectionnée."""
-        current_item = self.slide_list.currentItem()
+        current_item = self.slide_list.slide_list_widget.currentItem()
         return current_item.text() if current_item else None
 
+    def open_project(self):
+        """Open a project file: the slide list comes from its manifest, the SVGs are extracted when shown"""
+        file_path, _ = QFileDialog.getOpenFileName(self, "Open Project", "",
+                                                   f"Manim GUI Projects (*{PROJECT_EXTENSION})")
+        if not file_path:
+            return
+        project = load_project_file(file_path)
+        if project is None:
+            QMessageBox.critical(self, "Error", f"Could not open project {file_path}")
+            return
+        self.project = project
+        self.project_path = file_path
+        self.slide_data = {}
+        self.pending_slides = {slide['name']: slide['objects'] for slide in project.slides}
+
+        list_widget = self.slide_list.slide_list_widget
+        # No on_slide_changed while the list is rebuilt: it would store the old slide under its name
+        list_widget.blockSignals(True)
+        self.slide_list.clear_slides()
+        list_widget.addItems([slide['name'] for slide in project.slides])
+        list_widget.setCurrentRow(-1)
+        list_widget.blockSignals(False)
+        self.selected_slide.load_slide_content([])
+        list_widget.setCurrentRow(0)
+        self.setWindowTitle(f"Manim GUI Application - {os.path.basename(file_path)}")
+
+    def save_project(self):
+        """Save every slide, with its SVG files bundled, to a project file"""
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save Project",
+                                                   self.project_path or f"project{PROJECT_EXTENSION}",
+                                                   f"Manim GUI Projects (*{PROJECT_EXTENSION})")
+        if not file_path:
+            return
+        if not file_path.endswith(PROJECT_EXTENSION):
+            file_path += PROJECT_EXTENSION
+        current_name = self.get_current_slide_name()
+        if current_name:
+            self.slide_data[current_name] = self.selected_slide.get_slide_content()
+
+        slides = []
+        list_widget = self.slide_list.slide_list_widget
+        for row in range(list_widget.count()):
+            name = list_widget.item(row).text()
+            if name in self.pending_slides:
+                # Never shown since the project was opened: saved as it was, without extracting it
+                objects = self.pending_slides[name]
+            else:
+                objects = [{
+                    'path': svg_data['path'],
+                    'geometry': [svg_data['geometry'].x(), svg_data['geometry'].y(),
+                                 svg_data['geometry'].width(), svg_data['geometry'].height()],
+                    'crop': [[view_box.x(), view_box.y(), view_box.width(), view_box.height()]
+                             for view_box in svg_data['crop']]
+                } for svg_data in self.slide_data.get(name, [])]
+            slides.append({'name': name, 'objects': objects})
+
+        if not save_project_file(file_path, slides, self.project):
+            QMessageBox.critical(self, "Error", f"Could not save project {file_path}")
+            return
+        # Later saves copy the unextracted assets from the file just written
+        project = load_project_file(file_path)
+        if project is not None:
+            if self.project is not None:
+                project.extracted.update(self.project.extracted)
+            self.project = project
+        self.project_path = file_path
+        self.setWindowTitle(f"Manim GUI Application - {os.path.basename(file_path)}")
+        self.statusBar().showMessage(f"Project saved to {file_path}", 5000)
+
     # Le reste du code reste inchangé...
     def open_pdf(self):
         file_dialog = QFileDialog()
@@ -104,6 +251,7 @@ class MainWindow(QMainWindow):
             self.current_pdf_path = file_path
             self.pdf_viewer_left.load_pdf(file_path)  # Updated from pdf_viewer_top
             self.pdf_viewer_right.load_pdf(file_path)  # Updated from pdf_viewer_bottom
+            self.thumbnail_strip.set_document(self.pdf_viewer_left.pdf_document)
  
     def extract_current_page_as_svg(self):
         """Extract the currently visible page as SVG using Inkscape"""
@@ -111,19 +259,16 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "No PDF Loaded", "Please open a PDF file first.")
             return
             
-        # Get the current page number from the top viewer
-        page_num = self.pdf_viewer_top.current_page + 1  # +1 because PDF page numbers are 1-based
+        # Get the current page number from the left viewer
+        page_num = self.pdf_viewer_left.current_page + 1  # +1 because PDF page numbers are 1-based
         
         # Ask user where to save the SVG
         file_dialog = QFileDialog()
         svg_path, _ = file_dialog.getSaveFileName(self, "Save SVG File", f"page_{page_num}.svg", "SVG Files (*.svg)")
         
         if svg_path:
-            # Use InkscapeInterface to convert PDF page to SVG
-            if self.inkscape_interface.pdf_to_svg(self.current_pdf_path, page_num, svg_path):
-                QMessageBox.information(self, "Success", f"Page {page_num} extracted as SVG successfully.")
-            else:
-                QMessageBox.critical(self, "Error", "Failed to extract page as SVG.")
+            # Convert in the background, ahead of any batch work
+            self.submit_interactive_job(page_num, svg_path, simplify=False)
     
     def extract_simplified_svg(self):
         """Extract the current page as a simplified SVG (with objects converted to paths)"""
@@ -131,8 +276,8 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "No PDF Loaded", "Please open a PDF file first.")
             return
             
-        # Get the current page number from the top viewer
-        page_num = self.pdf_viewer_top.current_page + 1  # +1 because PDF page numbers are 1-based
+        # Get the current page number from the left viewer
+        page_num = self.pdf_viewer_left.current_page + 1  # +1 because PDF page numbers are 1-based
         
         # Ask user where to save the SVG
         file_dialog = QFileDialog()
@@ -140,16 +285,38 @@ class MainWindow(QMainWindow):
                                               f"simplified_page_{page_num}.svg", "SVG Files (*.svg)")
         
         if svg_path:
-            # Create a temporary filename for the intermediate SVG
-            temp_svg = os.path.join(os.path.dirname(svg_path), f"temp_{os.path.basename(svg_path)}")
-            
-            # Use InkscapeInterface to convert PDF page to simplified SVG
-            if self.inkscape_interface.pdf_page_to_simplified_svg(
-                    self.current_pdf_path, page_num, temp_svg, svg_path):
-                QMessageBox.information(self, "Success", 
-                                       f"Page {page_num} extracted as simplified SVG successfully.")
-            else:
-                QMessageBox.critical(self, "Error", "Failed to extract simplified SVG.")
+            # Convert in the background, ahead of any batch work
+            self.submit_interactive_job(page_num, svg_path, simplify=True)
+    
+    def submit_interactive_job(self, page_num, svg_path, simplify):
+        """Queue a conversion requested by the user with the highest priority"""
+        job = self.conversion_scheduler.submit(self.current_pdf_path, page_num, svg_path, simplify=simplify,
+                                               priority=ConversionScheduler.PRIORITY_INTERACTIVE)
+        self.interactive_jobs[job.job_id] = job
+        self.statusBar().showMessage(f"Extracting page {page_num}...")
+        if job.is_finished:
+            self.on_conversion_finished(job)
+    
+    def on_conversion_finished(self, job):
+        """Report the end of the conversions requested from the extract actions"""
+        if self.interactive_jobs.pop(job.job_id, None) is None:
+            return
+        if job.state == ConversionJob.DONE:
+            self.statusBar().showMessage(f"Page {job.page_number} extracted to {', '.join(job.output_paths)}", 10000)
+        elif job.state == ConversionJob.FAILED:
+            self.statusBar().clearMessage()
+            QMessageBox.critical(self, "Error", f"Failed to extract page {job.page_number} as SVG: {job.error}")
+    
+    def extract_all_pages(self):
+        """Extract a range of pages as simplified SVGs on every CPU core"""
+        if not self.current_pdf_path:
+            QMessageBox.warning(self, "No PDF Loaded", "Please open a PDF file first.")
+            return
+        
+        # Non-modal: the pages are converted in the background, the dialog only follows them
+        self.batch_dialog = BatchExtractDialog(self.current_pdf_path, len(self.pdf_viewer_left.pdf_document),
+                                               self.conversion_scheduler, self)
+        self.batch_dialog.show()
     
     def insert_svg_into_slide(self):
         """Insert an SVG file into the current slide"""
@@ -158,7 +325,38 @@ class MainWindow(QMainWindow):
         svg_path, _ = file_dialog.getOpenFileName(self, "Select SVG File", "", "SVG Files (*.svg)")
         
         if svg_path and hasattr(self.selected_slide, 'insert_svg'):
+            self.statusBar().showMessage(f"Preparing {os.path.basename(svg_path)}...")
             self.selected_slide.insert_svg(svg_path)
+
+    def insert_ingested_svg(self, svg_path, _prepared=None):
+        """Insert an SVG, once ingested, into the editor shown now (it may have been switched meanwhile)"""
+        self.selected_slide.insert_ingested_svg(svg_path)
+
+    def on_svg_ingested(self, svg_path, ingested_path, report):
+        """Report what the ingest stage did to an inserted SVG"""
+        message = log_ingest_report(svg_path, ingested_path, report)
+        if message:
+            self.statusBar().showMessage(message, 5000)
+        else:
+            self.statusBar().clearMessage()
+
+    def insert_fragments_into_slide(self):
+        """Insert chosen fragments (text lines, equations, figures) of a page SVG into the current slide"""
+        svg_path, _ = QFileDialog.getOpenFileName(self, "Select SVG File", "", "SVG Files (*.svg)")
+        if not svg_path or not hasattr(self.selected_slide, 'insert_fragments'):
+            return
+        # Ingesting and splitting a large page take seconds: both run in the ingest thread
+        self.statusBar().showMessage(f"Preparing {os.path.basename(svg_path)}...")
+        ingest_inserted_svg(svg_path, self, self.pick_fragments, prepare=PageFragments)
+
+    def pick_fragments(self, svg_path, page_fragments):
+        """Let the user choose the fragments of an ingested page and insert them"""
+        if not page_fragments.fragments:
+            self.statusBar().showMessage(f"No fragment found in {os.path.basename(svg_path)}", 5000)
+            return
+        dialog = FragmentPickerDialog(page_fragments, self)
+        if dialog.exec_() == QDialog.Accepted:
+            self.selected_slide.insert_fragments(page_fragments, dialog.selected_fragments())
     
     def add_slide(self):
         print("Adding new slide")
@@ -170,8 +368,12 @@ class MainWindow(QMainWindow):
         # Logique pour générer le code Manim
     
     def export_slide(self):
-        print("Exporting slide")
-        # Logique pour exporter une diapositive
+        """Write the SVGs of the current slide to a folder, with their crops applied"""
+        output_dir = QFileDialog.getExistingDirectory(self, "Export Slide To")
+        if not output_dir:
+            return
+        written = self.selected_slide.export_svgs(output_dir)
+        self.statusBar().showMessage(f"{len(written)} SVG files exported to {output_dir}", 10000)
     
     def add_animation(self, animation_type):
         print(f"Adding {animation_type} animation to slide")
@@ -188,7 +390,23 @@ class MainWindow(QMainWindow):
         self.extract_simplified_action.triggered.connect(self.extract_simplified_svg)
         self.toolbar.addAction(self.extract_simplified_action)
         
+        # Extract every page (or a range) as simplified SVGs
+        self.extract_all_action = QAction("Extract All Pages", self)
+        self.extract_all_action.triggered.connect(self.extract_all_pages)
+        self.toolbar.addAction(self.extract_all_action)
+        
         # Insert SVG into Slide action
         self.insert_svg_action = QAction("Insert SVG into Slide", self)
         self.insert_svg_action.triggered.connect(self.insert_svg_into_slide)
-        self.toolbar.addAction(self.insert_svg_action)
\ No newline at end of file
+        self.toolbar.addAction(self.insert_svg_action)
+
+        # Insert only some fragments of a page SVG
+        self.insert_fragments_action = QAction("Insert Fragments", self)
+        self.insert_fragments_action.triggered.connect(self.insert_fragments_into_slide)
+        self.toolbar.addAction(self.insert_fragments_action)
+
+    def closeEvent(self, event):
+        """Stop the background Inkscape processes when the window closes"""
+        self.conversion_scheduler.shutdown()
+        self.svg_ingester.shutdown()
+        super().closeEvent(event)
\ No newline at end of file
@@ -0,0 +1,144 @@
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from src.gui.image_utils import qimage_from_pixmap
+
+
+class RenderSignals(QObject):
+    """Signals emitted by the render tasks (QRunnable cannot emit by itself)."""
+    finished = pyqtSignal(object)
+
+
+class PageRenderTask(QRunnable):
+    """Rasterize a PDF page, or a clipped area of it, in a worker thread."""
+
+    def __init__(self, renderer, document, key, page_index, scale, clip, generation, prefetch):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.renderer = renderer
+        self.document = document
+        self.key = key
+        self.page_index = page_index
+        self.scale = scale
+        self.clip = clip
+        self.generation = generation
+        self.prefetch = prefetch
+        self.image = None
+
+    def run(self):
+        # The user may already have moved past this page while it was queued
+        if not self.renderer.is_wanted(self):
+            self.renderer.signals.finished.emit(self)
+            return
+        try:
+            # Premultiplied RGBA is handed over to Qt without copying the pixels
+            pix = self.document.render_pixmap(self.page_index, self.scale, self.clip, alpha=True)
+            self.image = qimage_from_pixmap(pix)
+        except Exception as e:
+            print(f"Error rendering page {self.page_index + 1}: {e}")
+        self.renderer.signals.finished.emit(self)
+
+
+class PageRenderer(QObject):
+    """
+    Render PDF pages off the GUI thread and deliver them as QImages.
+
+    Requests belong to a generation. The view starts a new generation each
+    time the set of visible pages or tiles changes, re-requests what it
+    still needs and calls drop_stale(): queued requests of older generations
+    are taken back from the pool and the ones already running are dropped
+    when they complete, so only what is currently shown reaches the viewer.
+    Prefetch results are always delivered so they can be cached.
+    """
+
+    # key, QImage; the image is passed as a Python object so that the
+    # MuPDF pixmap it points to stays attached to it
+    page_rendered = pyqtSignal(object, object)
+
+    PRIORITY_PREFETCH = 0
+    PRIORITY_VISIBLE = 1
+    PRIORITY_PREVIEW = 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.document = None
+        self.generation = 0
+        self.pending = {}  # key -> PageRenderTask
+        self.signals = RenderSignals(self)
+        self.signals.finished.connect(self.on_task_finished)
+        self.thread_pool = QThreadPool(self)
+        # The shared PdfDocument serializes rendering, more threads would only wait
+        self.thread_pool.setMaxThreadCount(1)
+
+    def set_document(self, document):
+        """Switch to another PdfDocument and forget everything requested so far."""
+        self.cancel_pending()
+        self.document = document
+        self.generation += 1
+
+    def new_generation(self):
+        """Start a new generation of requests; older ones become stale."""
+        self.generation += 1
+
+    def request(self, key, page_index, scale, clip=None, prefetch=False, priority=None):
+        """
+        Queue the rendering of a page in the current generation.
+
+        Args:
+            key: Identifier passed back with the rendered image
+            page_index (int): Page to render (0-based)
+            scale (float): Rendering scale (zoom * device pixel ratio)
+            clip (tuple, optional): Area of the page to render, in PDF points
+            prefetch (bool): Low priority request whose result is kept
+                even once it became stale
+            priority (int, optional): Pool priority, PRIORITY_PREFETCH or
+                PRIORITY_VISIBLE by default
+        """
+        if self.document is None:
+            return
+        if priority is None:
+            priority = self.PRIORITY_PREFETCH if prefetch else self.PRIORITY_VISIBLE
+
+        task = self.pending.get(key)
+        if task is not None:
+            # Already queued or running: attach it to the current generation
+            task.generation = self.generation
+            if task.prefetch and not prefetch:
+                task.prefetch = False
+                if self.thread_pool.tryTake(task):
+                    self.thread_pool.start(task, priority)
+            return
+
+        task = PageRenderTask(self, self.document, key, page_index, scale, clip,
+                              self.generation, prefetch)
+        self.pending[key] = task
+        self.thread_pool.start(task, priority)
+
+    def drop_stale(self):
+        """Take back the queued requests which were not renewed in this generation."""
+        for key, task in list(self.pending.items()):
+            if task.generation != self.generation and self.thread_pool.tryTake(task):
+                del self.pending[key]
+
+    def cancel_pending(self):
+        """Remove every queued task from the pool; running ones will be dropped."""
+        for key, task in list(self.pending.items()):
+            if self.thread_pool.tryTake(task):
+                del self.pending[key]
+
+    def is_wanted(self, task):
+        """Whether the result of a task is still useful."""
+        if task.document is not self.document:
+            return False
+        return task.prefetch or task.generation == self.generation
+
+    def on_task_finished(self, task):
+        """Deliver a rendered image on the GUI thread unless it became stale."""
+        if self.pending.get(task.key) is task:
+            del self.pending[task.key]
+        if task.image is not None and self.is_wanted(task):
+            self.page_rendered.emit(task.key, task.image)
+
+    def shutdown(self):
+        """Cancel the queued work and wait for the running task."""
+        self.cancel_pending()
+        self.document = None
+        self.thread_pool.waitForDone()
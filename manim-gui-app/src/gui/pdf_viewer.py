@@ -1,13 +1,32 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QSpinBox, QScrollArea
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QPixmap, QImage
-import fitz  # PyMuPDF
+from PyQt5.QtCore import Qt, QEvent, pyqtSignal
+from PyQt5.QtGui import QImage
+from src.core.pdf_document import PdfDocument
+from src.core.thumbnail_cache import ThumbnailCache
+from src.gui.page_renderer import PageRenderer
+from src.gui.tiled_page_view import TiledPageView
+from src.gui.image_utils import copy_stats
 
 class PdfViewer(QWidget):
-    def __init__(self):
+    page_changed = pyqtSignal(int)  # 0-based index of the displayed page
+
+    ZOOM = 1.5  # Default zoom factor
+    MIN_ZOOM = 0.25
+    MAX_ZOOM = 32.0
+    ZOOM_STEP = 1.25  # Factor applied by the zoom in/out buttons
+    PREFETCH_RADIUS = 2  # Number of pages rendered ahead/behind the current one
+    PREVIEW_WIDTH = ThumbnailCache.THUMBNAIL_WIDTH  # Preview shown before the tiles
+
+    def __init__(self, thumbnail_cache=None):
         super().__init__()
         self.pdf_document = None
+        # On-disk thumbnails, reused as instant previews when available
+        self.thumbnail_cache = thumbnail_cache
         self.current_page = 0
+        self.zoom = self.ZOOM
+        # Pages are rasterized in a worker thread and delivered through a signal
+        self.renderer = PageRenderer(self)
+        self.renderer.page_rendered.connect(self.on_page_rendered)
         self.init_ui()
 
     def init_ui(self):
@@ -32,21 +51,49 @@ class PdfViewer(QWidget):
         self.controls_layout.addWidget(self.page_spin)
         self.controls_layout.addWidget(self.page_count_label)
         self.controls_layout.addWidget(self.next_button)
+
+        # Zoom controls
+        self.zoom_out_button = QPushButton("-")
+        self.zoom_out_button.clicked.connect(self.zoom_out)
+
+        self.zoom_label = QLabel(f"{self.zoom:.0%}")
+
+        self.zoom_in_button = QPushButton("+")
+        self.zoom_in_button.clicked.connect(self.zoom_in)
+
+        self.fit_width_button = QPushButton("Fit width")
+        self.fit_width_button.clicked.connect(self.fit_width)
+
+        self.controls_layout.addStretch()
+        self.controls_layout.addWidget(self.zoom_out_button)
+        self.controls_layout.addWidget(self.zoom_label)
+        self.controls_layout.addWidget(self.zoom_in_button)
+        self.controls_layout.addWidget(self.fit_width_button)
         
-        # PDF display area
+        # PDF display area: only the tiles inside the viewport are rendered
         self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
+        self.scroll_area.setWidgetResizable(False)
+        self.scroll_area.setAlignment(Qt.AlignCenter)
+        self.scroll_area.viewport().installEventFilter(self)
         
-        self.pdf_label = QLabel()
-        self.pdf_label.setAlignment(Qt.AlignCenter)
-        self.scroll_area.setWidget(self.pdf_label)
+        self.page_view = TiledPageView()
+        self.page_view.visible_tiles_changed.connect(self.request_tiles)
+        self.scroll_area.setWidget(self.page_view)
+        self.scroll_area.horizontalScrollBar().valueChanged.connect(self.request_tiles)
+        self.scroll_area.verticalScrollBar().valueChanged.connect(self.request_tiles)
         
         self.layout.addLayout(self.controls_layout)
         self.layout.addWidget(self.scroll_area)
 
     def load_pdf(self, pdf_path):
         try:
-            self.pdf_document = fitz.open(pdf_path)
+            # The document (and its page cache) is shared with the other viewers
+            document = PdfDocument.acquire(pdf_path)
+            # Unqueue the renders of the old document before it can be closed
+            self.renderer.set_document(document)
+            if self.pdf_document:
+                self.pdf_document.release()
+            self.pdf_document = document
             self.page_spin.setMaximum(len(self.pdf_document))
             self.page_count_label.setText(f"/ {len(self.pdf_document)}")
             self.current_page = 0
@@ -56,24 +103,119 @@ class PdfViewer(QWidget):
             print(f"Error loading PDF: {e}")
             return False
 
+    @property
+    def page_cache(self):
+        """Rendered-tile cache of the shared document."""
+        return self.pdf_document.page_cache
+
     def render_page(self):
         if not self.pdf_document:
             return
-            
+
         if 0 <= self.current_page < len(self.pdf_document):
-            page = self.pdf_document.load_page(self.current_page)
-            # Render page to an image
-            zoom = 1.5  # Zoom factor
-            mat = fitz.Matrix(zoom, zoom)
-            pix = page.get_pixmap(matrix=mat)
-            
-            # Convert to QImage
-            img = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888)
-            pixmap = QPixmap.fromImage(img)
-            
-            # Display in the label
-            self.pdf_label.setPixmap(pixmap)
+            # Avoid re-entering go_to_page through valueChanged
+            self.page_spin.blockSignals(True)
             self.page_spin.setValue(self.current_page + 1)
+            self.page_spin.blockSignals(False)
+            self.page_view.set_page(self.pdf_document, self.current_page, self.zoom)
+            self.request_tiles()
+            self.page_changed.emit(self.current_page)
+
+    def needs_preview(self):
+        """Whether some visible tile of the current page is still missing."""
+        if self.page_view.preview_key(self.current_page) in self.page_cache:
+            return False
+        return bool(self.page_view.missing_tiles(self.current_page, self.page_view.visible_rect()))
+
+    def load_cached_preview(self):
+        """Use the on-disk thumbnail of the current page as preview; return success."""
+        if self.thumbnail_cache is None:
+            return False
+        data = self.thumbnail_cache.get_thumbnail(self.pdf_document, self.current_page,
+                                                  self.PREVIEW_WIDTH)
+        if data is None:
+            return False
+        image = QImage.fromData(data, "PNG")
+        if image.isNull():
+            return False
+        self.page_cache.put(self.page_view.preview_key(self.current_page), image)
+        return True
+
+    def request_tiles(self):
+        """Request the visible tiles of the current page, then those of its neighbours."""
+        if not self.pdf_document:
+            return
+        self.renderer.new_generation()
+        visible = self.page_view.visible_rect()
+        # A cheap preview first: from the thumbnail cache, or rendered before the tiles
+        if self.needs_preview() and not self.load_cached_preview():
+            page_width = self.pdf_document.page_size(self.current_page)[0]
+            self.renderer.request(self.page_view.preview_key(self.current_page), self.current_page,
+                                  self.PREVIEW_WIDTH / page_width,
+                                  priority=PageRenderer.PRIORITY_PREVIEW)
+        for key, scale, clip in self.page_view.missing_tiles(self.current_page, visible, count=True):
+            self.renderer.request(key, self.current_page, scale, clip)
+        # Same viewport on the neighbouring pages, closest first
+        for distance in range(1, self.PREFETCH_RADIUS + 1):
+            for page_index in (self.current_page + distance, self.current_page - distance):
+                if 0 <= page_index < len(self.pdf_document):
+                    for key, scale, clip in self.page_view.missing_tiles(page_index, visible):
+                        self.renderer.request(key, page_index, scale, clip, prefetch=True)
+        self.renderer.drop_stale()
+
+    def on_page_rendered(self, key, image):
+        """Store a tile delivered by the renderer and repaint it if visible."""
+        self.page_cache.put(key, image)
+        self.page_view.on_image_rendered(key)
+
+    def set_zoom(self, zoom):
+        """Change the zoom factor, keeping the centre of the viewport in place."""
+        zoom = max(self.MIN_ZOOM, min(self.MAX_ZOOM, zoom))
+        if not self.pdf_document or zoom == self.zoom:
+            return
+        h_bar = self.scroll_area.horizontalScrollBar()
+        v_bar = self.scroll_area.verticalScrollBar()
+        viewport = self.scroll_area.viewport()
+        center_x = (h_bar.value() + viewport.width() / 2) / self.zoom
+        center_y = (v_bar.value() + viewport.height() / 2) / self.zoom
+
+        self.zoom = zoom
+        self.zoom_label.setText(f"{self.zoom:.0%}")
+        self.page_view.set_page(self.pdf_document, self.current_page, self.zoom)
+        h_bar.setValue(int(center_x * self.zoom - viewport.width() / 2))
+        v_bar.setValue(int(center_y * self.zoom - viewport.height() / 2))
+        self.request_tiles()
+
+    def zoom_in(self):
+        self.set_zoom(self.zoom * self.ZOOM_STEP)
+
+    def zoom_out(self):
+        self.set_zoom(self.zoom / self.ZOOM_STEP)
+
+    def fit_width(self):
+        """Zoom so that the page width fills the viewport."""
+        if self.pdf_document:
+            page_width = self.pdf_document.page_size(self.current_page)[0]
+            available = self.scroll_area.viewport().width() - 2 * self.scroll_area.frameWidth()
+            self.set_zoom(available / page_width)
+
+    def eventFilter(self, watched, event):
+        """Ctrl + wheel on the page zooms, the plain wheel scrolls."""
+        if (event.type() == QEvent.Wheel and event.modifiers() & Qt.ControlModifier):
+            if event.angleDelta().y() > 0:
+                self.zoom_in()
+            elif event.angleDelta().y() < 0:
+                self.zoom_out()
+            return True
+        return super().eventFilter(watched, event)
+
+    def cache_stats(self):
+        """Return the hit/miss statistics of the page cache."""
+        return self.page_cache.stats()
+
+    def copy_stats(self):
+        """Return the bytes copied per frame when handing pages over to Qt."""
+        return copy_stats.stats()
 
     def next_page(self):
         if self.pdf_document and self.current_page < len(self.pdf_document) - 1:
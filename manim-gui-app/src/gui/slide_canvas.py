@@ -0,0 +1,523 @@
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QCheckBox, QFileDialog,
+                             QGraphicsView, QGraphicsScene, QGraphicsItem)
+from PyQt5.QtSvg import QGraphicsSvgItem, QSvgRenderer
+from PyQt5.QtCore import Qt, QRectF, QPointF
+from PyQt5.QtGui import QPainter, QPen, QBrush, QColor, QTransform
+from src.gui.svg_renderer_pool import svg_renderer_pool
+from src.gui.slide_editor import SLIDE_RECT, export_svg_files, ingest_inserted_svg, fragment_geometries
+
+
+class SvgItem(QGraphicsSvgItem):
+    """
+    SVG de la slide dans un QGraphicsScene, équivalent d'InteractiveSvgWidget
+
+    Le renderer vient de svg_renderer_pool (partagé avec les autres items du
+    même fichier). Les coordonnées de l'item sont celles de QGraphicsSvgItem
+    (la taille par défaut du SVG) et la taille choisie par l'utilisateur est
+    une mise à l'échelle de l'item : boundingRect reste celui, natif, de Qt,
+    ce qui garde la recherche d'items dans l'index BSP rapide. La pile de
+    rognages est appliquée au moment du rendu, comme dans le widget.
+    """
+
+    HANDLE_SIZE = 10  # En pixels de la slide
+    MIN_SIZE = 20
+
+    (HANDLE_TOP_LEFT, HANDLE_TOP, HANDLE_TOP_RIGHT,
+     HANDLE_LEFT, HANDLE_RIGHT,
+     HANDLE_BOTTOM_LEFT, HANDLE_BOTTOM, HANDLE_BOTTOM_RIGHT) = range(8)
+
+    HANDLE_CURSORS = {
+        HANDLE_TOP_LEFT: Qt.SizeFDiagCursor, HANDLE_BOTTOM_RIGHT: Qt.SizeFDiagCursor,
+        HANDLE_TOP_RIGHT: Qt.SizeBDiagCursor, HANDLE_BOTTOM_LEFT: Qt.SizeBDiagCursor,
+        HANDLE_TOP: Qt.SizeVerCursor, HANDLE_BOTTOM: Qt.SizeVerCursor,
+        HANDLE_LEFT: Qt.SizeHorCursor, HANDLE_RIGHT: Qt.SizeHorCursor,
+    }
+
+    def __init__(self, svg_path=None):
+        super().__init__()
+        self.svg_path = None
+        self.svg_renderer = None  # Référence Python au renderer partagé
+        self.renderer_release = None  # Rend le renderer au pool, voir svg_renderer_pool.bind
+        self.crop_stack = []
+        self.crop_mode = False
+
+        # Variables de suivi
+        self.active_handle = None
+        self.press_pos = None
+        self.original_rect = None
+        self.crop_selection_rect = None
+
+        self.setFlags(QGraphicsItem.ItemIsSelectable | QGraphicsItem.ItemIsMovable)
+        # Le rendu est gardé en cache à la résolution de l'écran : un déplacement ne re-rend pas le SVG
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        self.setAcceptHoverEvents(True)
+        self.set_svg_source(svg_path)
+
+    def set_svg_source(self, svg_path):
+        """Utiliser le renderer partagé de svg_path (sans changer la géométrie de l'item)"""
+        previous = self.svg_renderer
+        geometry = self.geometry() if previous is not None else None
+        self.svg_path = svg_path
+        self.crop_stack = []
+        previous_release = self.renderer_release
+        self.svg_renderer = svg_renderer_pool.acquire(svg_path) if svg_path else QSvgRenderer()
+        self.renderer_release = svg_renderer_pool.bind(self.svg_renderer, self)
+        self.setSharedRenderer(self.svg_renderer)
+        if previous is not None:
+            previous_release()
+            self.set_geometry(geometry)
+
+    def release_renderer(self):
+        """Rendre le renderer partagé au pool (fait aussi à la destruction de l'item s'il est oublié)"""
+        if self.svg_renderer is None:
+            return
+        previous_release = self.renderer_release
+        # L'item ne doit jamais pointer vers un renderer que le pool pourrait détruire
+        self.svg_renderer = QSvgRenderer()
+        self.renderer_release = svg_renderer_pool.bind(self.svg_renderer, self)
+        self.setSharedRenderer(self.svg_renderer)
+        previous_release()
+
+    def geometry(self):
+        """Position et taille dans la slide (coordonnées de la scène)"""
+        return self.mapRectToParent(self.boundingRect())
+
+    def set_geometry(self, rect):
+        bounds = self.boundingRect()
+        if bounds.isEmpty():
+            self.setPos(rect.topLeft())
+            return
+        self.setTransform(QTransform.fromScale(rect.width() / bounds.width(), rect.height() / bounds.height()))
+        self.setPos(rect.topLeft())
+
+    def set_crop_mode(self, checked):
+        self.crop_mode = checked
+        self.update()
+
+    def paint(self, painter, option, widget=None):
+        """Dessiner le SVG, puis la sélection, les poignées et la zone de rognage"""
+        renderer = self.renderer()
+        if renderer.isValid():
+            if self.crop_stack:
+                # Le renderer est partagé : appliquer notre rognage le temps du rendu seulement
+                full_view_box = renderer.viewBoxF()
+                renderer.setViewBox(self.crop_stack[-1])
+                renderer.render(painter, self.boundingRect())
+                renderer.setViewBox(full_view_box)
+            else:
+                renderer.render(painter, self.boundingRect())
+
+        if not self.isSelected():
+            return
+        # Stylos cosmétiques : même épaisseur quelle que soit l'échelle de l'item
+        pen = QPen(QColor(255, 0, 0, 160), 0, Qt.DashLine)
+        painter.setPen(pen)
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRect(self.boundingRect())
+        if self.crop_mode:
+            if self.crop_selection_rect:
+                pen = QPen(QColor(255, 0, 0, 200), 2, Qt.DashLine)
+                pen.setCosmetic(True)
+                painter.setPen(pen)
+                painter.setBrush(QBrush(QColor(255, 0, 0, 50)))
+                painter.drawRect(self.crop_selection_rect)
+        else:
+            painter.setPen(QPen(Qt.red, 0))
+            painter.setBrush(QBrush(QColor(255, 0, 0, 128)))
+            for handle_rect in self.handles().values():
+                painter.drawRect(handle_rect)
+
+    def handles(self):
+        """Rectangles des poignées de redimensionnement, en coordonnées de l'item"""
+        bounds = self.boundingRect()
+        w, h = bounds.width(), bounds.height()
+        # HANDLE_SIZE pixels de la slide, quelle que soit l'échelle de l'item
+        sx = self.HANDLE_SIZE / (self.transform().m11() or 1)
+        sy = self.HANDLE_SIZE / (self.transform().m22() or 1)
+        return {
+            self.HANDLE_TOP_LEFT: QRectF(0, 0, sx, sy),
+            self.HANDLE_TOP: QRectF(w / 2 - sx / 2, 0, sx, sy),
+            self.HANDLE_TOP_RIGHT: QRectF(w - sx, 0, sx, sy),
+            self.HANDLE_LEFT: QRectF(0, h / 2 - sy / 2, sx, sy),
+            self.HANDLE_RIGHT: QRectF(w - sx, h / 2 - sy / 2, sx, sy),
+            self.HANDLE_BOTTOM_LEFT: QRectF(0, h - sy, sx, sy),
+            self.HANDLE_BOTTOM: QRectF(w / 2 - sx / 2, h - sy, sx, sy),
+            self.HANDLE_BOTTOM_RIGHT: QRectF(w - sx, h - sy, sx, sy),
+        }
+
+    def handle_at(self, pos):
+        if not self.isSelected() or self.crop_mode:
+            return None
+        for handle_id, handle_rect in self.handles().items():
+            if handle_rect.contains(pos):
+                return handle_id
+        return None
+
+    def hoverMoveEvent(self, event):
+        handle = self.handle_at(event.pos())
+        if handle is not None:
+            self.setCursor(self.HANDLE_CURSORS[handle])
+        elif self.crop_mode:
+            self.setCursor(Qt.CrossCursor)
+        else:
+            self.setCursor(Qt.SizeAllCursor)
+        super().hoverMoveEvent(event)
+
+    def mousePressEvent(self, event):
+        """Commencer un redimensionnement, un rognage ou (par défaut) un déplacement"""
+        if event.button() != Qt.LeftButton:
+            return super().mousePressEvent(event)
+
+        canvas = self.scene().parent() if self.scene() else None
+        if isinstance(canvas, SlideCanvas):
+            canvas.bring_to_front(self)
+
+        self.active_handle = self.handle_at(event.pos())
+        if self.active_handle is not None or self.crop_mode:
+            # Pas de déplacement : sélectionner cet item seul et suivre le geste nous-mêmes
+            if not self.isSelected():
+                self.scene().clearSelection()
+                self.setSelected(True)
+            self.press_pos = event.scenePos()
+            self.original_rect = self.geometry()
+            event.accept()
+            return
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self.press_pos is None:
+            return super().mouseMoveEvent(event)
+
+        if self.crop_mode:
+            start = self.mapFromScene(self.press_pos)
+            self.crop_selection_rect = QRectF(start, event.pos()).normalized().intersected(self.boundingRect())
+            self.update()
+            return
+
+        delta = event.scenePos() - self.press_pos
+        new_rect = QRectF(self.original_rect)
+        if self.active_handle in (self.HANDLE_TOP_LEFT, self.HANDLE_LEFT, self.HANDLE_BOTTOM_LEFT):
+            new_rect.setLeft(self.original_rect.left() + delta.x())
+        if self.active_handle in (self.HANDLE_TOP_RIGHT, self.HANDLE_RIGHT, self.HANDLE_BOTTOM_RIGHT):
+            new_rect.setRight(self.original_rect.right() + delta.x())
+        if self.active_handle in (self.HANDLE_TOP_LEFT, self.HANDLE_TOP, self.HANDLE_TOP_RIGHT):
+            new_rect.setTop(self.original_rect.top() + delta.y())
+        if self.active_handle in (self.HANDLE_BOTTOM_LEFT, self.HANDLE_BOTTOM, self.HANDLE_BOTTOM_RIGHT):
+            new_rect.setBottom(self.original_rect.bottom() + delta.y())
+        if new_rect.width() > self.MIN_SIZE and new_rect.height() > self.MIN_SIZE:
+            self.set_geometry(new_rect)
+
+    def mouseReleaseEvent(self, event):
+        if self.press_pos is None:
+            return super().mouseReleaseEvent(event)
+        if self.crop_mode and self.crop_selection_rect and not self.crop_selection_rect.isEmpty():
+            self.crop_svg(self.crop_selection_rect)
+        self.crop_selection_rect = None
+        self.active_handle = None
+        self.press_pos = None
+        self.original_rect = None
+        self.update()
+
+    def view_box(self):
+        """Partie du document affichée : le dernier rognage, ou le viewBox complet"""
+        if self.crop_stack:
+            return self.crop_stack[-1]
+        return self.renderer().viewBoxF()
+
+    def crop_svg(self, selection):
+        """
+        Rogner sur une zone de l'item (coordonnées de l'item), comme InteractiveSvgWidget.crop_svg
+
+        Returns:
+            QRectF: Le nouveau viewBox, ou None si rien n'a été rogné
+        """
+        bounds = self.boundingRect()
+        if not self.renderer().isValid() or selection.isEmpty() or bounds.isEmpty():
+            return None
+        view_box = self.view_box()
+        scale_x = view_box.width() / bounds.width()
+        scale_y = view_box.height() / bounds.height()
+        crop_view_box = QRectF(view_box.x() + selection.x() * scale_x,
+                               view_box.y() + selection.y() * scale_y,
+                               selection.width() * scale_x,
+                               selection.height() * scale_y)
+        geometry = self.mapRectToParent(selection)
+        self.crop_stack.append(crop_view_box)
+        self.set_geometry(geometry)
+        self.update()
+        return crop_view_box
+
+    def undo_crop(self):
+        """Annuler le dernier rognage ; retourne False s'il n'y en a pas"""
+        geometry = self.geometry()
+        if not self.crop_stack or geometry.isEmpty():
+            return False
+        cropped = self.crop_stack.pop()
+        restored = self.view_box()
+        scale_x = geometry.width() / cropped.width()
+        scale_y = geometry.height() / cropped.height()
+        self.set_geometry(QRectF(geometry.x() + (restored.x() - cropped.x()) * scale_x,
+                                 geometry.y() + (restored.y() - cropped.y()) * scale_y,
+                                 restored.width() * scale_x,
+                                 restored.height() * scale_y))
+        self.update()
+        return True
+
+    def set_crop_stack(self, crop_stack):
+        if list(crop_stack) == self.crop_stack:
+            return
+        self.crop_stack = list(crop_stack)
+        self.update()
+
+
+class SlideCanvas(QGraphicsView):
+    """
+    Slide affichée par un QGraphicsScene, pour les slides avec des centaines de SVG
+
+    Contrairement à SlideEditor (un QWidget enfant par SVG, recherche du clic
+    avec childAt), les SVG sont des items d'une scène indexée par un arbre
+    BSP : le clic et le rafraîchissement ne parcourent que les items de la
+    zone concernée. La slide se zoome (Ctrl + molette) et se déplace
+    (bouton du milieu). Le contenu est au même format que SlideEditor.
+    """
+
+    SLIDE_RECT = SLIDE_RECT  # La scène est en unités de slide
+    ZOOM_STEP = 1.25
+    MIN_ZOOM = 0.05
+    MAX_ZOOM = 40
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.graphics_scene = QGraphicsScene(self)
+        self.graphics_scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+        margin = self.SLIDE_RECT.width() / 2
+        self.graphics_scene.setSceneRect(self.SLIDE_RECT.adjusted(-margin, -margin, margin, margin))
+        self.setScene(self.graphics_scene)
+
+        self.svg_items = []  # Items de la slide
+        self.next_z = 0
+        self.crop_mode = False
+        self.pan_start = None
+
+        self.setRenderHints(QPainter.Antialiasing | QPainter.SmoothPixmapTransform)
+        self.setDragMode(QGraphicsView.RubberBandDrag)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        self.setBackgroundBrush(QColor(200, 200, 200))
+
+    def drawBackground(self, painter, rect):
+        super().drawBackground(painter, rect)
+        painter.fillRect(self.SLIDE_RECT.intersected(rect), Qt.white)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.fit_slide()
+
+    # --- Zoom et déplacement ---
+
+    def zoom(self):
+        return self.transform().m11()
+
+    def zoom_by(self, factor):
+        factor = max(self.MIN_ZOOM / self.zoom(), min(self.MAX_ZOOM / self.zoom(), factor))
+        self.scale(factor, factor)
+
+    def fit_slide(self):
+        """Afficher la slide entière"""
+        self.fitInView(self.SLIDE_RECT, Qt.KeepAspectRatio)
+
+    def wheelEvent(self, event):
+        if event.modifiers() & Qt.ControlModifier:
+            steps = event.angleDelta().y() / 120
+            self.zoom_by(self.ZOOM_STEP ** steps)
+            event.accept()
+            return
+        super().wheelEvent(event)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MiddleButton:
+            self.pan_start = event.pos()
+            self.viewport().setCursor(Qt.ClosedHandCursor)
+            event.accept()
+            return
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self.pan_start is not None:
+            delta = event.pos() - self.pan_start
+            self.pan_start = event.pos()
+            self.horizontalScrollBar().setValue(self.horizontalScrollBar().value() - delta.x())
+            self.verticalScrollBar().setValue(self.verticalScrollBar().value() - delta.y())
+            event.accept()
+            return
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.MiddleButton and self.pan_start is not None:
+            self.pan_start = None
+            self.viewport().unsetCursor()
+            event.accept()
+            return
+        super().mouseReleaseEvent(event)
+
+    # --- Contenu ---
+
+    def bring_to_front(self, item):
+        self.next_z += 1
+        item.setZValue(self.next_z)
+
+    def stacking_order(self):
+        """Items du dessous vers le dessus"""
+        return sorted(self.svg_items, key=lambda item: item.zValue())
+
+    def selected_items(self):
+        return [item for item in self.svg_items if item.isSelected()]
+
+    def add_svg_item(self, svg_path, geometry=None):
+        """Ajouter un SVG, centré dans la slide s'il n'a pas de géométrie"""
+        item = SvgItem(svg_path)
+        item.set_crop_mode(self.crop_mode)
+        self.place_item(item, geometry)
+        self.bring_to_front(item)
+        self.graphics_scene.addItem(item)
+        self.svg_items.append(item)
+        return item
+
+    def insert_svg(self, svg_path):
+        self.add_svg_item(svg_path)
+
+    def insert_fragments(self, page_fragments, fragments):
+        for fragment, geometry in zip(fragments, fragment_geometries(page_fragments, fragments, self.SLIDE_RECT)):
+            svg_path = page_fragments.fragment_file(fragment)
+            if svg_path:
+                self.add_svg_item(svg_path, geometry)
+
+    def place_item(self, item, geometry=None):
+        if geometry is None:
+            size = item.geometry().size()
+            geometry = QRectF(self.SLIDE_RECT.center() - QPointF(size.width() / 2, size.height() / 2), size)
+        # Comparaison arrondie : la géométrie d'un item vient d'une mise à l'échelle flottante
+        if item.geometry().toRect() != QRectF(geometry).toRect():
+            item.set_geometry(QRectF(geometry))
+
+    def remove_svg_item(self, item):
+        if item in self.svg_items:
+            self.svg_items.remove(item)
+            self.graphics_scene.removeItem(item)
+            item.release_renderer()
+
+    def clear_svg_items(self):
+        for item in list(self.svg_items):
+            self.remove_svg_item(item)
+
+    def set_crop_mode(self, checked):
+        self.crop_mode = checked
+        for item in self.svg_items:
+            item.set_crop_mode(checked)
+
+    def undo_crop(self):
+        """Annuler le dernier rognage des items sélectionnés"""
+        for item in self.selected_items():
+            item.undo_crop()
+
+    def get_slide_content(self):
+        """Même format que SlideEditor.get_slide_content, dans l'ordre d'empilement"""
+        return [{
+            'path': item.svg_path,
+            'geometry': item.geometry(),
+            'crop': list(item.crop_stack)
+        } for item in self.stacking_order()]
+
+    def load_slide_content(self, content):
+        """
+        Afficher le contenu d'une slide en gardant les items déjà présents
+
+        Même réconciliation que SlideEditor.load_slide_content : les items
+        du bon fichier sont gardés, les autres changent de fichier, ceux en
+        trop sont retirés.
+        """
+        current = {}
+        for item in self.stacking_order():
+            current.setdefault(item.svg_path, []).append(item)
+
+        items = []
+        for svg_data in content:
+            same_path = current.get(svg_data['path'])
+            items.append(same_path.pop(0) if same_path else None)
+        leftovers = [item for same_path in current.values() for item in same_path]
+        for index, svg_data in enumerate(content):
+            if items[index] is None:
+                if leftovers:
+                    items[index] = leftovers.pop()
+                    items[index].set_svg_source(svg_data['path'])
+                else:
+                    items[index] = self.add_svg_item(svg_data['path'], svg_data['geometry'])
+        for item in leftovers:
+            self.remove_svg_item(item)
+
+        for z, (item, svg_data) in enumerate(zip(items, content)):
+            item.set_crop_stack(svg_data.get('crop', []))
+            self.place_item(item, svg_data['geometry'])
+            item.setZValue(z)
+        self.next_z = len(items)
+        self.svg_items = items
+
+    def export_svgs(self, output_dir):
+        return export_svg_files(self.stacking_order(), output_dir)
+
+
+class SlideCanvasEditor(QWidget):
+    """Éditeur de slide basé sur SlideCanvas, interchangeable avec SlideEditor"""
+
+    def __init__(self, main_window):
+        super().__init__()
+        self.main_window = main_window
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(5, 5, 5, 5)
+        layout.setSpacing(5)
+
+        self.canvas = SlideCanvas(self)
+        layout.addWidget(self.canvas, 1)
+
+        # Boutons d'action
+        buttons_layout = QHBoxLayout()
+        buttons_layout.setContentsMargins(0, 0, 0, 0)
+        add_svg_button = QPushButton("Add SVG")
+        add_svg_button.clicked.connect(self.add_svg)
+        self.mode_checkbox = QCheckBox("Mode rognage")
+        self.mode_checkbox.toggled.connect(self.canvas.set_crop_mode)
+        undo_crop_button = QPushButton("Annuler rognage")
+        undo_crop_button.clicked.connect(self.canvas.undo_crop)
+        fit_button = QPushButton("Ajuster")
+        fit_button.clicked.connect(self.canvas.fit_slide)
+        buttons_layout.addWidget(add_svg_button)
+        buttons_layout.addWidget(self.mode_checkbox)
+        buttons_layout.addWidget(undo_crop_button)
+        buttons_layout.addWidget(fit_button)
+        buttons_layout.addStretch()
+        layout.addLayout(buttons_layout)
+
+    def add_svg(self):
+        """Ajouter un SVG manuellement via boîte de dialogue"""
+        file_path, _ = QFileDialog.getOpenFileName(self, "Select SVG File", "", "SVG Files (*.svg)")
+        if file_path:
+            self.insert_svg(file_path)
+
+    def insert_svg(self, svg_path):
+        target = self.main_window if self.main_window is not None else self
+        ingest_inserted_svg(svg_path, self.main_window, target.insert_ingested_svg)
+
+    def insert_ingested_svg(self, svg_path, _prepared=None):
+        self.canvas.insert_svg(svg_path)
+
+    def insert_fragments(self, page_fragments, fragments):
+        self.canvas.insert_fragments(page_fragments, fragments)
+
+    def get_slide_content(self):
+        return self.canvas.get_slide_content()
+
+    def load_slide_content(self, content):
+        self.canvas.load_slide_content(content)
+
+    def export_svgs(self, output_dir):
+        return self.canvas.export_svgs(output_dir)
@@ -1,14 +1,101 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QTextEdit, QPushButton, 
                             QHBoxLayout, QFileDialog, QSizePolicy, QFrame, 
                             QSpinBox, QDialog, QMessageBox, QCheckBox)
-from PyQt5.QtSvg import QSvgWidget
-from PyQt5.QtCore import Qt, QSize, QRect, QPoint
+from PyQt5.QtCore import Qt, QSize, QRect, QRectF, QPoint
 from PyQt5.QtGui import QPalette, QColor
+import logging
 import os
-import subprocess
-import xml.etree.ElementTree as ET
-from src.gui.svg_crop_dialog import SvgCropDialog
+import shutil
 from src.gui.interactive_svg_widget import InteractiveSvgWidget
+from src.core.svg_crop import write_cropped_svg
+from src.core.svg_ingest import ingest_svg
+from src.core.project_file import SLIDE_SIZE
+from src.gui.svg_ingester import log_ingest_report
+
+logger = logging.getLogger(__name__)
+
+# Coordonnées d'une slide, communes aux deux éditeurs et aux fichiers projet
+SLIDE_RECT = QRectF(0, 0, *SLIDE_SIZE)
+
+def map_rect(rect, source, target):
+    """Rectangle rect de source ramené à la même place dans target"""
+    scale_x = target.width() / source.width()
+    scale_y = target.height() / source.height()
+    return QRectF(target.x() + (rect.x() - source.x()) * scale_x, target.y() + (rect.y() - source.y()) * scale_y,
+                  rect.width() * scale_x, rect.height() * scale_y)
+
+def fragment_geometries(page_fragments, fragments, slide_rect):
+    """
+    Géométries des fragments d'une page dans une slide, disposés comme sur la page.
+
+    L'ensemble est centré et agrandi pour occuper 90% de la slide, sans
+    dépasser l'échelle où la page entière ferait la largeur de la slide.
+
+    Returns:
+        list: Un QRectF par fragment
+    """
+    boxes = [page_fragments.fragment_view_box(fragment) for fragment in fragments]
+    left, top = min(x for x, _, _, _ in boxes), min(y for _, y, _, _ in boxes)
+    right, bottom = max(x + w for x, _, w, _ in boxes), max(y + h for _, y, _, h in boxes)
+    scale = min(0.9 * slide_rect.width() / max(right - left, 1e-9),
+                0.9 * slide_rect.height() / max(bottom - top, 1e-9),
+                slide_rect.width() / page_fragments.view_box[2])
+    origin_x = slide_rect.center().x() - (right - left) * scale / 2
+    origin_y = slide_rect.center().y() - (bottom - top) * scale / 2
+    return [QRectF(origin_x + (x - left) * scale, origin_y + (y - top) * scale, w * scale, h * scale)
+            for x, y, w, h in boxes]
+
+def ingest_inserted_svg(svg_path, main_window, callback, prepare=None):
+    """
+    Simplifier un SVG inséré puis appeler callback(chemin à utiliser, résultat de prepare).
+
+    Avec la fenêtre principale, ingest_svg et prepare tournent dans le
+    thread de son SvgIngester et callback est appelé à la fin sur le
+    thread de l'interface, qui reste utilisable pendant les secondes que
+    prend une grande page. Sans fenêtre principale, tout est fait tout de suite.
+    """
+    if main_window is not None:
+        main_window.svg_ingester.ingest(svg_path, callback, prepare)
+        return
+    ingested_path, report = ingest_svg(svg_path)
+    log_ingest_report(svg_path, ingested_path, report)
+    callback(ingested_path, prepare(ingested_path) if prepare is not None else None)
+
+def export_svg_files(svg_items, output_dir):
+    """
+    Écrire les SVG d'une slide dans output_dir, rognages appliqués.
+
+    C'est le seul moment où un SVG rogné est écrit sur disque ; les SVG
+    non rognés sont copiés tels quels.
+
+    Args:
+        svg_items (list): Widgets ou items ayant svg_path et crop_stack, dans l'ordre d'empilement
+        output_dir (str): Dossier de destination
+
+    Returns:
+        list: Les chemins écrits
+    """
+    written = []
+    for index, item in enumerate(svg_items, start=1):
+        if not item.svg_path:
+            continue
+        base_name = os.path.splitext(os.path.basename(item.svg_path))[0]
+        output_path = os.path.join(output_dir, f"{index:02d}_{base_name}.svg")
+        if item.crop_stack:
+            view_box = item.crop_stack[-1]
+            if not write_cropped_svg(item.svg_path, (view_box.x(), view_box.y(),
+                                                     view_box.width(), view_box.height()),
+                                     output_path):
+                continue
+        else:
+            try:
+                shutil.copyfile(item.svg_path, output_path)
+            except OSError as e:
+                print(f"Erreur lors de la copie de {item.svg_path}: {e}")
+                continue
+        written.append(output_path)
+    return written
+
 
 class SlideAreaFrame(QFrame):
     """
@@ -27,21 +114,31 @@ class SlideAreaFrame(QFrame):
         # Vérifier si on clique sur le fond (pas sur un widget enfant)
         child = self.childAt(event.pos())
         if child is None:
-            print("[SlideArea] Clic sur le fond. Désélection.")
+            logger.debug("[SlideArea] Clic sur le fond. Désélection.")
             self.editor.setActiveWidget(None) # Désélectionner le widget actif
         
         # Important: passer l'événement au parent pour qu'il soit traité normalement
         # Cela permet aux widgets enfants de recevoir leurs propres événements de clic.
         super().mousePressEvent(event)
 
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.editor.relayout_widgets()
+
 
 class SlideEditor(QWidget):
+    MAX_SPARE_WIDGETS = 32  # Widgets gardés en réserve au-delà de ceux affichés
+
     def __init__(self, main_window):
         super().__init__()
         self.main_window = main_window
         self.svg_widgets = []  # Liste pour stocker les widgets SVG
+        self.spare_widgets = []  # Widgets cachés, réutilisés au changement de slide
         self.active_widget = None
+        self.crop_mode = False
         self.init_ui()
+        # Place de la slide (SLIDE_RECT) dans slide_area lors du dernier placement des widgets
+        self.layout_rect = self.slide_rect()
 
     def setActiveWidget(self, widget):
         """Définit un widget comme étant l'actif et désactive les autres."""
@@ -79,13 +176,41 @@ class SlideEditor(QWidget):
         
         self.mode_checkbox = QCheckBox("Mode rognage")
         self.mode_checkbox.toggled.connect(self.toggle_crop_mode)
+
+        self.undo_crop_button = QPushButton("Annuler rognage")
+        self.undo_crop_button.clicked.connect(self.undo_crop)
         
         self.buttons_layout.addWidget(self.add_svg_button)
         self.buttons_layout.addWidget(self.mode_checkbox)
+        self.buttons_layout.addWidget(self.undo_crop_button)
         self.buttons_layout.addStretch()
         
         self.layout.addLayout(self.buttons_layout)
 
+    def slide_rect(self):
+        """Rectangle 16:9 de la slide dans slide_area (pixels), le plus grand possible et centré"""
+        width, height = self.slide_area.width(), self.slide_area.height()
+        if width < 16 or height < 9:
+            # Pas encore disposé : un pixel par unité jusqu'au premier resizeEvent
+            return QRectF(SLIDE_RECT)
+        scale = min(width / SLIDE_RECT.width(), height / SLIDE_RECT.height())
+        return QRectF((width - SLIDE_RECT.width() * scale) / 2, (height - SLIDE_RECT.height() * scale) / 2,
+                      SLIDE_RECT.width() * scale, SLIDE_RECT.height() * scale)
+
+    def slide_geometry(self, widget):
+        """Géométrie d'un widget en unités de slide (SLIDE_RECT)"""
+        pixels, units = widget.slide_placement or (None, None)
+        if pixels == widget.geometry():
+            return QRectF(units)  # Telle que placée, sans l'arrondi au pixel
+        return map_rect(QRectF(widget.geometry()), self.layout_rect, SLIDE_RECT)
+
+    def relayout_widgets(self):
+        """Garder chaque widget à sa place dans la slide quand slide_area change de taille"""
+        geometries = [self.slide_geometry(widget) for widget in self.svg_widgets]
+        self.layout_rect = self.slide_rect()
+        for widget, geometry in zip(self.svg_widgets, geometries):
+            self.place_widget(widget, geometry)
+
     def maintain_aspect_ratio(self, event=None):
         """Maintenir un ratio 16:9 pour le slide_frame tout en s'assurant qu'il est visible en entier"""
         # Calculer l'espace disponible
@@ -114,68 +239,167 @@ class SlideEditor(QWidget):
             self.insert_svg(file_path)
 
     def insert_svg(self, svg_path):
-        """Insérer un SVG dans l'éditeur"""
+        """Insérer un SVG dans la slide affichée, une fois simplifié (voir ingest_inserted_svg)"""
+        # La fenêtre principale le remet à l'éditeur affiché à la fin, celui-ci a pu être remplacé
+        target = self.main_window if self.main_window is not None else self
+        ingest_inserted_svg(svg_path, self.main_window, target.insert_ingested_svg)
+
+    def insert_ingested_svg(self, svg_path, _prepared=None):
+        """Ajouter un SVG déjà simplifié"""
         self.add_svg_widget(svg_path)
-        print(f"Inserted SVG: {svg_path}")
+        logger.debug("Inserted SVG: %s", svg_path)
         
+    def insert_fragments(self, page_fragments, fragments):
+        """Insérer des fragments d'une page, chacun dans son propre widget"""
+        geometries = fragment_geometries(page_fragments, fragments, SLIDE_RECT)
+        for fragment, geometry in zip(fragments, geometries):
+            svg_path = page_fragments.fragment_file(fragment)
+            if svg_path:
+                self.add_svg_widget(svg_path, geometry)
+
     def add_svg_widget(self, svg_path, geometry=None):
-        """Ajouter un widget SVG interactif, potentiellement avec une géométrie prédéfinie."""
+        """Ajouter un widget SVG interactif, potentiellement avec une géométrie prédéfinie (unités de slide)."""
         try:
-            interactive_svg = InteractiveSvgWidget(svg_path, parent=self.slide_area)
-            
-            if geometry:
-                interactive_svg.setGeometry(geometry)
-            else:
-                # Centrer le nouveau SVG s'il n'a pas de géométrie
-                center_point = self.slide_area.rect().center()
-                new_pos = QPoint(center_point.x() - interactive_svg.width() // 2,
-                                 center_point.y() - interactive_svg.height() // 2)
-                interactive_svg.move(new_pos)
-            
-            interactive_svg.show()
+            interactive_svg = self.take_spare_widget()
+            interactive_svg.set_svg_source(svg_path)
+            self.place_widget(interactive_svg, geometry)
+            interactive_svg.raise_()
             self.svg_widgets.append(interactive_svg)
             
         except Exception as e:
             print(f"Erreur lors du chargement du SVG {svg_path}: {e}")
             QMessageBox.critical(self, "Erreur", f"Impossible de charger le SVG: {e}")
 
+    def take_spare_widget(self):
+        """Retourne un widget de la réserve, ou un nouveau widget s'il n'y en a plus"""
+        if self.spare_widgets:
+            widget = self.spare_widgets.pop()
+        else:
+            widget = InteractiveSvgWidget(parent=self.slide_area)
+        widget.set_crop_mode(self.crop_mode)
+        return widget
+
+    def recycle_widget(self, widget):
+        """Cacher un widget qui ne sert plus et le garder pour une prochaine slide"""
+        if self.active_widget is widget:
+            self.setActiveWidget(None)
+        widget.hide()
+        # Le document SVG reste dans le pool, prêt pour la prochaine slide
+        widget.release_renderer()
+        if len(self.spare_widgets) < self.MAX_SPARE_WIDGETS:
+            self.spare_widgets.append(widget)
+        else:
+            widget.deleteLater()
+
+    def place_widget(self, widget, geometry=None):
+        """
+        Positionner un widget, sans rien toucher si sa géométrie est déjà la bonne
+
+        geometry est en unités de slide (SLIDE_RECT) ; le widget garde la
+        géométrie demandée pour que slide_geometry la rende sans arrondi.
+        """
+        if geometry is None:
+            # Taille du SVG, centré dans la slide
+            size = widget.renderer.defaultSize() if widget.renderer.isValid() else QSize(200, 150)
+            center_point = self.layout_rect.center().toPoint()
+            pixels = QRect(QPoint(center_point.x() - size.width() // 2,
+                                  center_point.y() - size.height() // 2), size)
+            geometry = map_rect(QRectF(pixels), self.layout_rect, SLIDE_RECT)
+        else:
+            geometry = QRectF(geometry)
+            pixels = map_rect(geometry, SLIDE_RECT, self.layout_rect).toRect()
+        widget.slide_placement = (pixels, geometry)
+        if widget.geometry() != pixels:
+            widget.setGeometry(pixels)
+        if widget.isHidden():
+            widget.show()
+
     def toggle_crop_mode(self, checked):
         """Basculer entre le mode redimensionnement et rognage pour tous les widgets SVG"""
+        self.crop_mode = checked
         for svg_widget in self.svg_widgets:
             svg_widget.set_crop_mode(checked)
-    
-    def clear_svg_widgets(self):
-        """Supprimer tous les widgets SVG"""
-        for widget in self.svg_widgets:
-            widget.deleteLater()
-        self.svg_widgets.clear()
+
+    def undo_crop(self):
+        """Annuler le dernier rognage du widget sélectionné"""
+        if self.active_widget:
+            self.active_widget.undo_crop()
     
     def remove_svg_widget(self, svg_widget_to_remove):
         """Supprimer un widget SVG spécifique"""
         if svg_widget_to_remove in self.svg_widgets:
             self.svg_widgets.remove(svg_widget_to_remove)
-            svg_widget_to_remove.deleteLater()
+            self.recycle_widget(svg_widget_to_remove)
+
     def get_slide_content(self):
         """Retourne une liste de dictionnaires décrivant l'état de chaque SVG."""
         content = []
         for widget in self.svg_widgets:
             content.append({
                 'path': widget.svg_path,
-                'geometry': widget.geometry()
+                'geometry': self.slide_geometry(widget),  # En unités de slide, comme SlideCanvas
+                'crop': list(widget.crop_stack)  # viewBox successifs, en unités du document
             })
         return content
 
+    def export_svgs(self, output_dir):
+        """Écrire les SVG de la slide dans output_dir, rognages appliqués (voir export_svg_files)"""
+        return export_svg_files(self.svg_widgets, output_dir)
+
     def load_slide_content(self, content):
-        """Efface la slide actuelle et charge un nouveau contenu."""
-        self.clear_svg_widgets()
-        
-        for svg_data in content:
-            self.add_svg_widget(svg_data['path'], svg_data['geometry'])
+        """
+        Affiche le contenu d'une slide en réutilisant les widgets déjà affichés.
+
+        Les widgets qui montrent déjà le bon fichier sont gardés tels quels
+        (seule leur géométrie est mise à jour si elle diffère), les autres
+        sont rechargés avec les nouveaux fichiers, et ceux en trop sont mis
+        en réserve au lieu d'être détruits. Changer de slide ne recrée donc
+        aucun widget et ne touche pas à ceux qui ne changent pas.
+        """
+        # Widgets actuels, par fichier affiché
+        current = {}
+        for widget in self.svg_widgets:
+            current.setdefault(widget.svg_path, []).append(widget)
+
+        # Éviter les repaints intermédiaires (scintillement) pendant la mise à jour
+        self.slide_area.setUpdatesEnabled(False)
+        try:
+            # 1. Garder les widgets qui affichent déjà le bon fichier
+            widgets = []
+            for svg_data in content:
+                same_path = current.get(svg_data['path'])
+                widgets.append(same_path.pop(0) if same_path else None)
+
+            # 2. Recharger les autres avec les nouveaux fichiers
+            leftovers = [widget for same_path in current.values() for widget in same_path]
+            for index, svg_data in enumerate(content):
+                if widgets[index] is None:
+                    widget = leftovers.pop() if leftovers else self.take_spare_widget()
+                    if self.active_widget is widget:
+                        # Le widget change de SVG : il ne peut pas rester sélectionné
+                        self.setActiveWidget(None)
+                    widget.set_svg_source(svg_data['path'])
+                    widgets[index] = widget
+
+            for widget, svg_data in zip(widgets, content):
+                widget.set_crop_stack(svg_data.get('crop', []))
+                self.place_widget(widget, svg_data['geometry'])
+
+            # 3. Mettre de côté les widgets en trop
+            for widget in leftovers:
+                self.recycle_widget(widget)
+
+            # Ordre d'empilement de la slide, seulement s'il a changé
+            kept_order = [widget for widget in self.svg_widgets if widget in widgets]
+            if widgets != kept_order:
+                for widget in widgets:
+                    widget.raise_()
+            self.svg_widgets = widgets
+        finally:
+            self.slide_area.setUpdatesEnabled(True)
 
     def clear_svg_widgets(self):
         """Supprimer tous les widgets SVG de la slide."""
-        # Réinitialiser le widget actif avant de supprimer les objets
-        self.active_widget = None
         for widget in self.svg_widgets:
-            widget.deleteLater()
+            self.recycle_widget(widget)
         self.svg_widgets.clear()
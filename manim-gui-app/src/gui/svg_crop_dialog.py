@@ -1,88 +1,85 @@
-from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, 
-                           QLabel, QScrollArea, QFrame, QSpinBox)
-from PyQt5.QtCore import Qt, QRect, QPoint, QSize
-from PyQt5.QtGui import QPainter, QColor, QPen
-from PyQt5.QtSvg import QSvgWidget
-
-class SvgCropArea(QFrame):
-    """Widget personnalisé permettant de sélectionner une zone de rognage dans un SVG"""
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
+                           QLabel, QScrollArea, QWidget, QSpinBox, QRubberBand)
+from PyQt5.QtCore import Qt, QRect, QRectF, QSize, pyqtSignal
+from PyQt5.QtGui import QPainter, QPixmap
+from src.gui.svg_renderer_pool import svg_renderer_pool
+
+class SvgCropArea(QWidget):
+    """
+    Widget personnalisé permettant de sélectionner une zone de rognage dans un SVG
+
+    Le SVG est rendu une seule fois dans un pixmap à sa taille naturelle ;
+    la sélection est un QRubberBand posé dessus. Déplacer la sélection ne
+    redessine que la partie du pixmap découverte, jamais le SVG, quelle que
+    soit sa complexité.
+    """
+    # Rectangle sélectionné, en pixels du SVG, pendant et après le glisser
+    selection_changed = pyqtSignal(QRect)
+
     def __init__(self, svg_path):
         super().__init__()
         self.svg_path = svg_path
-        self.svg_widget = QSvgWidget(svg_path)
-        
-        # Configuration du layout
-        self.layout = QVBoxLayout(self)
-        self.layout.addWidget(self.svg_widget)
-        
+
         # Variables pour la sélection
         self.start_point = None
-        self.end_point = None
-        self.is_selecting = False
-        
-        # Configuration du widget
-        self.setMouseTracking(True)
-        self.setFrameShape(QFrame.Box)
-        self.setFrameShadow(QFrame.Sunken)
-        
-        # Obtenir les dimensions du SVG
-        self.svg_size = self.svg_widget.sizeHint()
-        self.svg_widget.setFixedSize(self.svg_size)
-        
+        self.rubber_band = QRubberBand(QRubberBand.Rectangle, self)
+
+        # Obtenir les dimensions du SVG et le rendre une fois
+        renderer = svg_renderer_pool.acquire(svg_path)
+        self.svg_size = renderer.defaultSize() if renderer.isValid() else QSize(1, 1)
+        self.setFixedSize(self.svg_size)
+        self.pixmap = self.render_svg(renderer)
+        svg_renderer_pool.release(renderer)
+
+    def render_svg(self, renderer):
+        """Rendu du SVG à la résolution de l'écran"""
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(self.svg_size * ratio)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.white)
+        if renderer.isValid():
+            painter = QPainter(pixmap)
+            renderer.render(painter, QRectF(0, 0, self.svg_size.width(), self.svg_size.height()))
+            painter.end()
+        return pixmap
+
+    def paintEvent(self, event):
+        # Seule la zone à redessiner est copiée depuis le pixmap
+        painter = QPainter(self)
+        painter.drawPixmap(QRectF(event.rect()), self.pixmap, self.source_rect(event.rect()))
+
+    def source_rect(self, rect):
+        ratio = self.pixmap.devicePixelRatio()
+        return QRectF(rect.x() * ratio, rect.y() * ratio, rect.width() * ratio, rect.height() * ratio)
+
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             self.start_point = event.pos()
-            self.is_selecting = True
-            self.end_point = self.start_point
-            self.update()
-    
+            self.rubber_band.setGeometry(QRect(self.start_point, QSize()))
+            self.rubber_band.show()
+
     def mouseMoveEvent(self, event):
-        if self.is_selecting:
-            self.end_point = event.pos()
-            self.update()
-    
+        if self.start_point is not None:
+            self.rubber_band.setGeometry(QRect(self.start_point, event.pos()).normalized())
+            self.selection_changed.emit(self.get_crop_rect())
+
     def mouseReleaseEvent(self, event):
-        if event.button() == Qt.LeftButton and self.is_selecting:
-            self.is_selecting = False
-            self.end_point = event.pos()
-            self.update()
-    
-    def paintEvent(self, event):
-        super().paintEvent(event)
-        
-        if self.start_point and self.end_point:
-            painter = QPainter(self)
-            pen = QPen(QColor(255, 0, 0))
-            pen.setWidth(2)
-            painter.setPen(pen)
-            
-            # Dessiner le rectangle de sélection
-            rect = QRect(self.start_point, self.end_point)
-            painter.drawRect(rect)
-            
-            # Dessiner des lignes diagonales pour indiquer la zone de rognage
-            painter.setOpacity(0.3)
-            painter.fillRect(rect, QColor(255, 0, 0, 50))
-    
+        if event.button() == Qt.LeftButton and self.start_point is not None:
+            self.rubber_band.setGeometry(QRect(self.start_point, event.pos()).normalized())
+            self.start_point = None
+            self.selection_changed.emit(self.get_crop_rect())
+
+    def set_selection(self, rect):
+        """Afficher une sélection saisie ailleurs (coordonnées du SVG), sans émettre selection_changed"""
+        self.rubber_band.setGeometry(rect.normalized().intersected(self.rect()))
+        self.rubber_band.setVisible(not self.rubber_band.geometry().isEmpty())
+
     def get_crop_rect(self):
         """Retourne le rectangle de rognage relativement au SVG"""
-        if not self.start_point or not self.end_point:
+        if not self.rubber_band.isVisible():
             return None
-        
-        # Calculer les coordonnées ajustées au widget SVG
-        svg_pos = self.svg_widget.pos()
-        x1 = min(self.start_point.x(), self.end_point.x()) - svg_pos.x()
-        y1 = min(self.start_point.y(), self.end_point.y()) - svg_pos.y()
-        x2 = max(self.start_point.x(), self.end_point.x()) - svg_pos.x()
-        y2 = max(self.start_point.y(), self.end_point.y()) - svg_pos.y()
-        
         # S'assurer que les coordonnées sont dans les limites du SVG
-        x1 = max(0, x1)
-        y1 = max(0, y1)
-        x2 = min(self.svg_size.width(), x2)
-        y2 = min(self.svg_size.height(), y2)
-        
-        return QRect(x1, y1, x2 - x1, y2 - y1)
+        return self.rubber_band.geometry().intersected(self.rect())
 
 
 class SvgCropDialog(QDialog):
@@ -92,83 +89,91 @@ class SvgCropDialog(QDialog):
         self.svg_path = svg_path
         self.crop_rect = None
         self.init_ui()
-        
+
     def init_ui(self):
         self.setWindowTitle("Rogner le SVG")
         self.setMinimumSize(800, 600)
-        
+
         layout = QVBoxLayout(self)
-        
+
         # Zone de sélection pour le rognage
         self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        
+        self.scroll_area.setAlignment(Qt.AlignCenter)
+
         self.crop_area = SvgCropArea(self.svg_path)
         self.scroll_area.setWidget(self.crop_area)
-        
+
         layout.addWidget(QLabel("Sélectionnez la zone à conserver:"))
         layout.addWidget(self.scroll_area)
-        
-        # Dimensions
+
+        # Dimensions, bornées par la taille du SVG
         dimensions_layout = QHBoxLayout()
-        
+        svg_size = self.crop_area.svg_size
+
         dimensions_layout.addWidget(QLabel("X:"))
         self.x_spin = QSpinBox()
-        self.x_spin.setRange(0, 9999)
+        self.x_spin.setRange(0, svg_size.width() - 1)
         dimensions_layout.addWidget(self.x_spin)
-        
+
         dimensions_layout.addWidget(QLabel("Y:"))
         self.y_spin = QSpinBox()
-        self.y_spin.setRange(0, 9999)
+        self.y_spin.setRange(0, svg_size.height() - 1)
         dimensions_layout.addWidget(self.y_spin)
-        
+
         dimensions_layout.addWidget(QLabel("Largeur:"))
         self.width_spin = QSpinBox()
-        self.width_spin.setRange(1, 9999)
+        self.width_spin.setRange(1, svg_size.width())
+        self.width_spin.setValue(svg_size.width())
         dimensions_layout.addWidget(self.width_spin)
-        
+
         dimensions_layout.addWidget(QLabel("Hauteur:"))
         self.height_spin = QSpinBox()
-        self.height_spin.setRange(1, 9999)
+        self.height_spin.setRange(1, svg_size.height())
+        self.height_spin.setValue(svg_size.height())
         dimensions_layout.addWidget(self.height_spin)
-        
+
         layout.addLayout(dimensions_layout)
-        
+
         # Boutons d'action
         buttons_layout = QHBoxLayout()
-        
+
         self.cancel_button = QPushButton("Annuler")
         self.cancel_button.clicked.connect(self.reject)
-        
+
         self.crop_button = QPushButton("Rogner")
         self.crop_button.clicked.connect(self.accept_crop)
-        
+
         buttons_layout.addWidget(self.cancel_button)
         buttons_layout.addWidget(self.crop_button)
-        
+
         layout.addLayout(buttons_layout)
-        
-        # Connecter les événements de sélection
-        self.crop_area.mouseReleaseEvent = self.update_spin_values
-        
-    def update_spin_values(self, event):
-        """Met à jour les valeurs des QSpinBox après la sélection"""
-        # Appel de la méthode parente
-        SvgCropArea.mouseReleaseEvent(self.crop_area, event)
-        
-        rect = self.crop_area.get_crop_rect()
-        if rect:
-            self.x_spin.setValue(rect.x())
-            self.y_spin.setValue(rect.y())
-            self.width_spin.setValue(rect.width())
-            self.height_spin.setValue(rect.height())
-    
+
+        # Synchronisation dans les deux sens entre la sélection et les QSpinBox
+        self.crop_area.selection_changed.connect(self.update_spin_values)
+        for spin in self.spins():
+            spin.valueChanged.connect(self.update_selection)
+
+    def spins(self):
+        return self.x_spin, self.y_spin, self.width_spin, self.height_spin
+
+    def update_spin_values(self, rect):
+        """Met à jour les valeurs des QSpinBox pendant et après la sélection"""
+        if rect.isEmpty():
+            return
+        # Pas de retour vers update_selection : la sélection est déjà à jour
+        for spin, value in zip(self.spins(), (rect.x(), rect.y(), rect.width(), rect.height())):
+            spin.blockSignals(True)
+            spin.setValue(value)
+            spin.blockSignals(False)
+
+    def update_selection(self):
+        """Affiche sur le SVG la zone saisie dans les QSpinBox"""
+        self.crop_area.set_selection(self.spin_rect())
+
+    def spin_rect(self):
+        return QRect(self.x_spin.value(), self.y_spin.value(), self.width_spin.value(), self.height_spin.value())
+
     def accept_crop(self):
         """Accepter le rognage avec les valeurs actuelles"""
-        self.crop_rect = QRect(
-            self.x_spin.value(),
-            self.y_spin.value(),
-            self.width_spin.value(),
-            self.height_spin.value()
-        )
-        self.accept()
\ No newline at end of file
+        self.crop_rect = self.spin_rect()
+        self.accept()
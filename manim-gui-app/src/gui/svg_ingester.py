@@ -0,0 +1,109 @@
+import logging
+import os
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from src.core.svg_ingest import ingest_svg, format_report
+
+logger = logging.getLogger(__name__)
+
+
+def log_ingest_report(svg_path, ingested_path, report):
+    """Log what the ingest stage did to an inserted SVG and return the message, or None."""
+    if report is None or ingested_path == svg_path:
+        return None
+    message = f"{os.path.basename(svg_path)} simplified: {format_report(report)}"
+    logger.info(message)
+    return message
+
+
+class IngestSignals(QObject):
+    """Signals emitted by the ingest tasks (QRunnable cannot emit by itself)."""
+    finished = pyqtSignal(object)
+
+
+class IngestTask(QRunnable):
+    """Run ingest_svg on an inserted SVG, then an optional prepare step, in a worker thread."""
+
+    def __init__(self, ingester, svg_path, prepare):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.ingester = ingester
+        self.svg_path = svg_path
+        self.prepare = prepare
+        self.callbacks = []
+        self.ingested_path = svg_path
+        self.report = None
+        self.prepared = None
+        self.error = None
+
+    def run(self):
+        try:
+            self.ingested_path, self.report = ingest_svg(self.svg_path)
+            if self.prepare is not None:
+                self.prepared = self.prepare(self.ingested_path)
+        except Exception as e:
+            self.error = str(e)
+        self.ingester.signals.finished.emit(self)
+
+
+class SvgIngester(QObject):
+    """
+    Ingest inserted SVGs off the GUI thread.
+
+    ingest_svg takes seconds on a large page (hashing, minifying,
+    simplifying), so the window stays usable while it runs: the callback
+    of a request is called on the GUI thread once the file is ready. A
+    request for a file which is already being ingested with the same
+    prepare step is added to that task. One thread: the steps are memory
+    hungry and a second large page would only compete with the first.
+    """
+
+    # svg_path, ingested_path, report (None if nothing was done)
+    svg_ingested = pyqtSignal(object, object, object)
+    # svg_path, error message
+    ingest_failed = pyqtSignal(object, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pending = {}  # (svg_path, prepare) -> IngestTask
+        self.signals = IngestSignals(self)
+        self.signals.finished.connect(self.on_task_finished)
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+
+    def ingest(self, svg_path, callback, prepare=None):
+        """
+        Queue the ingestion of svg_path.
+
+        Args:
+            svg_path (str): SVG file inserted
+            callback (callable): Called on the GUI thread with (ingested path,
+                result of prepare or None); not called if a step failed
+            prepare (callable, optional): Called in the worker thread with the
+                ingested path, for the slow work the callback needs (parsing...)
+        """
+        key = (svg_path, prepare)
+        task = self.pending.get(key)
+        if task is None:
+            task = IngestTask(self, svg_path, prepare)
+            self.pending[key] = task
+            self.thread_pool.start(task)
+        task.callbacks.append(callback)
+
+    def on_task_finished(self, task):
+        """Hand the result of a task to its callbacks on the GUI thread."""
+        if self.pending.get((task.svg_path, task.prepare)) is task:
+            del self.pending[(task.svg_path, task.prepare)]
+        if task.error is not None:
+            print(f"Error ingesting {task.svg_path}: {task.error}")
+            self.ingest_failed.emit(task.svg_path, task.error)
+            return
+        self.svg_ingested.emit(task.svg_path, task.ingested_path, task.report)
+        for callback in task.callbacks:
+            callback(task.ingested_path, task.prepared)
+
+    def shutdown(self):
+        """Drop the queued requests and wait for the running one."""
+        for key, task in list(self.pending.items()):
+            if self.thread_pool.tryTake(task):
+                del self.pending[key]
+        self.thread_pool.waitForDone()
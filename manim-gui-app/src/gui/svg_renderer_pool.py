@@ -0,0 +1,105 @@
+import os
+import weakref
+from PyQt5.QtSvg import QSvgRenderer
+from src.core.render_cache import LRUCache
+
+
+class SvgRendererPool:
+    """
+    Process-wide pool of parsed SVG files, shared by the SVG widgets.
+
+    A QSvgRenderer holds the parsed document of a file. Renderers are keyed
+    by real path, modification time and size, so every widget showing the
+    same file shares one parsed copy, and a file rewritten on disk gets a
+    new renderer instead of a stale one.
+
+    acquire() and release() count the users of each renderer; bind() ties
+    a reference to the widget holding it, so that a widget deleted without
+    releasing its renderer does not keep it in use forever. Renderers
+    nobody uses anymore are kept in an LRU cache capped at max_bytes, so
+    going back to a slide reuses them without reading the disk. Their size
+    is estimated from the file size, since Qt does not report the memory
+    of a parsed document.
+    """
+
+    CACHE_SIZE_BYTES = 256 * 1024 * 1024
+    PARSED_SIZE_FACTOR = 4  # Parsed document size relative to the file size (estimate)
+
+    def __init__(self, max_bytes=CACHE_SIZE_BYTES):
+        self.in_use = {}  # key -> [renderer, ref_count, size]
+        self.keys = {}    # id(renderer) -> key, for the renderers in use
+        self.idle = LRUCache(max_bytes, sizeof=lambda entry: entry[1])  # key -> (renderer, size)
+        self.loads = 0
+        self.shared = 0
+
+    @staticmethod
+    def file_key(svg_path):
+        stat = os.stat(svg_path)
+        return (os.path.realpath(svg_path), stat.st_mtime_ns, stat.st_size)
+
+    def acquire(self, svg_path):
+        """Return the shared QSvgRenderer of a file; give it back with release()."""
+        try:
+            key = self.file_key(svg_path)
+        except OSError:
+            # Missing file: an invalid renderer which is not pooled
+            return QSvgRenderer()
+
+        entry = self.in_use.get(key)
+        if entry is not None:
+            entry[1] += 1
+            self.shared += 1
+            return entry[0]
+
+        cached = self.idle.get(key)
+        if cached is not None:
+            self.idle.discard(key)
+            renderer, size = cached
+        else:
+            renderer = QSvgRenderer(svg_path)
+            size = key[2] * self.PARSED_SIZE_FACTOR
+            self.loads += 1
+        self.in_use[key] = [renderer, 1, size]
+        self.keys[id(renderer)] = key
+        return renderer
+
+    def release(self, renderer):
+        """Give back a renderer obtained from acquire()."""
+        key = self.keys.get(id(renderer))
+        entry = self.in_use.get(key)
+        if entry is None or entry[0] is not renderer:
+            return  # Not pooled
+        entry[1] -= 1
+        if entry[1] > 0:
+            return
+        del self.in_use[key]
+        del self.keys[id(renderer)]
+        self.idle.put(key, (renderer, entry[2]))
+
+    def bind(self, renderer, owner):
+        """
+        Release renderer when owner is garbage collected, unless it was released before.
+
+        Returns:
+            weakref.finalize: Call it instead of release(renderer); the
+            renderer is given back once either way
+        """
+        return weakref.finalize(owner, self.release, renderer)
+
+    def clear(self):
+        """Drop the renderers nobody uses."""
+        self.idle.clear()
+
+    def stats(self):
+        """Return a dictionary describing the pool usage."""
+        return {
+            "in_use": len(self.in_use),
+            "references": sum(entry[1] for entry in self.in_use.values()),
+            "in_use_bytes": sum(entry[2] for entry in self.in_use.values()),
+            "loads": self.loads,
+            "shared": self.shared,
+            "idle": self.idle.stats(),
+        }
+
+
+svg_renderer_pool = SvgRendererPool()
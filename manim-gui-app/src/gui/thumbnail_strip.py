@@ -0,0 +1,115 @@
+from PyQt5.QtWidgets import QListWidget, QListWidgetItem, QListView
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, QSize, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap, QIcon
+from src.core.thumbnail_cache import ThumbnailCache
+
+
+class ThumbnailSignals(QObject):
+    """Signals emitted by the thumbnail tasks."""
+    finished = pyqtSignal(object, int, bytes)  # document, page index, PNG data
+
+
+class ThumbnailTask(QRunnable):
+    """Render one low-resolution thumbnail and store it in the disk cache."""
+
+    def __init__(self, strip, document, page_index, width):
+        super().__init__()
+        self.strip = strip
+        self.document = document
+        self.page_index = page_index
+        self.width = width
+
+    def run(self):
+        # The strip may have switched to another PDF in the meantime
+        if self.document is not self.strip.document:
+            return
+        try:
+            page_width = self.document.page_size(self.page_index)[0]
+            pix = self.document.render_pixmap(self.page_index, self.width / page_width)
+            data = pix.tobytes("png")
+            self.strip.thumbnail_cache.put_thumbnail(self.document, self.page_index, self.width, data)
+        except Exception as e:
+            print(f"Error creating thumbnail for page {self.page_index + 1}: {e}")
+            return
+        self.strip.signals.finished.emit(self.document, self.page_index, data)
+
+
+class ThumbnailStrip(QListWidget):
+    """
+    Vertical strip of page thumbnails for a PdfDocument.
+
+    Thumbnails are stored on disk, keyed by PdfDocument.cache_key (a hash
+    of the path, size and modification time of the PDF) and the page
+    index, so reopening a deck shows every thumbnail at once. The key is
+    known as soon as the deck opens, where a content hash would read the
+    whole PDF before the first lookup; the price is that a copied or
+    touched deck renders its thumbnails again. The missing ones are
+    rendered at low resolution in a background thread.
+    """
+
+    page_selected = pyqtSignal(int)  # 0-based page index
+
+    THUMBNAIL_WIDTH = ThumbnailCache.THUMBNAIL_WIDTH
+
+    def __init__(self, parent=None, thumbnail_cache=None):
+        super().__init__(parent)
+        self.document = None
+        self.thumbnail_cache = thumbnail_cache or ThumbnailCache()
+        self.signals = ThumbnailSignals(self)
+        self.signals.finished.connect(self.on_thumbnail_ready)
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+
+        self.setViewMode(QListView.ListMode)
+        self.setFlow(QListView.TopToBottom)
+        self.setIconSize(QSize(self.THUMBNAIL_WIDTH, self.THUMBNAIL_WIDTH * 3 // 2))
+        self.setUniformItemSizes(True)
+        self.setFixedWidth(self.THUMBNAIL_WIDTH + 40)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.currentRowChanged.connect(self.on_current_row_changed)
+
+    def set_document(self, document):
+        """Show the thumbnails of a PdfDocument, rendering only the uncached ones."""
+        self.thread_pool.clear()
+        self.document = document
+        self.blockSignals(True)
+        self.clear()
+        self.blockSignals(False)
+        if document is None:
+            return
+
+        missing = []
+        for page_index in range(len(document)):
+            item = QListWidgetItem(str(page_index + 1))
+            item.setTextAlignment(Qt.AlignHCenter)
+            self.addItem(item)
+            data = self.thumbnail_cache.get_thumbnail(document, page_index, self.THUMBNAIL_WIDTH)
+            if data is None or not self.set_thumbnail(page_index, data):
+                missing.append(page_index)
+
+        for page_index in missing:
+            self.thread_pool.start(ThumbnailTask(self, document, page_index, self.THUMBNAIL_WIDTH))
+
+    def set_thumbnail(self, page_index, data):
+        """Decode PNG data into the icon of a page; return False if invalid."""
+        image = QImage.fromData(data, "PNG")
+        if image.isNull():
+            return False
+        self.item(page_index).setIcon(QIcon(QPixmap.fromImage(image)))
+        return True
+
+    def on_thumbnail_ready(self, document, page_index, data):
+        if document is self.document and page_index < self.count():
+            self.set_thumbnail(page_index, data)
+
+    def set_current_page(self, page_index):
+        """Highlight a page without emitting page_selected."""
+        self.blockSignals(True)
+        self.setCurrentRow(page_index)
+        self.blockSignals(False)
+        if self.currentItem():
+            self.scrollToItem(self.currentItem())
+
+    def on_current_row_changed(self, row):
+        if row >= 0:
+            self.page_selected.emit(row)
@@ -0,0 +1,191 @@
+import math
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtCore import Qt, QRectF, QTimer, pyqtSignal
+from PyQt5.QtGui import QPainter, QColor
+
+
+class TiledPageView(QWidget):
+    """
+    Display one PDF page as a grid of tiles rendered on demand.
+
+    Tiles are TILE_SIZE device pixels wide and belong to a pyramid of
+    rendering levels spaced by half an octave: level k renders the page at
+    2 ** (k / 2) pixels per point. Only the tiles intersecting the visible
+    part of the widget are requested, each one is rasterized with a MuPDF
+    clip rectangle. While a tile is missing, cached tiles of a neighbouring
+    level are scaled into its place, so zooming shows a blurry page at once
+    which sharpens when the tiles of the right level arrive. A low-resolution
+    preview of the whole page is the last resort, it is only ever painted
+    where no tile is available.
+    """
+
+    TILE_SIZE = 256  # Tile side in device pixels
+    MIN_LEVEL = -6  # 1/8 pixel per point
+    MAX_LEVEL = 12  # 64 pixels per point
+    FALLBACK_DEPTH = 4  # Levels searched above/below for a stand-in tile
+
+    # Emitted once per event loop iteration when the visible tiles changed
+    visible_tiles_changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.document = None
+        self.page_index = 0
+        self.page_size = (0, 0)
+        self.zoom = 1.0
+        # Coalesce the tile requests of consecutive paint events
+        self.request_timer = QTimer(self)
+        self.request_timer.setSingleShot(True)
+        self.request_timer.timeout.connect(self.visible_tiles_changed)
+
+    def set_page(self, document, page_index, zoom):
+        """Show a page of a PdfDocument at the given zoom (logical pixels per point)."""
+        self.document = document
+        self.page_index = page_index
+        self.zoom = zoom
+        self.page_size = document.page_size(page_index)
+        self.setFixedSize(math.ceil(self.page_size[0] * zoom), math.ceil(self.page_size[1] * zoom))
+        self.update()
+
+    # --- Pyramid geometry -------------------------------------------------
+
+    @staticmethod
+    def level_scale(level):
+        """Pixels per point rendered at a pyramid level."""
+        return 2 ** (level / 2)
+
+    def target_level(self):
+        """Smallest level at least as sharp as the screen at the current zoom."""
+        scale = self.zoom * self.devicePixelRatioF()
+        level = math.ceil(2 * math.log2(scale) - 1e-9)
+        return max(self.MIN_LEVEL, min(self.MAX_LEVEL, level))
+
+    def tile_key(self, page_index, level, col, row):
+        """Key of a tile in the page cache of the document."""
+        return ("tile", page_index, level, col, row)
+
+    def preview_key(self, page_index):
+        """Key of the low-resolution preview of a page in the page cache."""
+        return ("preview", page_index)
+
+    def tile_clip(self, page_size, level, col, row):
+        """Area of the page covered by a tile, in PDF points."""
+        step = self.TILE_SIZE / self.level_scale(level)
+        return (col * step, row * step,
+                min((col + 1) * step, page_size[0]), min((row + 1) * step, page_size[1]))
+
+    def tiles_in_rect(self, rect, page_size, level):
+        """Yield (col, row) of the tiles of a level intersecting a widget rect."""
+        # Widget pixels -> points -> level pixels
+        factor = self.level_scale(level) / self.zoom
+        max_col = math.ceil(page_size[0] * self.level_scale(level) / self.TILE_SIZE) - 1
+        max_row = math.ceil(page_size[1] * self.level_scale(level) / self.TILE_SIZE) - 1
+        first_col = max(0, int(rect.left() * factor) // self.TILE_SIZE)
+        first_row = max(0, int(rect.top() * factor) // self.TILE_SIZE)
+        last_col = min(max_col, int((rect.right() + 1) * factor) // self.TILE_SIZE)
+        last_row = min(max_row, int((rect.bottom() + 1) * factor) // self.TILE_SIZE)
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                yield col, row
+
+    def tile_rect(self, level, col, row):
+        """Widget rect covered by a tile."""
+        x0, y0, x1, y1 = self.tile_clip(self.page_size, level, col, row)
+        return QRectF(x0 * self.zoom, y0 * self.zoom,
+                      (x1 - x0) * self.zoom, (y1 - y0) * self.zoom)
+
+    def visible_rect(self):
+        """Part of the widget currently visible in the scroll area."""
+        return self.visibleRegion().boundingRect()
+
+    def missing_tiles(self, page_index, rect, count=False):
+        """
+        Return (key, scale, clip) for the uncached tiles of a page inside rect.
+
+        With count=True the lookups go into the cache statistics (and mark
+        the cached tiles as recently used): the caller requests a render
+        for every miss.
+        """
+        if self.document is None:
+            return []
+        cache = self.document.page_cache
+        page_size = self.document.page_size(page_index)
+        level = self.target_level()
+        missing = []
+        for col, row in self.tiles_in_rect(rect, page_size, level):
+            key = self.tile_key(page_index, level, col, row)
+            cached = cache.get(key) is not None if count else key in cache
+            if not cached:
+                missing.append((key, self.level_scale(level),
+                                self.tile_clip(page_size, level, col, row)))
+        return missing
+
+    # --- Painting ---------------------------------------------------------
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        # Tiles are rendered with a transparent background, the page is white
+        painter.fillRect(event.rect(), QColor(Qt.white))
+        if self.document is None:
+            return
+
+        level = self.target_level()
+        needs_tiles = False
+        for col, row in self.tiles_in_rect(event.rect(), self.page_size, level):
+            # Repaints are not lookups: the statistics count the render requests (missing_tiles)
+            image = self.document.page_cache.peek(self.tile_key(self.page_index, level, col, row))
+            if image is not None:
+                self.draw_tile(painter, image, level, col, row)
+            else:
+                needs_tiles = True
+                self.draw_fallback(painter, level, col, row)
+        if needs_tiles:
+            self.request_timer.start(0)
+
+    def draw_tile(self, painter, image, level, col, row):
+        """Draw a cached tile image at its place."""
+        painter.drawImage(self.tile_rect(level, col, row), image)
+
+    def draw_fallback(self, painter, level, col, row):
+        """Fill a missing tile with scaled tiles of the closest cached level."""
+        cache = self.document.page_cache
+        target = self.tile_rect(level, col, row)
+        # Sharper levels first (zooming out), then coarser ones (zooming in)
+        candidates = [level + d for d in range(1, self.FALLBACK_DEPTH + 1)]
+        candidates += [level - d for d in range(1, self.FALLBACK_DEPTH + 1)]
+        for candidate in candidates:
+            if not self.MIN_LEVEL <= candidate <= self.MAX_LEVEL:
+                continue
+            images = []
+            for c, r in self.tiles_in_rect(target.toAlignedRect(), self.page_size, candidate):
+                image = cache.peek(self.tile_key(self.page_index, candidate, c, r))
+                if image is not None:
+                    images.append((image, c, r))
+            if images:
+                painter.save()
+                painter.setClipRect(target)
+                for image, c, r in images:
+                    self.draw_tile(painter, image, candidate, c, r)
+                painter.restore()
+                return
+
+        preview = cache.peek(self.preview_key(self.page_index))
+        if preview is not None:
+            painter.save()
+            painter.setClipRect(target)
+            painter.drawImage(QRectF(0, 0, self.width(), self.height()), preview)
+            painter.restore()
+
+    def on_image_rendered(self, key):
+        """Repaint the area of a freshly rendered tile or preview if it is on this page."""
+        if self.document is None or key[1] != self.page_index:
+            return
+        if key[0] == "preview":
+            # Painted only where tiles are missing, never over a sharper render
+            self.update()
+        else:
+            _, _, level, col, row = key
+            self.update(self.tile_rect(level, col, row).toAlignedRect().adjusted(-1, -1, 1, 1))
+
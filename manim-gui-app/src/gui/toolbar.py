@@ -6,6 +6,12 @@ class Toolbar(QToolBar):
         super().__init__("Main Toolbar", parent)
         
         # Créer les actions pour la barre d'outils
+        self.open_project_action = QAction("Open Project", self)
+        self.open_project_action.triggered.connect(self.parent().open_project if parent else lambda: None)
+        
+        self.save_project_action = QAction("Save Project", self)
+        self.save_project_action.triggered.connect(self.parent().save_project if parent else lambda: None)
+        
         self.open_pdf_action = QAction("Open PDF", self)
         self.open_pdf_action.triggered.connect(self.parent().open_pdf if parent else lambda: None)
         
@@ -19,6 +25,8 @@ class Toolbar(QToolBar):
         self.export_slide_action.triggered.connect(self.parent().export_slide if parent else lambda: None)
         
         # Ajouter les actions à la barre d'outils
+        self.addAction(self.open_project_action)
+        self.addAction(self.save_project_action)
         self.addAction(self.open_pdf_action)
         self.addAction(self.add_slide_action)
         self.addAction(self.generate_manim_action)
@@ -1,3 +1,4 @@
+import logging
 import sys
 import os
 # Ajouter le chemin du répertoire parent au PYTHONPATH
@@ -7,6 +8,9 @@ from PyQt5.QtWidgets import QApplication
 from src.gui.main_window import MainWindow
 
 def main():
+    # Journal des interactions (souris, sélection) : MANIM_GUI_LOG_LEVEL=DEBUG pour l'activer
+    logging.basicConfig(level=os.environ.get("MANIM_GUI_LOG_LEVEL", "WARNING").upper(),
+                        format="%(levelname)s %(name)s: %(message)s")
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
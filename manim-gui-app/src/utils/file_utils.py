@@ -1,12 +1,18 @@
 def load_project_file(file_path):
-    """Load a project file and return its contents."""
-    with open(file_path, 'r') as file:
-        return file.read()
+    """Open a project file (see src.core.project_file), reading only its manifest; None if it cannot be read."""
+    import json
+    import zipfile
+    from src.core.project_file import ProjectFile
+    try:
+        return ProjectFile(file_path)
+    except (OSError, KeyError, ValueError, json.JSONDecodeError, zipfile.BadZipFile) as e:
+        print(f"Error opening project {file_path}: {e}")
+        return None
 
-def save_project_file(file_path, content):
-    """Save content to a project file."""
-    with open(file_path, 'w') as file:
-        file.write(content)
+def save_project_file(file_path, slides, previous=None):
+    """Save slides and their SVG assets to a project file, see src.core.project_file.write_project."""
+    from src.core.project_file import write_project
+    return write_project(file_path, slides, previous)
 
 def list_files_in_directory(directory_path):
     """Return a list of files in the specified directory."""
@@ -17,4 +23,32 @@ def create_directory(directory_path):
     """Create a directory if it does not exist."""
     import os
     if not os.path.exists(directory_path):
-        os.makedirs(directory_path)
\ No newline at end of file
+        os.makedirs(directory_path)
+
+def get_cache_directory(name):
+    """Return (and create) the application cache sub-directory called name."""
+    import os
+    base = os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA")
+    if not base:
+        base = os.path.join(os.path.expanduser("~"), ".cache")
+    directory = os.path.join(base, "manim-gui-app", name)
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+def hash_file(file_path, chunk_size=1024 * 1024):
+    """Return the SHA-256 hex digest of a file's content."""
+    import hashlib
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def make_temp_file(suffix=""):
+    """Create a unique empty temporary file, in memory (/dev/shm) when available, and return its path."""
+    import os
+    import tempfile
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+    fd, path = tempfile.mkstemp(suffix=suffix, prefix="manim_gui_", dir=directory)
+    os.close(fd)
+    return path
@@ -0,0 +1,22 @@
+import os
+import shutil
+import tempfile
+import unittest
+from src.core.batch_converter import output_directory_for, output_path
+
+class TestBatchConverter(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_output_paths(self):
+        pdf_path = os.path.join(self.temp_dir, "deck.pdf")
+        output_dir = output_directory_for(pdf_path)
+        self.assertEqual(output_dir, os.path.join(self.temp_dir, "deck_svg"))
+        self.assertEqual(output_path(output_dir, 7), os.path.join(output_dir, "page_007.svg"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import fitz
+from PyQt5.QtCore import QCoreApplication
+from src.gui.conversion_scheduler import ConversionScheduler, ConversionJob
+
+class TestConversionScheduler(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_path = os.path.join(self.temp_dir, "deck.pdf")
+        document = fitz.open()
+        for i in range(4):
+            page = document.new_page(width=200, height=100)
+            page.insert_text((20, 50), f"Page {i + 1}")
+        document.save(self.pdf_path)
+        document.close()
+        self.scheduler = ConversionScheduler(max_workers=1, use_shell=False, use_cache=False)
+        self.finished = []
+        self.scheduler.job_finished.connect(self.finished.append)
+
+    def tearDown(self):
+        self.scheduler.shutdown()
+        shutil.rmtree(self.temp_dir)
+
+    def output(self, name):
+        return os.path.join(self.temp_dir, name)
+
+    def wait(self, timeout=60):
+        deadline = time.monotonic() + timeout
+        while self.scheduler.pending_jobs() and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.01)
+        self.assertEqual(self.scheduler.pending_jobs(), [])
+
+    def test_priority_merge_and_cancel(self):
+        jobs = [self.scheduler.submit(self.pdf_path, page, self.output(f"batch_{page}.svg"),
+                                      backend="pymupdf")
+                for page in range(1, 5)]
+        self.assertEqual(jobs[0].state, ConversionJob.RUNNING)
+
+        merged = self.scheduler.submit(self.pdf_path, 4, self.output("current.svg"), backend="pymupdf",
+                                       priority=ConversionScheduler.PRIORITY_INTERACTIVE)
+        self.assertIs(merged, jobs[3])
+        self.scheduler.cancel([jobs[1]])
+        self.wait()
+
+        self.assertEqual([job.page_number for job in self.finished], [2, 1, 4, 3])
+        self.assertEqual(jobs[1].state, ConversionJob.CANCELLED)
+        self.assertEqual(jobs[3].state, ConversionJob.DONE)
+        self.assertTrue(os.path.exists(self.output("batch_4.svg")))
+        self.assertTrue(os.path.exists(self.output("current.svg")))
+        self.assertFalse(os.path.exists(self.output("batch_2.svg")))
+
+    def test_failed_job(self):
+        job = self.scheduler.submit(self.pdf_path, 9, self.output("missing.svg"), backend="pymupdf")
+        self.wait()
+        self.assertEqual(job.state, ConversionJob.FAILED)
+        self.assertEqual(self.finished, [job])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from src.core.disk_cache import DiskCache
+
+class TestDiskCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = DiskCache(self.temp_dir, max_bytes=100, suffix=".bin")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_put_and_get(self):
+        path = self.cache.put_bytes("abcdef_0", b"hello")
+        self.assertTrue(path.endswith("abcdef_0.bin"))
+        self.assertEqual(self.cache.get_bytes("abcdef_0"), b"hello")
+        self.assertIsNone(self.cache.get_bytes("missing"))
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_put_file(self):
+        source = os.path.join(self.temp_dir, "source.txt")
+        with open(source, 'wb') as file:
+            file.write(b"content")
+        self.cache.put_file("key", source)
+        self.assertEqual(self.cache.get_bytes("key"), b"content")
+
+    def test_evicts_least_recently_used(self):
+        self.cache.put_bytes("old", b"x" * 40)
+        self.cache.put_bytes("used", b"x" * 40)
+        # Make sure the access below gives "used" a more recent mtime
+        past = time.time() - 10
+        os.utime(self.cache.path_for("old"), (past, past))
+        os.utime(self.cache.path_for("used"), (past, past))
+        self.assertIsNotNone(self.cache.get_path("used"))
+        self.cache.put_bytes("new", b"x" * 40)
+        self.assertIsNone(self.cache.get_path("old"))
+        self.assertIsNotNone(self.cache.get_path("used"))
+        self.assertIsNotNone(self.cache.get_path("new"))
+        self.assertLessEqual(self.cache.total_bytes(), 100)
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_overwrite_counts_size_difference(self):
+        self.cache.put_bytes("kept", b"x" * 40)
+        for _ in range(5):
+            self.cache.put_bytes("rewritten", b"x" * 40)
+        self.assertEqual(self.cache.evictions, 0)
+        self.assertIsNotNone(self.cache.get_path("kept"))
+
+    def test_shared_directory(self):
+        self.cache.put_bytes("shared", b"data")
+        other = DiskCache(self.temp_dir, max_bytes=100, suffix=".bin")
+        self.assertEqual(other.get_bytes("shared"), b"data")
+
+if __name__ == '__main__':
+    unittest.main()
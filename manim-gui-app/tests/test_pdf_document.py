@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+import unittest
+import fitz
+from src.core.pdf_document import PdfDocument
+from src.core.pdf_handler import PdfHandler
+
+class TestPdfDocument(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_path = os.path.join(self.temp_dir, "deck.pdf")
+        document = fitz.open()
+        for i in range(3):
+            page = document.new_page(width=200, height=100)
+            page.insert_text((20, 50), f"Page {i + 1}")
+        document.save(self.pdf_path)
+        document.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_acquire_shares_one_handle(self):
+        first = PdfDocument.acquire(self.pdf_path)
+        second = PdfDocument.acquire(os.path.join(self.temp_dir, ".", "deck.pdf"))
+        self.assertIs(first, second)
+        self.assertEqual(first.ref_count, 2)
+        first.release()
+        self.assertFalse(first.document.is_closed)
+        second.release()
+        self.assertTrue(first.document.is_closed)
+        reopened = PdfDocument.acquire(self.pdf_path)
+        try:
+            self.assertIsNot(reopened, first)
+        finally:
+            reopened.release()
+        self.assertTrue(reopened.document.is_closed)
+
+    def test_cache_key_follows_file_changes(self):
+        def cache_key():
+            document = PdfDocument.acquire(self.pdf_path)
+            try:
+                return document.cache_key
+            finally:
+                document.release()
+
+        key = cache_key()
+        self.assertEqual(cache_key(), key)
+        stat = os.stat(self.pdf_path)
+        os.utime(self.pdf_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertNotEqual(cache_key(), key)
+
+    def test_save_page_as_image_releases_document(self):
+        image_path = os.path.join(self.temp_dir, "page.png")
+        PdfHandler(self.pdf_path).save_page_as_image(0, image_path)
+        self.assertTrue(os.path.exists(image_path))
+        self.assertNotIn(os.path.realpath(self.pdf_path), PdfDocument._registry)
+
+    def test_render_pixmap(self):
+        document = PdfDocument.acquire(self.pdf_path)
+        try:
+            pix = document.render_pixmap(0, scale=2.0)
+            self.assertEqual((pix.width, pix.height), (400, 200))
+            with self.assertRaises(IndexError):
+                document.render_pixmap(3)
+        finally:
+            document.release()
+
+    def test_handler_goes_through_shared_document(self):
+        handler = PdfHandler(self.pdf_path)
+        handler.load_pdf()
+        document = PdfDocument.acquire(self.pdf_path)
+        try:
+            self.assertIs(handler.document, document)
+            self.assertEqual(handler.get_page_count(), 3)
+            self.assertIn("Page 2", handler.extract_text(1))
+            image_path = os.path.join(self.temp_dir, "page.png")
+            handler.save_page_as_image(0, image_path)
+            self.assertTrue(os.path.exists(image_path))
+        finally:
+            handler.close()
+            document.release()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+from src.core.project_file import MANIFEST_NAME, SLIDE_SIZE, ProjectFile, asset_member, write_project
+from src.utils.file_utils import hash_file, load_project_file, save_project_file
+
+SVG = '<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10"><rect width="{0}" height="5"/></svg>'
+
+class TestProjectFile(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.assets_dir = os.path.join(self.temp_dir, "assets")
+        os.makedirs(self.assets_dir)
+        self.svg_paths = []
+        for index in range(2):
+            path = os.path.join(self.temp_dir, f"page{index}.svg")
+            with open(path, "w") as f:
+                f.write(SVG.format(index + 1))
+            self.svg_paths.append(path)
+        self.project_path = os.path.join(self.temp_dir, "talk.mgp")
+        self.slides = [
+            {"name": "Slide 1", "objects": [
+                {"path": self.svg_paths[0], "geometry": [10, 20, 300, 200], "crop": [[0, 0, 5, 2.5]]},
+                {"path": self.svg_paths[1], "geometry": [0, 0, 50, 50], "crop": []}]},
+            {"name": "Slide 2", "objects": [
+                {"path": self.svg_paths[0], "geometry": [1, 2, 3, 4], "crop": []}]},
+            {"name": "Empty", "objects": []}]
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_round_trip(self):
+        self.assertTrue(save_project_file(self.project_path, self.slides))
+        with zipfile.ZipFile(self.project_path) as archive:
+            names = archive.namelist()
+        # Manifest first, each asset once
+        self.assertEqual(names[0], MANIFEST_NAME)
+        self.assertEqual(len(names), 3)
+
+        project = load_project_file(self.project_path)
+        self.assertEqual([slide["name"] for slide in project.slides], ["Slide 1", "Slide 2", "Empty"])
+        first = project.slides[0]["objects"][0]
+        self.assertEqual(first["asset"], hash_file(self.svg_paths[0]))
+        self.assertEqual(first["geometry"], [10, 20, 300, 200])
+        self.assertEqual(first["crop"], [[0, 0, 5, 2.5]])
+        # Geometries are in the slide units recorded with them
+        self.assertEqual(project.slide_size, SLIDE_SIZE)
+        self.assertEqual(project.slides[1]["objects"][0]["asset"], first["asset"])
+
+    def test_assets_extracted_on_demand(self):
+        write_project(self.project_path, self.slides)
+        project = ProjectFile(self.project_path)
+        self.assertEqual(os.listdir(self.assets_dir), [])
+        digest = project.slides[0]["objects"][1]["asset"]
+        path = project.asset_path(digest, self.assets_dir)
+        self.assertEqual(os.listdir(self.assets_dir), [f"{digest}.svg"])
+        with open(path) as f:
+            self.assertEqual(f.read(), SVG.format(2))
+        self.assertEqual(project.digest_of(path), digest)
+        self.assertIsNone(project.asset_path("0" * 64, self.assets_dir))
+
+    def test_save_over_with_unextracted_assets(self):
+        write_project(self.project_path, self.slides)
+        project = ProjectFile(self.project_path)
+        digest = project.slides[0]["objects"][0]["asset"]
+        # Slide 1 is shown (its assets extracted), Slide 2 is saved from the manifest
+        slides = [{"name": "Slide 1", "objects": [
+                      {"path": project.asset_path(digest, self.assets_dir), "geometry": [0, 0, 9, 9], "crop": []}]},
+                  {"name": "Slide 2", "objects": project.slides[0]["objects"][1:]}]
+        self.assertTrue(write_project(self.project_path, slides, project))
+        reopened = ProjectFile(self.project_path)
+        self.assertEqual(len(reopened.assets), 2)
+        with zipfile.ZipFile(self.project_path) as archive:
+            self.assertEqual(archive.read(asset_member(reopened.slides[1]["objects"][0]["asset"])).decode(),
+                             SVG.format(2))
+        self.assertFalse([name for name in os.listdir(self.temp_dir) if name.startswith("tmp")])
+
+    def test_invalid_files(self):
+        with open(self.project_path, "w") as f:
+            f.write("Slide 1")
+        self.assertIsNone(load_project_file(self.project_path))
+        with zipfile.ZipFile(self.project_path, "w") as archive:
+            archive.writestr(MANIFEST_NAME, '{"format": "manim-gui-project", "version": 99}')
+        self.assertIsNone(load_project_file(self.project_path))
+        # Digests name extracted files: a path in their place is rejected
+        with zipfile.ZipFile(self.project_path, "w") as archive:
+            archive.writestr(MANIFEST_NAME, '{"format": "manim-gui-project", "version": 1, "assets": ["../../x"], '
+                                            '"slides": [{"name": "S", "objects": [{"asset": "../../x", '
+                                            '"geometry": [0, 0, 1, 1], "crop": []}]}]}')
+        self.assertIsNone(load_project_file(self.project_path))
+        # A missing SVG fails the save and leaves no partial file
+        self.slides[1]["objects"][0]["path"] = os.path.join(self.temp_dir, "missing.svg")
+        self.assertFalse(save_project_file(os.path.join(self.temp_dir, "other.mgp"), self.slides))
+        self.assertFalse([name for name in os.listdir(self.temp_dir) if name.endswith(".mgp")
+                          and name != "talk.mgp"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+from src.core.render_cache import LRUCache
+
+class TestLRUCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = LRUCache(max_bytes=10, sizeof=len)
+
+    def test_hit_and_miss_counters(self):
+        self.cache.put((0, 1.5, 1.0), "abc")
+        self.assertEqual(self.cache.get((0, 1.5, 1.0)), "abc")
+        self.assertIsNone(self.cache.get((1, 1.5, 1.0)))
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+        self.assertEqual(self.cache.stats()["hit_rate"], 0.5)
+
+    def test_evicts_least_recently_used(self):
+        self.cache.put("a", "aaaa")
+        self.cache.put("b", "bbbb")
+        self.cache.get("a")
+        self.cache.put("c", "cccc")
+        self.assertIn("a", self.cache)
+        self.assertNotIn("b", self.cache)
+        self.assertIn("c", self.cache)
+        self.assertEqual(self.cache.current_bytes, 8)
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_replace_updates_size(self):
+        self.cache.put("a", "aaaa")
+        self.cache.put("a", "aa")
+        self.assertEqual(self.cache.current_bytes, 2)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_oversized_value_is_not_cached(self):
+        self.cache.put("a", "aaaa")
+        self.cache.put("big", "x" * 11)
+        self.assertNotIn("big", self.cache)
+        self.assertIn("a", self.cache)
+
+if __name__ == '__main__':
+    unittest.main()
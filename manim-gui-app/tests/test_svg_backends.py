@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+import unittest
+import fitz
+from src.core.inkscape_interface import InkscapeInterface
+from src.core.svg_backends import InkscapeBackend, PyMuPdfBackend, SvgBackend
+from src.core.svg_cache import SvgCache
+
+class TestSvgBackends(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_path = os.path.join(self.temp_dir, "deck.pdf")
+        document = fitz.open()
+        for i in range(2):
+            page = document.new_page(width=200, height=100)
+            page.insert_text((20, 50), f"Page {i + 1}")
+        document.save(self.pdf_path)
+        document.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def read(self, path):
+        with open(path, encoding='utf-8') as file:
+            return file.read()
+
+    def test_pymupdf_text_as_path(self):
+        output_path = os.path.join(self.temp_dir, "page.svg")
+        self.assertTrue(PyMuPdfBackend(text_as_path=False).pdf_to_svg(self.pdf_path, 1, output_path))
+        self.assertIn("<text", self.read(output_path))
+        self.assertTrue(PyMuPdfBackend(text_as_path=False).pdf_to_svg(
+            self.pdf_path, 1, output_path, simplify=True))
+        self.assertNotIn("<text", self.read(output_path))
+        self.assertIn("<path", self.read(output_path))
+
+    def test_pymupdf_invalid_page(self):
+        output_path = os.path.join(self.temp_dir, "page.svg")
+        self.assertFalse(PyMuPdfBackend().pdf_to_svg(self.pdf_path, 5, output_path))
+        self.assertFalse(os.path.exists(output_path))
+
+    def test_backend_selected_per_job(self):
+        interface = InkscapeInterface("missing-inkscape-executable",
+                                      svg_cache=SvgCache(os.path.join(self.temp_dir, "cache")))
+        output_path = os.path.join(self.temp_dir, "page.svg")
+        self.assertTrue(interface.pdf_page_to_simplified_svg(
+            self.pdf_path, 2, output_svg_path=output_path, backend="pymupdf"))
+        self.assertTrue(interface.pdf_to_svg(self.pdf_path, 2, output_path,
+                                             backend=PyMuPdfBackend(text_as_path=False)))
+        self.assertIn("<text", self.read(output_path))
+        self.assertTrue(interface.pdf_page_to_simplified_svg(
+            self.pdf_path, 2, output_svg_path=output_path, backend="pymupdf"))
+        self.assertNotIn("<text", self.read(output_path))
+        self.assertEqual(interface.cache_stats()["hits"], 1)
+        with self.assertRaises(ValueError):
+            interface.get_backend("unknown")
+
+    def test_default_backend(self):
+        self.assertIsInstance(InkscapeInterface("missing-inkscape-executable", backend=None).default_backend,
+                              InkscapeBackend)
+        self.assertIsInstance(InkscapeInterface("missing-inkscape-executable", backend="pymupdf").default_backend,
+                              PyMuPdfBackend)
+        with self.assertRaises(TypeError):
+            SvgBackend()
+
+    def test_unknown_version_is_remembered(self):
+        interface = InkscapeInterface("missing-inkscape-version-executable")
+        self.assertEqual(interface.inkscape_version, "unknown")
+        self.assertEqual(InkscapeInterface.versions["missing-inkscape-version-executable"], "unknown")
+
+if __name__ == '__main__':
+    unittest.main()
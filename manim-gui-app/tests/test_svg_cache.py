@@ -0,0 +1,53 @@
+import os
+import shutil
+import tempfile
+import unittest
+from src.core.svg_cache import SvgCache
+
+class TestSvgCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = SvgCache(os.path.join(self.temp_dir, "cache"), max_bytes=10000)
+        self.pdf_path = self.write_file("deck.pdf", b"%PDF fake content")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_file(self, name, data):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'wb') as file:
+            file.write(data)
+        return path
+
+    def test_key_depends_on_every_input(self):
+        key = self.cache.conversion_key(self.pdf_path, "pdf_to_svg", "1.2", 1)
+        self.assertEqual(key, self.cache.conversion_key(self.pdf_path, "pdf_to_svg", "1.2", 1))
+        self.assertNotEqual(key, self.cache.conversion_key(self.pdf_path, "pdf_to_svg", "1.2", 2))
+        self.assertNotEqual(key, self.cache.conversion_key(self.pdf_path, "pdf_to_svg", "1.3", 1))
+        self.assertNotEqual(key, self.cache.conversion_key(self.pdf_path, "simplify_svg", "1.2", 1))
+        self.assertNotEqual(key, self.cache.conversion_key(self.pdf_path, "pdf_to_svg", "1.2", 1,
+                                                           plain_svg=False))
+        other_path = self.write_file("other.pdf", b"%PDF other content")
+        self.assertNotEqual(key, self.cache.conversion_key(other_path, "pdf_to_svg", "1.2", 1))
+
+    def test_store_and_fetch(self):
+        key = self.cache.conversion_key(self.pdf_path, "pdf_to_svg", "1.2", 1)
+        output_path = os.path.join(self.temp_dir, "page.svg")
+        self.assertFalse(self.cache.fetch(key, output_path))
+        self.cache.store(key, self.write_file("result.svg", b"<svg/>"))
+        self.assertTrue(self.cache.fetch(key, output_path))
+        with open(output_path, 'rb') as file:
+            self.assertEqual(file.read(), b"<svg/>")
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_hardlink_delivery(self):
+        cache = SvgCache(os.path.join(self.temp_dir, "linked"), max_bytes=10000, hardlink=True)
+        cache.store("abc", self.write_file("result.svg", b"<svg/>"))
+        output_path = os.path.join(self.temp_dir, "page.svg")
+        self.assertTrue(cache.fetch("abc", output_path))
+        self.assertTrue(os.path.samefile(output_path, cache.path_for("abc")))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import shutil
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from src.core.svg_crop import parse_length, write_cropped_svg
+
+class TestSvgCrop(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.svg_path = os.path.join(self.temp_dir, "page.svg")
+        self.output_path = os.path.join(self.temp_dir, "cropped.svg")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_svg(self, attributes):
+        with open(self.svg_path, "w") as f:
+            f.write(f'<svg xmlns="http://www.w3.org/2000/svg" {attributes}><rect width="10" height="10"/></svg>')
+
+    def test_parse_length(self):
+        self.assertEqual(parse_length("612pt"), (612.0, "pt"))
+        self.assertEqual(parse_length(" 1.5e2 "), (150.0, ""))
+        self.assertIsNone(parse_length("100%"))
+
+    def test_crop_scales_width_and_height(self):
+        self.write_svg('width="200pt" height="100pt" viewBox="0 0 400 200"')
+        self.assertTrue(write_cropped_svg(self.svg_path, (100, 50, 200, 100), self.output_path))
+        root = ET.parse(self.output_path).getroot()
+        self.assertEqual(root.get("viewBox"), "100 50 200 100")
+        self.assertEqual(root.get("width"), "100pt")
+        self.assertEqual(root.get("height"), "50pt")
+        self.assertEqual(root.tag, "{http://www.w3.org/2000/svg}svg")
+
+    def test_crop_without_view_box(self):
+        self.write_svg('width="300" height="200"')
+        self.assertTrue(write_cropped_svg(self.svg_path, (0, 0, 150, 50), self.output_path))
+        root = ET.parse(self.output_path).getroot()
+        self.assertEqual((root.get("width"), root.get("height")), ("150", "50"))
+
+    def test_invalid_file(self):
+        with open(self.svg_path, "w") as f:
+            f.write("not svg")
+        self.assertFalse(write_cropped_svg(self.svg_path, (0, 0, 1, 1), self.output_path))
+        self.assertEqual(os.listdir(self.temp_dir), ["page.svg"])
+
+if __name__ == '__main__':
+    unittest.main()
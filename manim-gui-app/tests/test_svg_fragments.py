@@ -0,0 +1,95 @@
+import os
+import shutil
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from src.core.svg_fragments import GridIndex, PageFragments, path_box
+
+SVG = "{http://www.w3.org/2000/svg}"
+XLINK_HREF = "{http://www.w3.org/1999/xlink}href"
+
+def glyph(x, y):
+    return f'<use xlink:href="#g" x="{x}" y="{y}" style="fill:#000000"/>'
+
+def line(x, y, count):
+    return "".join(glyph(x + 7 * index, y) for index in range(count))
+
+# Two lines of text, an equation on two levels (x over y), a figure and a page background
+PAGE = f"""<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink"
+     width="400" height="300" viewBox="0 0 400 300">
+  <defs>
+    <path id="g" d="M0 0h5v10h-5z"/>
+    <path id="unused" d="M0 0h50v50z"/>
+  </defs>
+  <rect width="400" height="300" style="fill:#ffffff"/>
+  <g transform="translate(20,20)">{line(0, 0, 10)}{line(0, 20, 8)}</g>
+  <g id="equation">{glyph(200, 100)}<path d="M195 110.5H210" style="stroke:#000000"/>{glyph(200, 111)}</g>
+  <g><rect x="40" y="150" width="120" height="100" style="fill:none;stroke:#000"/>
+     <circle cx="100" cy="200" r="30"/><path d="m 60,170 l 80,60"/></g>
+</svg>
+"""
+
+class TestSvgFragments(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.svg_path = os.path.join(self.temp_dir, "page.svg")
+        with open(self.svg_path, "w") as f:
+            f.write(PAGE)
+        self.page = PageFragments(self.svg_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_path_box(self):
+        self.assertEqual(path_box("M10 10 L20 5 H30 V40 Z"), (10, 5, 30, 40))
+        self.assertEqual(path_box("m10 10 l10 -5 h10 v35 z m5 5 c1 1 2 2 3 -20"), (10, -5, 30, 40))
+        # Arc flags written without separators, end point grown by the radius
+        self.assertEqual(path_box("M0 0a5 5 0 0110 0"), (-5, -5, 15, 5))
+
+    def test_grid_index(self):
+        index = GridIndex(10)
+        index.insert("a", (0, 0, 5, 5))
+        index.insert("b", (25, 25, 45, 30))
+        self.assertEqual(index.query((1, 1, 2, 2)), ["a"])
+        self.assertEqual(index.query((41, 29, 42, 29)), ["b"])
+        self.assertEqual(index.query((12, 12, 18, 18)), [])
+
+    def test_fragments(self):
+        fragments = self.page.fragments
+        self.assertEqual([fragment.kind for fragment in fragments], ["text", "text", "equation", "figure"])
+        self.assertEqual(fragments[0].box, (20, 20, 88, 30))
+        self.assertEqual(fragments[1].box, (20, 40, 74, 50))
+        self.assertEqual(fragments[2].box, (195, 100, 210, 121))
+        self.assertEqual(fragments[3].box, (40, 150, 160, 250))
+        self.assertEqual(len(fragments[3].leaves), 3)
+
+    def test_hit_tests(self):
+        self.assertEqual([fragment.index for fragment in self.page.fragments_at(100, 200)], [3])
+        self.assertEqual(self.page.fragments_at(300, 50), [])
+        self.assertEqual([fragment.index for fragment in self.page.fragments_in((0, 0, 250, 110))], [0, 1, 2])
+
+    def test_fragment_file(self):
+        equation = self.page.fragments[2]
+        path = self.page.fragment_file(equation, self.temp_dir)
+        self.assertEqual(self.page.fragment_file(equation, self.temp_dir), path)
+        root = ET.parse(path).getroot()
+        x, y, width, height = (float(value) for value in root.get("viewBox").split())
+        self.assertEqual((x, y, width, height), self.page.fragment_view_box(equation))
+        self.assertAlmostEqual(float(root.get("width")), width)
+        self.assertEqual(len(root.findall(f".//{SVG}use")), 2)
+        self.assertEqual(len(root.findall(f".//{SVG}rect")), 0)
+        # Only the glyph definition used by the fragment is left
+        self.assertEqual([element.get("id") for element in root.iter() if element.get("id")], ["g"])
+        # Built in a temporary file, nothing else is left next to it
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), sorted(["page.svg", os.path.basename(path)]))
+
+    def test_failed_fragment_leaves_no_file(self):
+        output_dir = os.path.join(self.temp_dir, "fragments")
+        os.makedirs(output_dir)
+        self.page.fragment_view_box = lambda fragment: ("invalid", 0, 1, 1)  # The crop step fails
+        self.assertIsNone(self.page.fragment_file(self.page.fragments[2], output_dir))
+        self.assertEqual(os.listdir(output_dir), [])
+
+if __name__ == '__main__':
+    unittest.main()
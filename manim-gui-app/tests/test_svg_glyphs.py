@@ -0,0 +1,136 @@
+import os
+import shutil
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+import numpy as np
+from PyQt5.QtCore import QByteArray
+from PyQt5.QtGui import QColor, QGuiApplication, QImage, QPainter
+from PyQt5.QtSvg import QSvgRenderer
+from src.core.svg_glyphs import deduplicate_paths, deduplicate_svg_file
+from src.core.svg_simplify import parse_path, parse_transform
+from src.core.svg_ingest import ingest_svg
+
+SVG = "{http://www.w3.org/2000/svg}"
+XLINK_HREF = "{http://www.w3.org/1999/xlink}href"
+GLYPH = [(0, 0), (1, 4), (3, 5), (4, 2), (3.5, 0.5), (2.2, -1), (1.1, 0.3), (0.4, 1.2), (2.5, 3.1), (1.7, 1.9),
+         (0.6, 4.4), (0.2, 2.8), (0.1, 1.3)]
+
+def glyph_path(x, y, scale=1.0):
+    points = [(x + px * scale, y + py * scale) for px, py in GLYPH]
+    return f"M {points[0][0]},{points[0][1]} C " + " ".join(f"{px:.5f},{py:.5f}" for px, py in points[1:]) + " Z"
+
+def points_of(d, transform=None):
+    """All the coordinates of a path, transformed to the user space of its parent."""
+    subpath = parse_path(d)[0]
+    points = np.vstack([subpath.start.reshape(1, 2)] + [array.reshape(-1, 2) for _, array in subpath.runs])
+    matrix = parse_transform(transform)
+    return points @ matrix[:2, :2].T + matrix[:2, 2]
+
+def render(root):
+    """Image of a document drawn by QSvgRenderer at its natural size."""
+    renderer = QSvgRenderer(QByteArray(ET.tostring(root)))
+    image = QImage(renderer.defaultSize(), QImage.Format_ARGB32)
+    image.fill(0xffffffff)
+    painter = QPainter(image)
+    renderer.render(painter)
+    painter.end()
+    return image
+
+def changed_pixels(image, other):
+    """Pixels whose color differs by more than antialiasing noise."""
+    changed = 0
+    for x in range(image.width()):
+        for y in range(image.height()):
+            colors = zip(QColor(image.pixel(x, y)).getRgb(), QColor(other.pixel(x, y)).getRgb())
+            changed += max(abs(a - b) for a, b in colors) > 32
+    return changed
+
+class TestSvgGlyphs(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        ET.register_namespace("", SVG[1:-1])
+        ET.register_namespace("xlink", XLINK_HREF[1:XLINK_HREF.index("}")])
+        cls.app = QGuiApplication.instance() or QGuiApplication([])
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.svg_path = os.path.join(self.temp_dir, "page.svg")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def document(self, body):
+        return ET.fromstring(f'<svg xmlns="http://www.w3.org/2000/svg" width="200" height="100" '
+                             f'viewBox="0 0 200 100">{body}</svg>')
+
+    def test_repeated_shapes_become_uses(self):
+        originals = [glyph_path(10, 10), glyph_path(50, 20.0002), glyph_path(90, 30, scale=2), glyph_path(120, 5)]
+        body = "".join(f'<path style="fill:#{index}{index}0000" d="{d}"/>' for index, d in enumerate(originals))
+        body += f'<path d="{glyph_path(10, 60)[:-2]} L 9,9 Z"/>'  # Another shape, drawn once
+        root = self.document(body)
+        report = deduplicate_paths(root, tolerance_px=0.01)
+
+        self.assertEqual(report, {"compared_paths": 5, "shapes": 1, "uses": 4})
+        definition = root.find(f"{SVG}defs/{SVG}path")
+        uses = root.findall(f"{SVG}use")
+        self.assertEqual(len(uses), 4)
+        self.assertEqual(len(root.findall(f"{SVG}path")), 1)
+        for index, (use, original) in enumerate(zip(uses, originals)):
+            self.assertEqual(use.get(XLINK_HREF), "#" + definition.get("id"))
+            self.assertEqual(use.get("style"), f"fill:#{index}{index}0000")
+            placement = use.get("transform") or f"translate({use.get('x')} {use.get('y')})"
+            drawn = points_of(definition.get("d"), placement)
+            self.assertLessEqual(np.abs(drawn - points_of(original)).max(), 0.01)
+
+    def test_shapes_outside_tolerance_kept_apart(self):
+        body = f'<path d="{glyph_path(10, 10)}"/><path d="{glyph_path(50, 10)}"/>'.replace(
+            "53.00000,15.00000", "53.00000,15.10000")
+        root = self.document(body)
+        self.assertEqual(deduplicate_paths(root, tolerance_px=0.05)["uses"], 0)
+        root = self.document(body)
+        self.assertEqual(deduplicate_paths(root, tolerance_px=0.2)["uses"], 2)
+
+    def test_resources_and_referenced_paths_left_alone(self):
+        d = glyph_path(10, 10)
+        root = self.document(f'<clipPath id="clip"><path d="{d}"/></clipPath><path id="target" d="{d}"/>'
+                             f'<path d="{d}" clip-path="url(#clip)"/>')
+        self.assertEqual(deduplicate_paths(root)["uses"], 0)
+
+    def test_scaled_copies_render_the_same(self):
+        # A stroke (own or inherited) or a paint server would be scaled with a scaled <use>
+        body = (f'<path style="fill:none;stroke:#000000;stroke-width:4" d="{glyph_path(10, 10)}"/>'
+                f'<path style="fill:none;stroke:#000000;stroke-width:4" d="{glyph_path(40, 10, scale=3)}"/>'
+                f'<g stroke="#0000ff"><path d="{glyph_path(110, 10, scale=3)}"/></g>'
+                f'<path style="fill:#000000" d="{glyph_path(10, 60)}"/>'
+                f'<path style="fill:#000000" d="{glyph_path(40, 60, scale=3)}"/>'
+                f'<path style="fill:#000000" d="{glyph_path(160, 60, scale=3)}"/>')
+        original = render(self.document(body))
+        root = self.document(body)
+        report = deduplicate_paths(root, tolerance_px=0.01)
+
+        # The stroked copies at 3x get a definition of their own, the filled ones join the 1x one
+        self.assertEqual((report["shapes"], report["uses"]), (2, 6))
+        for use in root.iter(f"{SVG}use"):
+            if "stroke" in use.get("style", "") or use.get("transform") is None:
+                self.assertIsNotNone(use.get("x"))
+                self.assertIsNone(use.get("transform"))
+        self.assertEqual(changed_pixels(original, render(root)), 0)
+
+    def test_file_and_ingest(self):
+        body = "".join(f'<path style="fill:#000000" d="{glyph_path(10 + 5 * i, 10)}"/>' for i in range(30))
+        with open(self.svg_path, "w") as f:
+            f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="200" height="100">{body}</svg>')
+        output_path = os.path.join(self.temp_dir, "deduplicated.svg")
+        report = deduplicate_svg_file(self.svg_path, output_path)
+        self.assertEqual(report["uses"], 30)
+        self.assertLess(report["bytes_after"], report["bytes_before"] / 2)
+
+        path, report = ingest_svg(self.svg_path, self.temp_dir)
+        self.assertEqual((report["shapes"], report["uses"]), (1, 30))
+        root = ET.parse(path).getroot()
+        self.assertEqual(len(root.findall(f"{SVG}use")), 30)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import os
+import shutil
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from src.core.svg_minify import minify_svg_file
+
+SVG = "{http://www.w3.org/2000/svg}"
+XLINK_HREF = "{http://www.w3.org/1999/xlink}href"
+
+DOCUMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink"
+     xmlns:inkscape="http://www.inkscape.org/namespaces/inkscape"
+     xmlns:sodipodi="http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd"
+     width="200" height="100" viewBox="0 0 200 100" id="svg2">
+  <sodipodi:namedview id="namedview" inkscape:zoom="1"/>
+  <metadata id="metadata"><title>drawing</title></metadata>
+  <defs id="defs">
+    <clipPath id="clip1" clipPathUnits="userSpaceOnUse"><path id="clip1-path" d="M 0,0 H 200 V 100 H 0 Z"/></clipPath>
+    <clipPath id="clip2" clipPathUnits="userSpaceOnUse"><path id="clip2-path" d="M 0,0 H 200 V 100 H 0 Z"/></clipPath>
+    <linearGradient id="unused"><stop offset="0"/></linearGradient>
+    <linearGradient id="stops"><stop offset="0" style="stop-color:#ff0000"/></linearGradient>
+    <linearGradient id="gradient" xlink:href="#stops"/>
+  </defs>
+  <g id="layer1" inkscape:label="Layer 1">
+    <g id="g1" transform="translate(0,0)" clip-path="url(#clip2)">
+      <path id="shape" d="M 10.123456,20.987654 L 30.5,40.25 Z" style="fill:url(#gradient)" inkscape:label="x"/>
+      <text id="label" x="5.123456" y="6" xml:space="preserve">Hello <tspan>world</tspan> &amp; more</text>
+    </g>
+    <g id="empty">
+    </g>
+  </g>
+  <use xlink:href="#shape" x="1" y="2"/>
+</svg>
+"""
+
+class TestSvgMinify(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.svg_path = os.path.join(self.temp_dir, "drawing.svg")
+        self.output_path = os.path.join(self.temp_dir, "minified.svg")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def minify(self, document=DOCUMENT, **options):
+        with open(self.svg_path, "w") as f:
+            f.write(document)
+        report = minify_svg_file(self.svg_path, self.output_path, **options)
+        return report, ET.parse(self.output_path).getroot()
+
+    def test_unused_and_duplicate_resources_removed(self):
+        report, root = self.minify()
+        ids = {element.get("id") for element in root.iter() if element.get("id")}
+        # clip2 is identical to clip1, its users now refer to clip1
+        self.assertEqual(ids, {"clip1", "stops", "gradient", "shape"})
+        self.assertEqual(report["resources_removed"], 2)
+        clipped = [element for element in root.iter() if element.get("clip-path")]
+        self.assertEqual([element.get("clip-path") for element in clipped], ["url(#clip1)"])
+        self.assertEqual(root.find(f".//{SVG}use").get(XLINK_HREF), "#shape")
+
+    def test_editor_data_groups_and_transforms_removed(self):
+        report, root = self.minify()
+        tags = [element.tag.split("}")[1] for element in root.iter()]
+        self.assertNotIn("namedview", tags)
+        self.assertNotIn("metadata", tags)
+        # layer1 has nothing left once its id and label are gone, empty is dropped
+        self.assertEqual(tags.count("g"), 1)
+        self.assertEqual(report["groups_flattened"], 2)
+        self.assertEqual(root.find(f"{SVG}g").attrib, {"clip-path": "url(#clip1)"})
+        self.assertFalse(any(key.startswith("{http://www.inkscape") for element in root.iter() for key in element.attrib))
+        self.assertLess(report["bytes_after"], report["bytes_before"])
+        self.assertEqual(report["elements_before"], 21)
+        self.assertEqual(report["elements_after"], 12)
+
+    def test_text_whitespace_kept(self):
+        _, root = self.minify()
+        text = root.find(f".//{SVG}text")
+        self.assertEqual("".join(text.itertext()), "Hello world & more")
+
+    def test_coordinates_rounded_to_precision(self):
+        _, root = self.minify(precision_px=0.01)
+        self.assertEqual(root.find(f".//{SVG}path[@id='shape']").get("d"), "M10.12 20.99L30.5 40.25Z")
+        self.assertEqual(root.find(f".//{SVG}text").get("x"), "5.12")
+        # Scaled 10 times, the same precision needs one more decimal
+        document = DOCUMENT.replace('id="layer1"', 'transform="scale(10)"')
+        _, root = self.minify(document, precision_px=0.01)
+        self.assertEqual(root.find(f".//{SVG}path[@id='shape']").get("d"), "M10.123 20.988L30.5 40.25Z")
+
+    def test_lengths_with_units_kept(self):
+        document = DOCUMENT.replace('<use xlink:href="#shape" x="1" y="2"/>',
+                                    '<rect x="10%" y="1.123456" width="50%" height="2mm"/>'
+                                    '<text x="1em" y="2.5e1">A</text>'
+                                    '<polygon points="0.123456,1 2-3.987654"/>')
+        _, root = self.minify(document, precision_px=0.01)
+        self.assertEqual(root.find(f"{SVG}rect").attrib, {"x": "10%", "y": "1.12", "width": "50%", "height": "2mm"})
+        self.assertEqual(root.find(f"{SVG}text").get("x"), "1em")
+        self.assertEqual(root.find(f"{SVG}text").get("y"), "25")
+        self.assertEqual(root.find(f"{SVG}polygon").get("points"), "0.12 1 2 -3.99")
+
+    def test_stylesheet_keeps_ids(self):
+        document = DOCUMENT.replace("<defs id=\"defs\">", "<style>#label { fill: red; }</style><defs id=\"defs\">")
+        report, root = self.minify(document)
+        self.assertIsNotNone(root.find(f".//{SVG}text[@id='label']"))
+        self.assertEqual(report["resources_removed"], 0)
+
+    def test_minify_in_place(self):
+        with open(self.svg_path, "w") as f:
+            f.write(DOCUMENT)
+        report = minify_svg_file(self.svg_path, self.svg_path)
+        self.assertEqual(report["bytes_after"], os.path.getsize(self.svg_path))
+        self.assertEqual(os.listdir(self.temp_dir), ["drawing.svg"])
+
+    def test_invalid_file(self):
+        with open(self.svg_path, "w") as f:
+            f.write("<svg")
+        self.assertIsNone(minify_svg_file(self.svg_path, self.output_path))
+        self.assertFalse(os.path.exists(self.output_path))
+
+if __name__ == '__main__':
+    unittest.main()
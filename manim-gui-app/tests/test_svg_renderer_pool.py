@@ -0,0 +1,89 @@
+import os
+import shutil
+import tempfile
+import unittest
+from PyQt5.QtGui import QGuiApplication
+from src.gui.svg_renderer_pool import SvgRendererPool
+
+SVG = '<svg xmlns="http://www.w3.org/2000/svg" width="{0}" height="50"><rect width="{0}" height="50"/></svg>'
+
+class TestSvgRendererPool(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QGuiApplication.instance() or QGuiApplication([])
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.svg_path = os.path.join(self.temp_dir, "slide.svg")
+        self.write_svg(100)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_svg(self, width, mtime_ns=None):
+        with open(self.svg_path, "w") as f:
+            f.write(SVG.format(width))
+        if mtime_ns is not None:
+            os.utime(self.svg_path, ns=(mtime_ns, mtime_ns))
+
+    def test_shared_and_reused_after_release(self):
+        pool = SvgRendererPool()
+        first = pool.acquire(self.svg_path)
+        second = pool.acquire(self.svg_path)
+        self.assertIs(first, second)
+        self.assertTrue(first.isValid())
+        self.assertEqual(pool.stats()["references"], 2)
+
+        pool.release(first)
+        pool.release(second)
+        self.assertEqual(pool.stats()["in_use"], 0)
+        # Revenir à la slide ne recharge pas le fichier
+        self.assertIs(pool.acquire(self.svg_path), first)
+        self.assertEqual(pool.loads, 1)
+
+    def test_bound_renderer_released_with_owner(self):
+        class Owner:
+            pass
+        pool = SvgRendererPool()
+        owner = Owner()
+        release = pool.bind(pool.acquire(self.svg_path), owner)
+        del owner  # Never released explicitly
+        self.assertFalse(release.alive)
+        self.assertEqual(pool.stats()["references"], 0)
+
+        owner = Owner()
+        release = pool.bind(pool.acquire(self.svg_path), owner)
+        release()
+        del owner  # Released once only
+        self.assertEqual(pool.stats()["references"], 0)
+        self.assertEqual(pool.stats()["idle"]["entries"], 1)
+
+    def test_modified_file_gets_new_renderer(self):
+        pool = SvgRendererPool()
+        self.write_svg(100, mtime_ns=1_000_000_000)
+        old = pool.acquire(self.svg_path)
+        self.write_svg(300, mtime_ns=2_000_000_000)
+        new = pool.acquire(self.svg_path)
+        self.assertIsNot(old, new)
+        self.assertEqual(new.defaultSize().width(), 300)
+
+    def test_memory_cap_evicts_idle_renderers(self):
+        pool = SvgRendererPool(max_bytes=os.path.getsize(self.svg_path) * SvgRendererPool.PARSED_SIZE_FACTOR)
+        other_path = os.path.join(self.temp_dir, "other.svg")
+        shutil.copyfile(self.svg_path, other_path)
+        pool.release(pool.acquire(self.svg_path))
+        pool.release(pool.acquire(other_path))
+        self.assertEqual(pool.stats()["idle"]["entries"], 1)
+        pool.acquire(self.svg_path)
+        self.assertEqual(pool.loads, 3)
+
+    def test_missing_file_is_not_pooled(self):
+        pool = SvgRendererPool()
+        renderer = pool.acquire(os.path.join(self.temp_dir, "missing.svg"))
+        self.assertFalse(renderer.isValid())
+        pool.release(renderer)
+        self.assertEqual(pool.stats()["in_use"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
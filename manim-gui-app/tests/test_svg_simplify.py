@@ -0,0 +1,120 @@
+import os
+import shutil
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+import numpy as np
+from src.core.svg_simplify import parse_path, rdp_keep_mask, simplify_svg_file, format_path
+from src.core.svg_ingest import ingest_svg
+
+def polyline_points(d):
+    """Points of a path made of M and L commands only."""
+    subpath = parse_path(d)[0]
+    return np.vstack([subpath.start] + [array for kind, array in subpath.runs])
+
+def distances_to_polyline(points, polyline):
+    a, b = polyline[:-1], polyline[1:]
+    ab = b - a
+    ap = points[:, None, :] - a[None, :, :]
+    t = np.clip((ap * ab).sum(-1) / np.maximum((ab * ab).sum(-1), 1e-12), 0, 1)
+    return np.linalg.norm(ap - t[..., None] * ab, axis=-1).min(axis=1)
+
+class TestSvgSimplify(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.svg_path = os.path.join(self.temp_dir, "plot.svg")
+        self.output_path = os.path.join(self.temp_dir, "simplified.svg")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_svg(self, paths, transform="", size='width="400" height="300" viewBox="0 0 400 300"'):
+        body = "".join(f'<path d="{d}"/>' for d in paths)
+        with open(self.svg_path, "w") as f:
+            f.write(f'<svg xmlns="http://www.w3.org/2000/svg" {size}><g transform="{transform}">{body}</g></svg>')
+
+    def output_paths(self):
+        root = ET.parse(self.output_path).getroot()
+        return [element.get("d") for element in root.iter("{http://www.w3.org/2000/svg}path")]
+
+    def test_relative_and_shorthand_commands(self):
+        absolute = parse_path("M10 10 L20 10 H30 V20 C30 30 40 30 40 20 S50 10 50 20 Z")
+        relative = parse_path("m10 10 l10 0 h10 v10 c0 10 10 10 10 0 s10 -10 10 0 z")
+        self.assertEqual(format_path(absolute, 3), format_path(relative, 3))
+        self.assertEqual(format_path(absolute, 3), "M10 10L20 10 30 10 30 20C30 30 40 30 40 20 40 10 50 10 50 20Z")
+        self.assertIsNone(parse_path("M0 0 A5 5 0 0 1 10 10"))
+
+    def test_rdp_error_is_bounded(self):
+        rng = np.random.default_rng(1)
+        lines = [np.cumsum(rng.normal(0, 1, (n, 2)), axis=0) for n in (500, 3, 2000)]
+        points = np.concatenate(lines)
+        lengths = np.array([len(line) for line in lines])
+        ends = np.cumsum(lengths) - 1
+        starts = ends - lengths + 1
+        keep = rdp_keep_mask(points, starts, ends, np.array([0.5, 0.5, 2.0]))
+        for line, line_keep, tolerance in zip(lines, np.split(keep, np.cumsum(lengths)[:-1]), (0.5, 0.5, 2.0)):
+            self.assertTrue(line_keep[0] and line_keep[-1])
+            self.assertLess(line_keep.sum(), len(line) if len(line) > 3 else len(line) + 1)
+            self.assertLessEqual(distances_to_polyline(line, line[line_keep]).max(), tolerance + 1e-9)
+
+    def test_simplify_file_within_tolerance(self):
+        x = np.linspace(0, 400, 5000)
+        y = 150 + 100 * np.sin(x / 40) + np.random.default_rng(0).normal(0, 0.01, len(x))
+        original = np.column_stack([x, y])
+        d = "M" + " ".join(f"{value:.4f}" for value in original.ravel())
+        self.write_svg([d, "M0 0C10 0.01 20 -0.01 30 0C30 50 60 50 60 0"])
+        report = simplify_svg_file(self.svg_path, self.output_path, tolerance_px=0.5)
+
+        self.assertEqual(report["nodes_before"], 5003)
+        self.assertLess(report["nodes_after"], 500)
+        self.assertLess(report["bytes_after"], report["bytes_before"])
+        plot, curves = self.output_paths()
+        self.assertLessEqual(distances_to_polyline(original, polyline_points(plot)).max(), 0.5)
+        # The flat curve becomes a line, the other one is kept
+        self.assertEqual(curves, "M0 0L30 0C30 50 60 50 60 0")
+
+    def test_tolerance_follows_transforms(self):
+        # Zigzag of 0.1 user units: 1 px once scaled by 10, kept at a 0.5 px tolerance
+        d = "M" + " ".join(f"{i} {0.1 * (i % 2)}" for i in range(20))
+        self.write_svg([d], transform="scale(10)", size='width="400" height="300"')
+        report = simplify_svg_file(self.svg_path, self.output_path, tolerance_px=0.5)
+        self.assertEqual(report["nodes_after"], report["nodes_before"])
+        self.write_svg([d])
+        report = simplify_svg_file(self.svg_path, self.output_path, tolerance_px=0.5)
+        self.assertEqual(report["nodes_after"], 2)
+
+    def test_ingest_reuses_simplified_copy(self):
+        d = "M" + " ".join(f"{i} {i}" for i in range(100))
+        self.write_svg([d])
+        ingest_dir = os.path.join(self.temp_dir, "ingest")
+        os.mkdir(ingest_dir)
+        path, report = ingest_svg(self.svg_path, ingest_dir)
+        self.assertNotEqual(path, self.svg_path)
+        self.assertEqual(report["nodes_after"], 2)
+        self.assertEqual(ingest_svg(self.svg_path, ingest_dir), (path, None))
+        # Built in a temporary file, only the result is left
+        self.assertEqual(os.listdir(ingest_dir), [os.path.basename(path)])
+
+    def test_failed_ingest_leaves_no_file(self):
+        with open(self.svg_path, "w") as f:
+            f.write('<svg xmlns="http://www.w3.org/2000/svg"><path d="M0 0L1 1"/>')
+        ingest_dir = os.path.join(self.temp_dir, "ingest")
+        os.mkdir(ingest_dir)
+        self.assertEqual(ingest_svg(self.svg_path, ingest_dir), (self.svg_path, None))
+        self.assertEqual(os.listdir(ingest_dir), [])
+
+    def test_ingest_remembers_files_without_gain(self):
+        with open(self.svg_path, "w") as f:
+            f.write('<svg xmlns="http://www.w3.org/2000/svg"><path d="M0 0L1 1"/></svg>')
+        ingest_dir = os.path.join(self.temp_dir, "ingest")
+        os.mkdir(ingest_dir)
+        path, report = ingest_svg(self.svg_path, ingest_dir)
+        self.assertEqual(path, self.svg_path)
+        self.assertIsNotNone(report)
+        self.assertEqual(len(os.listdir(ingest_dir)), 1)
+        # The marker answers the next requests without running the pipeline again
+        self.assertEqual(ingest_svg(self.svg_path, ingest_dir), (self.svg_path, None))
+
+if __name__ == '__main__':
+    unittest.main()